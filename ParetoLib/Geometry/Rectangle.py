@@ -1204,22 +1204,60 @@ class Rectangle(object):
          >>> Rectangle.fusion_rectangles([r1, r2])
          >>> [[(0.0,0.0), (2.0,1.0)]]
         """
+        # Two rectangles are only concatenable along axis i if they share the same face signature,
+        # i.e., they are aligned in the remaining d-1 coordinates. Rectangles are grouped by that
+        # signature (hashing) and each group is swept along axis i. Merging along one axis may
+        # enable new concatenations along another axis, so we iterate until reaching a fixpoint.
+        rects = set(list_rect)
+        d = next(iter(rects)).dim() if len(rects) > 0 else 0
+        keep_merging = True
+        while keep_merging and len(rects) > 1:
+            keep_merging = False
+            for i in range(d):
+                merged = Rectangle._fusion_rectangles_axis(rects, i)
+                keep_merging = keep_merging or (len(merged) < len(rects))
+                rects = merged
+        return list(rects)
+
+    @staticmethod
+    def _fusion_rectangles_axis(set_rect, i):
+        # type: (set, int) -> set
+        """
+         Concatenation of the rectangles in a set along the i-th axis.
+
+         Args:
+             set_rect (set): Set of rectangles.
+             i (int): Axis of the concatenation.
 
-        not_processed = set(list_rect)
-        output = []
-        while not_processed:
-            r1 = not_processed.pop()
-            processed = set()
-            for r2 in not_processed:
-                if r1.is_concatenable(r2):
-                    # Concatenate rectangle r1 and r2
-                    r1.concatenate_update(r2)
-                    processed.add(r2)
-            if len(processed) == 0:
-                output.append(r1)
-            else:
-                not_processed = not_processed - processed
-                not_processed.add(r1)
+         Returns:
+             set: set of rectangles obtained by concatenation.
+        """
+        # key = (min_corner, max_corner) without the i-th coordinate
+        groups = {}
+        for rect in set_rect:
+            key = (rect.min_corner[:i] + rect.min_corner[i + 1:], rect.max_corner[:i] + rect.max_corner[i + 1:])
+            groups.setdefault(key, []).append(rect)
+
+        output = set()
+        for group in groups.values():
+            if len(group) == 1:
+                output.update(group)
+                continue
+
+            # Sweep along axis i.
+            # Runs of concatenated rectangles are indexed by the coordinate where they finish.
+            # A rectangle extends a run if it starts where the run finishes.
+            group.sort(key=lambda rect: (rect.min_corner[i], rect.max_corner[i]))
+            runs = {}
+            for rect in group:
+                candidates = runs.get(rect.min_corner[i])
+                if candidates:
+                    prev = candidates.pop()
+                    rect = Rectangle(prev.min_corner, rect.max_corner)
+                runs.setdefault(rect.max_corner[i], []).append(rect)
+
+            for candidates in runs.values():
+                output.update(candidates)
         return output
 
     @staticmethod
@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 J.I. Requeno et al
+#
+# This file is part of the ParetoLib software tool and governed by the
+# 'GNU License v3'. Please see the LICENSE file that should have been
+# included as part of this software.
+"""Skyline.
+
+This module introduces a set of functions for filtering the points
+that are not dominated by any other point of a collection (i.e., the
+skyline or Pareto front of the collection). A point x dominates a
+point x' if x[i] <= x'[i] for i = 0..dim(x)-1, and x != x'.
+
+Points are given as a NumPy array of shape (n, d), and the result is a
+boolean mask of length n that selects the non-dominated points.
+Duplicated points are reported only once (i.e., the first occurrence).
+
+The algorithms are:
+- skyline_2D: sort and filter with a vectorized sweep line.
+- skyline_3D: sort and filter with a 2D staircase.
+- skyline_dc: divide and conquer for any dimension. The sorted points
+  are split in halves, and the skyline of the second half is filtered
+  with the skyline of the first half by comparing all their pairs.
+  It is quadratic in the worst case (i.e., when most points are
+  non-dominated), unlike the dimension-reducing merge of [1].
+- pskyline: parallel version, where each process computes the local
+  skyline of a chunk of points, and the local skylines are merged.
+
+[1] H. T. Kung, F. Luccio and F. P. Preparata.
+On finding the maxima of a set of vectors.
+Journal of the ACM, 22(4):469-476, 1975.
+"""
+
+import bisect
+from multiprocessing import Pool, cpu_count
+
+import numpy as np
+
+# Sets of points below this size are solved by comparing all the pairs of points
+_DC_BLOCK = 64
+# Maximum number of elements of the temporary arrays used for comparing two sets of points
+_MAX_BUFFER = 1 << 22
+
+
+def _as_array(points):
+    # type: (iter) -> np.ndarray
+    arr = np.asarray(points, dtype=float)
+    if arr.ndim != 2:
+        arr = arr.reshape((len(arr), -1)) if arr.size > 0 else arr.reshape((0, 0))
+    return arr
+
+
+def _unique_sorted(arr):
+    # type: (np.ndarray) -> (np.ndarray, np.ndarray)
+    """
+    Unique points of arr in lexicographic order, and the index of their first occurrence in arr.
+    After sorting, a point can only be dominated by the points that precede it.
+    """
+    # np.lexsort is stable and uses the last key as the primary one
+    order = np.lexsort(arr.T[::-1])
+    sarr = arr[order]
+    first = np.ones(len(sarr), dtype=bool)
+    first[1:] = np.any(sarr[1:] != sarr[:-1], axis=1)
+    return sarr[first], order[first]
+
+
+def dominated_by(parr, qarr):
+    # type: (np.ndarray, np.ndarray) -> np.ndarray
+    """
+    Mask of the points of parr that are greater or equal than some point of qarr.
+    The temporary arrays are bounded, so qarr may be compared against a large parr.
+
+    Args:
+        parr (np.ndarray): Array of shape (n, d).
+        qarr (np.ndarray): Array of shape (m, d).
+
+    Returns:
+        np.ndarray: Boolean mask of length n.
+
+    Example:
+    >>> dominated_by(np.array([(1, 1), (0, 2), (2, 0)]), np.array([(0, 1), (1, 0)]))
+    >>> array([ True,  True,  True])
+    """
+    dominated = np.zeros(len(parr), dtype=bool)
+    if len(parr) == 0 or len(qarr) == 0:
+        return dominated
+    step = max(1, _MAX_BUFFER // (len(qarr) * parr.shape[1]))
+    for i in range(0, len(parr), step):
+        chunk = parr[i:i + step]
+        dominated[i:i + step] = np.any(np.all(qarr[np.newaxis, :, :] <= chunk[:, np.newaxis, :], axis=2), axis=1)
+    return dominated
+
+
+def _skyline_2D_sorted(uarr):
+    # type: (np.ndarray) -> np.ndarray
+    # The point is non-dominated iff it improves the minimum value of the second coordinate seen so far
+    prev_min = np.empty(len(uarr))
+    prev_min[:1] = np.inf
+    prev_min[1:] = np.minimum.accumulate(uarr[:-1, 1])
+    return uarr[:, 1] < prev_min
+
+
+def _skyline_3D_sorted(uarr):
+    # type: (np.ndarray) -> np.ndarray
+    # The point is non-dominated iff it is not dominated by the 2D staircase of the projections (y, z)
+    # of the previous points. The staircase is sorted by increasing y and decreasing z.
+    mask = np.zeros(len(uarr), dtype=bool)
+    stair_y, stair_z = [], []
+    for k, (_, y, z) in enumerate(uarr.tolist()):
+        i = bisect.bisect_right(stair_y, y)
+        if i > 0 and stair_z[i - 1] <= z:
+            continue
+        mask[k] = True
+        # Remove the steps dominated by (y, z)
+        j = i
+        while j < len(stair_y) and stair_z[j] >= z:
+            j += 1
+        stair_y[i:j] = [y]
+        stair_z[i:j] = [z]
+    return mask
+
+
+def _skyline_dc_sorted(uarr):
+    # type: (np.ndarray) -> np.ndarray
+    n = len(uarr)
+    if n <= _DC_BLOCK:
+        # Every point is lesser or equal than itself
+        leq = np.all(uarr[np.newaxis, :, :] <= uarr[:, np.newaxis, :], axis=2)
+        return np.sum(leq, axis=1) == 1
+    # Points of the second half never dominate the points of the first half
+    half = n // 2
+    top = _skyline_dc_sorted(uarr[:half])
+    bottom = _skyline_dc_sorted(uarr[half:])
+    bottom_index = np.nonzero(bottom)[0]
+    dominated = dominated_by(uarr[half:][bottom_index], uarr[:half][top])
+    bottom[bottom_index[dominated]] = False
+    return np.concatenate((top, bottom))
+
+
+def _skyline_with(f_sorted, points):
+    # type: (callable, iter) -> np.ndarray
+    arr = _as_array(points)
+    mask = np.zeros(len(arr), dtype=bool)
+    if len(arr) > 0:
+        uarr, index = _unique_sorted(arr)
+        mask[index[f_sorted(uarr)]] = True
+    return mask
+
+
+def skyline_2D(points):
+    # type: (np.ndarray) -> np.ndarray
+    """
+    Mask of the non-dominated points of a set of 2D points.
+
+    Args:
+        points (np.ndarray): Array of shape (n, 2).
+
+    Returns:
+        np.ndarray: Boolean mask of length n.
+
+    Example:
+    >>> skyline_2D(np.array([(0, 1), (1, 0), (1, 1)]))
+    >>> array([ True,  True, False])
+    """
+    return _skyline_with(_skyline_2D_sorted, points)
+
+
+def skyline_3D(points):
+    # type: (np.ndarray) -> np.ndarray
+    """
+    Mask of the non-dominated points of a set of 3D points.
+
+    Args:
+        points (np.ndarray): Array of shape (n, 3).
+
+    Returns:
+        np.ndarray: Boolean mask of length n.
+    """
+    return _skyline_with(_skyline_3D_sorted, points)
+
+
+def skyline_dc(points):
+    # type: (np.ndarray) -> np.ndarray
+    """
+    Mask of the non-dominated points of a set of points of any dimension.
+    Each merge compares every point of the skyline of a half with every point of the skyline of the
+    other half, so the cost is O(d*n^2) in the worst case (i.e., when most points are non-dominated).
+    It is fast when the skylines of the halves are small compared to n.
+
+    Args:
+        points (np.ndarray): Array of shape (n, d).
+
+    Returns:
+        np.ndarray: Boolean mask of length n.
+    """
+    return _skyline_with(_skyline_dc_sorted, points)
+
+
+def skyline(points):
+    # type: (np.ndarray) -> np.ndarray
+    """
+    Mask of the non-dominated points of a set of points.
+    The algorithm is selected according to the dimension of the points.
+
+    Args:
+        points (np.ndarray): Array of shape (n, d).
+
+    Returns:
+        np.ndarray: Boolean mask of length n.
+
+    Example:
+    >>> points = np.random.rand(1000, 3)
+    >>> front = points[skyline(points)]
+    """
+    arr = _as_array(points)
+    d = arr.shape[1]
+    if d == 2:
+        return skyline_2D(arr)
+    elif d == 3:
+        return skyline_3D(arr)
+    else:
+        return skyline_dc(arr)
+
+
+def pskyline(points, nproc=None, nchunks=None):
+    # type: (np.ndarray, int, int) -> np.ndarray
+    """
+    Parallel version of skyline(points).
+    Each process computes the skyline of a chunk of the points, and
+    the union of the local skylines is filtered again.
+
+    Args:
+        points (np.ndarray): Array of shape (n, d).
+        nproc (int): Number of processes. By default, cpu_count().
+        nchunks (int): Number of chunks. By default, nproc.
+
+    Returns:
+        np.ndarray: Boolean mask of length n.
+    """
+    arr = _as_array(points)
+    nproc = cpu_count() if nproc is None else nproc
+    nchunks = nproc if nchunks is None else nchunks
+    shards = [shard for shard in np.array_split(np.arange(len(arr)), nchunks) if len(shard) > 0]
+
+    pool = Pool(nproc)
+    try:
+        local_masks = pool.map(skyline, [arr[shard] for shard in shards])
+    finally:
+        # Stop multiprocessing
+        pool.close()
+        pool.join()
+
+    # Candidates are kept in the original order, so duplicated points are resolved as in skyline(points)
+    candidates = np.sort(np.concatenate([shard[m] for shard, m in zip(shards, local_masks)] +
+                                        [np.empty(0, dtype=int)]))
+    mask = np.zeros(len(arr), dtype=bool)
+    mask[candidates[skyline(arr[candidates])]] = True
+    return mask
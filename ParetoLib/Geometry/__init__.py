@@ -18,7 +18,7 @@ import sys
 from decimal import Decimal, getcontext
 
 __name__ = 'Geometry'
-__all__ = ['Lattice', 'Segment', 'Rectangle', 'ParRectangle', 'Point', 'PPoint']
+__all__ = ['Lattice', 'Segment', 'Rectangle', 'ParRectangle', 'Point', 'PPoint', 'Skyline']
 
 # Maximum number of decimal digits that should be used in computations.
 # This value depends on the accurary (i.e., number of bits) used for float representations.
@@ -71,3 +71,14 @@ JAMT_OPT_STL = '-x'
 JAMT_OPT_SIGNAL = '-s'
 JAMT_OPT_ALIAS = '-a'
 JAMT_OPT_RES = '-v'
+
+# Long-lived driver of JAMT (see OracleSTL.JAMTServer)
+# java JAMTServer.java jamt.jar signal.vcd variables.alias
+JAMT_SERVER = os.path.join(get_jamt_path(), 'JAMTServer.java')
+JAMT_SERVER_OK = 'ok'
+
+# Maximum number of assertions written to a STL file (see OracleSTL.member_batch)
+JAMT_MAX_ASSERTIONS = 128
+
+# Maximum number of queries whose files are retained when JAMT returns 'unknown' (see OracleSTL.member)
+JAMT_MAX_UNKNOWN = 16
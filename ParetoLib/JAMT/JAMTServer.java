@@ -0,0 +1,98 @@
+// -*- coding: utf-8 -*-
+// Copyright (c) 2018 J.I. Requeno et al
+//
+// This file is part of the ParetoLib software tool and governed by the
+// 'GNU License v3'. Please see the LICENSE file that should have been
+// included as part of this software.
+
+import java.io.BufferedReader;
+import java.io.File;
+import java.io.FileDescriptor;
+import java.io.FileOutputStream;
+import java.io.InputStreamReader;
+import java.io.PrintStream;
+import java.lang.reflect.InvocationTargetException;
+import java.lang.reflect.Method;
+import java.net.URL;
+import java.net.URLClassLoader;
+import java.security.Permission;
+import java.util.jar.JarFile;
+
+/**
+ * Long-lived driver of JAMT (see ParetoLib.Oracle.OracleSTL.JAMTServer).
+ *
+ * Usage (Java 11 or later):
+ *     java JAMTServer.java jamt.jar signal.vcd variables.alias
+ *
+ * The JVM and the main class of jamt.jar are loaded once. Then, every line
+ * "stl_prop_file TAB result_file" read from stdin is evaluated as
+ *     java -jar jamt.jar -x stl_prop_file -s signal.vcd -a variables.alias -v result_file
+ * and answered with one line in stdout: "ok" or "error message".
+ * The first line of stdout ("ok") announces that the driver is ready.
+ */
+public class JAMTServer {
+
+    // JAMT may call System.exit() after writing the result file
+    static class Exit extends SecurityException {
+        final int status;
+
+        Exit(int status) {
+            super("exit " + status);
+            this.status = status;
+        }
+    }
+
+    static class NoExit extends SecurityManager {
+        @Override
+        public void checkPermission(Permission perm) {
+        }
+
+        @Override
+        public void checkExit(int status) {
+            throw new Exit(status);
+        }
+    }
+
+    public static void main(String[] args) throws Exception {
+        // Messages of JAMT must not be mixed with the answers
+        PrintStream out = new PrintStream(new FileOutputStream(FileDescriptor.out), true, "UTF-8");
+        System.setOut(System.err);
+
+        String mainClass;
+        try (JarFile jar = new JarFile(args[0])) {
+            mainClass = jar.getManifest().getMainAttributes().getValue("Main-Class");
+        }
+        URLClassLoader loader = new URLClassLoader(new URL[]{new File(args[0]).toURI().toURL()});
+        Method jamt = loader.loadClass(mainClass).getMethod("main", String[].class);
+
+        try {
+            System.setSecurityManager(new NoExit());
+        } catch (UnsupportedOperationException e) {
+            // Java 18 or later: the driver dies if JAMT calls System.exit(), and OracleSTL falls back
+            // to one JAMT process per query
+        }
+        out.println("ok");
+
+        BufferedReader in = new BufferedReader(new InputStreamReader(System.in, "UTF-8"));
+        String line;
+        while ((line = in.readLine()) != null) {
+            String[] files = line.split("\t");
+            String answer = "ok";
+            try {
+                jamt.invoke(null, (Object) new String[]{"-x", files[0], "-s", args[1], "-a", args[2], "-v", files[1]});
+            } catch (InvocationTargetException e) {
+                Throwable cause = e.getCause();
+                if (!(cause instanceof Exit) || ((Exit) cause).status != 0) {
+                    answer = "error " + String.valueOf(cause).replace('\n', ' ');
+                }
+            } catch (Exception e) {
+                answer = "error " + String.valueOf(e).replace('\n', ' ');
+            }
+            out.println(answer);
+        }
+
+        if (System.getSecurityManager() != null) {
+            System.setSecurityManager(null);
+        }
+    }
+}
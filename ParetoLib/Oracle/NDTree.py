@@ -15,6 +15,26 @@ are directly extracted from [1].
 ND-Tree-based update: a fast algorithm for the dynamic non-dominance problem.
 IEEE Transactions on Evolutionary Computation, 2018.
 https://ieeexplore.ieee.org/document/8274915/
+
+Binary files store the NDTree in a flat format that is written and
+read iteratively (i.e., without recursion):
+
+    magic (8 bytes), version, d, max_points, min_children (uint32),
+    number of nodes, number of points (uint64),
+    node table: (first child, number of children, first point,
+                 number of points) per node (int64),
+    rectangles: (min corner, max corner) per node (float64),
+    points (float64).
+
+Nodes are stored in breadth-first order, so the descendants of a node
+are contiguous in the node table. Arrays are memory-mapped when the
+NDTree is loaded, and dominance queries are answered by traversing the
+node table. The Node objects are only created when the NDTree is
+modified or its root is accessed (e.g., update_point).
+
+Loading NDTrees pickled by older versions of ParetoLib requires a deep
+recursion, so the recursion limit of the process is only raised in that
+case (see raise_recursion_limit).
 """
 
 import sys
@@ -22,11 +42,47 @@ import resource
 import os
 import io
 import pickle
+import struct
+from collections import deque
+
+import numpy as np
 
 from ParetoLib.Geometry.Rectangle import Rectangle
+from ParetoLib.Geometry.Skyline import skyline
 from ParetoLib.Geometry.Point import less, less_equal, distance, dim
 import ParetoLib.Oracle as RootOracle
 
+# Flat binary format
+NDTREE_MAGIC = b'PARNDTRE'
+NDTREE_VERSION = 1
+_NDTREE_HEADER = struct.Struct('<8sIIIIQQ')
+
+
+def raise_recursion_limit(max_rec=0x100000):
+    # type: (int) -> None
+    """
+    Raising the recursion limit and the stack size of the process.
+    It is required for unpickling deep NDTrees written by older versions of ParetoLib.
+    Environments that forbid changing the stack size keep their current limit.
+    """
+    try:
+        resource.setrlimit(resource.RLIMIT_STACK, [0x100 * max_rec, resource.RLIM_INFINITY])
+    except (ValueError, OSError) as e:
+        RootOracle.logger.warning('Stack size cannot be changed: {0}'.format(e))
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), max_rec))
+
+
+def _has_fileno(f):
+    # type: (io.IOBase) -> bool
+    """
+    Checking if f is backed by a file descriptor (i.e., it can be memory-mapped).
+    """
+    try:
+        f.fileno()
+    except (AttributeError, IOError, io.UnsupportedOperation):
+        return False
+    return True
+
 
 class NDTree:
     def __init__(self, max_points=2, min_children=2):
@@ -39,12 +95,23 @@ class NDTree:
         self.root = None
         self.max_points = max_points
         self.min_children = min_children
+        # Hash index of the points stored in the NDTree, and snapshot of the index returned by get_points.
+        # The index is patched every time that the NDTree is updated.
+        self._index = set()
+        self._snapshot = frozenset()
+        # (node table, rectangles, points) loaded from a flat file while the Nodes are not created yet
+        self._flat = None
 
-        # Setting maximum recursion. It is required for the NDTree build
-        # sys.getrecursionlimit()
-        max_rec = 0x100000
-        resource.setrlimit(resource.RLIMIT_STACK, [0x100 * max_rec, resource.RLIM_INFINITY])
-        sys.setrecursionlimit(max_rec)
+    def __getattr__(self, name):
+        # type: (NDTree, str) -> object
+        """
+        Lazy creation of the Nodes of an NDTree loaded from a flat file (see from_file_flat).
+        It is only called when the attribute is not found in the usual places.
+        """
+        if name == 'root' and self.__dict__.get('_flat') is not None:
+            self._build_nodes()
+            return self.root
+        raise AttributeError('{0} object has no attribute {1}'.format(type(self).__name__, name))
 
     def __contains__(self, p):
         # type: (NDTree, tuple) -> bool
@@ -66,8 +133,30 @@ class NDTree:
         >>> x in nd
         >>> True
         """
-        return self.root.has_point_rec(p) if not self.is_empty() else False
-        # return item in self.root
+        return p in self._get_index()
+        # return self.root.has_point_rec(p) if not self.is_empty() else False
+
+    def __setstate__(self, state):
+        # type: (NDTree, dict) -> None
+        """
+        Unpickling. NDTrees pickled by older versions of ParetoLib do not include the index of points.
+        """
+        self.__dict__.update(state)
+        self.__dict__.setdefault('_flat', None)
+        if '_index' not in state:
+            self._rebuild_index()
+
+    def _rebuild_index(self):
+        # type: (NDTree) -> None
+        self._index = self.root.s() if self.root is not None else set()
+        self._snapshot = None
+
+    def _get_index(self):
+        # type: (NDTree) -> set
+        if self._index is None:
+            # NDTree loaded from a flat file
+            self._index = set(tuple(p) for p in self._flat[2].tolist())
+        return self._index
 
     def __repr__(self):
         # type: (NDTree) -> str
@@ -154,7 +243,7 @@ class NDTree:
         >>> nd.is_empty()
         >>> True
         """
-        return self.root is None
+        return self._flat is None and self.root is None
 
     def get_rectangle(self):
         # type: (NDTree) -> Rectangle
@@ -178,6 +267,9 @@ class NDTree:
         >>> [(0,0,0), (0,0,0)]
         """
         # return self.root.getRectangleSn() if not self.isEmpty() else None
+        if self._flat is not None and not np.isnan(self._flat[1][0]).any():
+            min_corner, max_corner = self._flat[1][0].tolist()
+            return Rectangle(tuple(min_corner), tuple(max_corner))
         return self.root.get_rectangle_sn() if not self.is_empty() else Rectangle()
 
     def get_points(self):
@@ -189,7 +281,8 @@ class NDTree:
             self (NDTree): The NDTree.
 
         Returns:
-            set: Set of the points in the NDTree.
+            frozenset: Set of the points in the NDTree.
+            The set is a snapshot: it does not change with later updates of the NDTree.
 
         Example:
         >>> x = (0,0,0)
@@ -200,8 +293,91 @@ class NDTree:
         >>> nd.get_points()
         >>> {(0,0,0), (1,1,1)}
         """
-        points = self.root.s() if self.root is not None else set()
-        return points
+        if self._snapshot is None:
+            self._snapshot = frozenset(self._get_index())
+        return self._snapshot
+
+    def _new_node(self):
+        # type: (NDTree) -> Node
+        """
+        Empty Node with the parameters of the NDTree.
+        """
+        return Node(max_points=self.max_points, min_children=self.min_children)
+
+    @staticmethod
+    def _skyline(point_list):
+        # type: (iter) -> list
+        """
+        Points that are not dominated by any other point of the list, sorted lexicographically.
+        """
+        point_list = list(point_list)
+        mask = skyline(point_list)
+        return sorted(point_list[i] for i in np.nonzero(mask)[0])
+
+    def bulk_load(self, points):
+        # type: (NDTree, iter) -> None
+        """
+        Addition of a collection of points to the NDTree.
+        The NDTree is rebuilt from scratch, which is faster than
+        inserting the points one by one.
+
+        Args:
+            self (NDTree): The NDTree.
+            points (iter): The points.
+
+        Returns:
+            None: The NDTree stores the points that are not dominated by
+            any other point (either from 'points' or previously stored in
+            the NDTree).
+            The tree is balanced: leaves hold up to max_points points,
+            and internal nodes hold min_children nodes.
+
+        Example:
+        >>> nd = NDTree()
+        >>> nd.bulk_load([(0,0,0), (1,1,1)])
+        >>> nd.get_points()
+        >>> {(0,0,0)}
+        """
+        point_list = list(points)
+        if not self.is_empty():
+            point_list.extend(self.get_points())
+        front = NDTree._skyline(point_list)
+
+        def _enclosing_rectangle(rect_list):
+            ideal = tuple(min(c) for c in zip(*(r.min_corner for r in rect_list)))
+            nadir = tuple(max(c) for c in zip(*(r.max_corner for r in rect_list)))
+            return Rectangle(ideal, nadir)
+
+        # Leaves. Consecutive points in lexicographic order are close to each other.
+        nodes = []
+        for i in range(0, len(front), self.max_points):
+            n = self._new_node()
+            leaf_points = front[i:i + self.max_points]
+            n.L = leaf_points
+            n.set_rectangle_sn(_enclosing_rectangle([Rectangle(p, p) for p in leaf_points]))
+            nodes.append(n)
+
+        # Internal nodes, built level by level until reaching the root
+        while len(nodes) > 1:
+            parents = []
+            for i in range(0, len(nodes), self.min_children):
+                children = nodes[i:i + self.min_children]
+                if len(children) == 1:
+                    # Avoid internal nodes with a single descendant
+                    parents.append(children[0])
+                    continue
+                n = self._new_node()
+                for child in children:
+                    n.nodes.append(child)
+                    child.set_parent(n)
+                n.set_rectangle_sn(_enclosing_rectangle([child.get_rectangle_sn() for child in children]))
+                parents.append(n)
+            nodes = parents
+
+        self.root = nodes[0] if len(nodes) > 0 else None
+        self._flat = None
+        self._index = set(front)
+        self._snapshot = None
 
     def update_point(self, p):
         # type: (NDTree, tuple) -> None
@@ -224,15 +400,25 @@ class NDTree:
         >>> nd.update_point(x)
         """
         n = self.root
+        index = self._get_index()
+        evicted = []
+        update = True
         if n is None:
-            n = Node(max_points=self.max_points, min_children=self.min_children)
+            n = self._new_node()
             n.insert(p)
         else:
-            n, update = n.update_node(p)
+            n, update = n.update_node(p, evicted)
             if update:
                 n.insert(p)
         self.root = n
 
+        # Patch the index of points
+        if update or len(evicted) > 0:
+            index.difference_update(evicted)
+            if update:
+                index.add(p)
+            self._snapshot = None
+
     def dominates(self, p):
         # type: (NDTree, tuple) -> True
         """
@@ -252,8 +438,36 @@ class NDTree:
         >>> nd.dominates(y)
         >>> True
         """
+        if self._flat is not None:
+            return self._dominates_flat(p)
         return self.root.dominates(p)
 
+    def _dominates_flat(self, p):
+        # type: (NDTree, tuple) -> bool
+        """
+        Iterative version of Node.dominates over the node table of an NDTree loaded from a flat file.
+        """
+        node_table, rects, points = self._flat
+        x = np.asarray(p, dtype=float)
+        stack = [0]
+        while stack:
+            i = stack.pop()
+            min_corner, max_corner = rects[i]
+            if not np.isnan(min_corner).any():
+                if np.all(max_corner < x):
+                    # x is dominated by the Pareto front
+                    return True
+                elif np.all(x < min_corner):
+                    # x dominates the Pareto front of the subtree
+                    continue
+                elif np.array_equal(min_corner, x) or np.array_equal(max_corner, x):
+                    return True
+            first_child, num_children, first_point, num_points = node_table[i].tolist()
+            if num_points > 0 and np.any(np.all(points[first_point:first_point + num_points] <= x, axis=1)):
+                return True
+            stack.extend(range(first_child, first_child + num_children))
+        return False
+
     # Read/Write file functions
     def from_file(self, fname='', human_readable=False):
         # type: (NDTree, str, bool) -> None
@@ -307,15 +521,104 @@ class NDTree:
         """
         assert (finput is not None), 'File object should not be null'
 
+        offset = finput.tell()
+        magic = finput.read(len(NDTREE_MAGIC))
+        finput.seek(offset)
+        if magic == NDTREE_MAGIC:
+            self.from_file_flat(finput)
+        else:
+            self._from_file_pickle(finput)
+
+    def _from_file_pickle(self, finput):
+        # type: (NDTree, io.BinaryIO) -> None
+        """
+        Loading an NDTree from a binary file written by older versions of ParetoLib (i.e., pickle).
+        """
         # Setting maximum recursion. It is required for the NDTree build
-        # sys.getrecursionlimit()
-        max_rec = 0x100000
-        resource.setrlimit(resource.RLIMIT_STACK, [0x100 * max_rec, resource.RLIM_INFINITY])
-        sys.setrecursionlimit(max_rec)
+        raise_recursion_limit()
 
         self.root = pickle.load(finput)
+        self._flat = None
         self.max_points = pickle.load(finput)
         self.min_children = pickle.load(finput)
+        self._rebuild_index()
+
+    def from_file_flat(self, finput=None):
+        # type: (NDTree, io.BinaryIO) -> None
+        """
+        Loading an NDTree from a binary file in flat format.
+        If finput is a file on disk, then the arrays are memory-mapped.
+        Dominance queries are answered from the arrays, and the Nodes
+        are created the first time that the NDTree is modified.
+
+        Args:
+            self (NDTree): The NDTree.
+            finput (io.BinaryIO): The file where the NDTree is saved.
+
+        Returns:
+            None: The NDTree is loaded from finput.
+        """
+        assert (finput is not None), 'File object should not be null'
+
+        offset = finput.tell()
+        header = finput.read(_NDTREE_HEADER.size)
+        magic, version, d, max_points, min_children, num_nodes, num_points = _NDTREE_HEADER.unpack(header)
+        assert magic == NDTREE_MAGIC, 'Not a NDTree file'
+        assert version == NDTREE_VERSION, 'Unsupported version {0} of NDTree file'.format(version)
+
+        self.max_points = max_points
+        self.min_children = min_children
+
+        # (dtype, shape) of each array
+        layout = ((np.int64, (num_nodes, 4)), (np.float64, (num_nodes, 2, d)), (np.float64, (num_points, d)))
+        arrays = []
+        offset += _NDTREE_HEADER.size
+        for dtype, shape in layout:
+            nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+            if nbytes == 0:
+                arrays.append(np.empty(shape, dtype=dtype))
+            elif _has_fileno(finput):
+                arrays.append(np.memmap(finput, dtype=dtype, mode='r', offset=offset, shape=shape))
+            else:
+                # In-memory files (e.g., io.BytesIO)
+                finput.seek(offset)
+                arrays.append(np.frombuffer(finput.read(nbytes), dtype=dtype).reshape(shape))
+            offset += nbytes
+        finput.seek(offset)
+        node_table, rects, points = arrays
+        # Plain view of the memory-mapped array, which is faster to slice
+        points = np.asarray(points)
+
+        self._index = None
+        self._snapshot = None
+        if num_nodes > 0:
+            self.__dict__.pop('root', None)
+            self._flat = (np.asarray(node_table), np.asarray(rects), points)
+        else:
+            self.root = None
+            self._flat = None
+            self._index = set()
+
+    def _build_nodes(self):
+        # type: (NDTree) -> None
+        """
+        Creation of the Nodes of an NDTree loaded from a flat file, in breadth-first order.
+        """
+        node_table, rects, points = self._flat
+        nodes = [self._new_node() for _ in range(len(node_table))]
+        has_rect = ~np.isnan(rects).any(axis=(1, 2))
+        for n, (first_child, num_children, first_point, n_points), (min_corner, max_corner), valid_rect \
+                in zip(nodes, node_table.tolist(), rects.tolist(), has_rect.tolist()):
+            if valid_rect:
+                n.set_rectangle_sn(Rectangle(tuple(min_corner), tuple(max_corner)))
+            n.set_points_array(points[first_point:first_point + n_points])
+            for child in nodes[first_child:first_child + num_children]:
+                n.nodes.append(child)
+                child.set_parent(n)
+
+        self._get_index()
+        self.root = nodes[0]
+        self._flat = None
 
     def from_file_text(self, finput=None):
         # type: (NDTree, io.BinaryIO) -> None
@@ -349,8 +652,7 @@ class NDTree:
 
         self.__init__()
         point_list = (_line2tuple(line) for line in finput)
-        for point in point_list:
-            self.update_point(point)
+        self.bulk_load(point_list)
 
     def to_file(self, fname='', append=False, human_readable=False):
         # type: (NDTree, str, bool, bool) -> None
@@ -393,7 +695,7 @@ class NDTree:
     def to_file_binary(self, foutput=None):
         # type: (NDTree, io.BinaryIO) -> None
         """
-        Writing of an NDTree to a binary file.
+        Writing of an NDTree to a binary file (i.e., flat format).
 
         Args:
             self (NDTree): The Oracle.
@@ -411,15 +713,41 @@ class NDTree:
         """
         assert (foutput is not None), 'File object should not be null'
 
-        # Setting maximum recursion. It is required for the NDTree build
-        # sys.getrecursionlimit()
-        max_rec = 0x100000
-        resource.setrlimit(resource.RLIMIT_STACK, [0x100 * max_rec, resource.RLIM_INFINITY])
-        sys.setrecursionlimit(max_rec)
-
-        pickle.dump(self.root, foutput, pickle.HIGHEST_PROTOCOL)
-        pickle.dump(self.max_points, foutput, pickle.HIGHEST_PROTOCOL)
-        pickle.dump(self.min_children, foutput, pickle.HIGHEST_PROTOCOL)
+        if self._flat is not None:
+            # NDTree loaded from a flat file and not modified since then
+            node_table, rects, points = self._flat
+            foutput.write(_NDTREE_HEADER.pack(NDTREE_MAGIC, NDTREE_VERSION, rects.shape[2], self.max_points,
+                                              self.min_children, len(node_table), len(points)))
+            for arr in (node_table, rects, points):
+                foutput.write(np.ascontiguousarray(arr).tobytes())
+            return
+
+        # Breadth-first traversal of the NDTree
+        nodes = [self.root] if not self.is_empty() else []
+        queue = deque(nodes)
+        while queue:
+            n = queue.popleft()
+            nodes.extend(n.nodes)
+            queue.extend(n.nodes)
+
+        d = self.dim()
+        node_table = np.zeros((len(nodes), 4), dtype=np.int64)
+        rects = np.full((len(nodes), 2, d), np.nan)
+        point_list = []
+        first_child = 1
+        for i, n in enumerate(nodes):
+            node_table[i] = (first_child, n.num_subnodes(), len(point_list), n.num_points())
+            first_child += n.num_subnodes()
+            rect = n.get_rectangle_sn()
+            if rect is not None:
+                rects[i] = (rect.min_corner, rect.max_corner)
+            point_list.extend(n.L)
+        points = np.array(point_list, dtype=np.float64).reshape((len(point_list), d))
+
+        foutput.write(_NDTREE_HEADER.pack(NDTREE_MAGIC, NDTREE_VERSION, d, self.max_points, self.min_children,
+                                          len(nodes), len(point_list)))
+        for arr in (node_table, rects, points):
+            foutput.write(arr.tobytes())
 
     def to_file_text(self, foutput=None):
         # type: (NDTree, io.BinaryIO) -> None
@@ -697,6 +1025,13 @@ class Node:
             self.add_point(xp, index)
             self.remove_point(x)
 
+    def set_points_array(self, arr):
+        # type: (Node, np.ndarray) -> None
+        """
+        Setting the points of the current Node from an array of shape (m, d).
+        """
+        self.L = [tuple(p) for p in arr.tolist()]
+
     def get_point(self, pos=0):
         # type: (Node, int) -> tuple
         """
@@ -840,13 +1175,15 @@ class Node:
             npr.update_ideal_nadir(y)
             self.remove_point(y)
 
-    def update_node(self, x):
-        # type: (Node, tuple) -> (Node, bool)
+    def update_node(self, x, evicted=None):
+        # type: (Node, tuple, list) -> (Node, bool)
         """
         Insertion of a new point in the Node; either in self.L
         or in any descendant Node.
         Side effect: removal of points that are dominated by x.
+        The removed points are appended to the list 'evicted'.
         """
+        evicted = [] if evicted is None else evicted
         nout = self
         rect = self.get_rectangle_sn()
         if less_equal(rect.max_corner, x):
@@ -856,6 +1193,7 @@ class Node:
             # remove n and its whole sub-tree
             nparent = self.get_parent()
             nparent.remove_node(self) if nparent is not None else None
+            evicted.extend(self.s())
             # create empty node
             nout = Node(max_points=self.max_points, min_children=self.min_children)
         elif less_equal(rect.min_corner, x) or less_equal(x, rect.max_corner):
@@ -867,9 +1205,10 @@ class Node:
                     elif less_equal(x, y):
                         # y is removed
                         self.remove_point(y)
+                        evicted.append(y)
             else:
                 for npr in self.nodes:
-                    npr, update = npr.update_node(x)
+                    npr, update = npr.update_node(x, evicted)
                     if not update:
                         return nout, False
                     elif npr.is_empty_solution():
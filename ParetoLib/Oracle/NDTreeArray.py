@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 J.I. Requeno et al
+#
+# This file is part of the ParetoLib software tool and governed by the
+# 'GNU License v3'. Please see the LICENSE file that should have been
+# included as part of this software.
+"""NDTreeArray.
+
+This module implements a variant of the NDTree where the points of
+each leaf are stored in a (m, d) NumPy array instead of a list of
+tuples. Dominance tests at the leaves, the selection of the closest
+child and the seeding of a split are vectorized.
+
+The NDTreeArray keeps the interface of the NDTree (i.e., update_point,
+dominates, get_points, from_file/to_file...), so it can be used as a
+drop-in replacement. Leaves are larger by default (max_points=32) in
+order to take advantage of the vectorized operations.
+"""
+
+import numpy as np
+
+from ParetoLib.Geometry.Point import less, less_equal
+from ParetoLib.Oracle.NDTree import NDTree, Node
+
+
+class NDTreeArray(NDTree):
+    def __init__(self, max_points=32, min_children=2):
+        # type: (NDTreeArray, int, int) -> None
+        """
+        A NDTreeArray is a NDTree whose nodes are NodeArrays.
+        """
+        NDTree.__init__(self, max_points=max_points, min_children=min_children)
+
+    def _new_node(self):
+        # type: (NDTreeArray) -> NodeArray
+        return NodeArray(max_points=self.max_points, min_children=self.min_children)
+
+
+class NodeArray(Node):
+    def __init__(self, parent=None, max_points=32, min_children=2):
+        # type: (NodeArray, NodeArray, int, int) -> None
+        """
+        A NodeArray is a Node that stores its points in a (m, d) array self.A.
+        self.A is None when the NodeArray has no points.
+        self.L is kept as a view of self.A as a list of tuples. Assigning self.L replaces self.A.
+        """
+        self.A = None
+        # List of tuples built from self.A, and array it was built from
+        self._L = []
+        self._L_source = None
+        Node.__init__(self, parent=parent, max_points=max_points, min_children=min_children)
+
+    @property
+    def L(self):
+        # type: (NodeArray) -> list
+        # self.A is never modified in place, so the list is only rebuilt when self.A is replaced.
+        # The list must not be modified by the caller.
+        if self._L_source is not self.A:
+            self._L = [tuple(p) for p in self.A.tolist()] if self.A is not None else []
+            self._L_source = self.A
+        return self._L
+
+    @L.setter
+    def L(self, point_list):
+        # type: (NodeArray, list) -> None
+        self.A = np.array(point_list, dtype=float) if len(point_list) > 0 else None
+
+    # Membership function
+    def has_point(self, x):
+        # type: (NodeArray, tuple) -> bool
+        return self.A is not None and bool(np.any(np.all(self.A == x, axis=1)))
+
+    # Point operations
+    def add_point(self, x, pos=-1):
+        # type: (NodeArray, tuple, int) -> None
+        row = np.array(x, dtype=float, ndmin=2)
+        if self.A is None:
+            self.A = row
+        elif 0 <= pos < len(self.A):
+            self.A = np.insert(self.A, pos, row, axis=0)
+        else:
+            self.A = np.vstack((self.A, row))
+
+    def remove_point(self, x):
+        # type: (NodeArray, tuple) -> None
+        if self.A is not None:
+            self._keep_points(np.any(self.A != x, axis=1))
+
+    def _keep_points(self, mask):
+        # type: (NodeArray, np.ndarray) -> None
+        # Keep the rows of self.A selected by the boolean mask
+        self.A = self.A[mask] if np.any(mask) else None
+
+    def set_points_array(self, arr):
+        # type: (NodeArray, np.ndarray) -> None
+        # arr may be a read-only view of a memory-mapped file. It is never modified in place.
+        self.A = arr if len(arr) > 0 else None
+
+    def get_point(self, pos=0):
+        # type: (NodeArray, int) -> tuple
+        return tuple(self.A[pos].tolist())
+
+    def num_points(self):
+        # type: (NodeArray) -> int
+        return len(self.A) if self.A is not None else 0
+
+    def has_points(self):
+        # type: (NodeArray) -> bool
+        return self.A is not None
+
+    # NDTree operations
+    def find_closest_node(self, x):
+        # type: (NodeArray, tuple) -> NodeArray
+        """
+        Searching for the Node whose rectangle has the closest center to x.
+        """
+        min_corners = np.array([n.rect.min_corner for n in self.nodes])
+        max_corners = np.array([n.rect.max_corner for n in self.nodes])
+        centers = min_corners + (max_corners - min_corners) / 2.0
+        dist = np.sum((centers - np.asarray(x, dtype=float)) ** 2, axis=1)
+        return self.nodes[int(np.argmin(dist))]
+
+    def _highest_average_euclidean_distance(self):
+        # type: (NodeArray) -> int
+        """
+        Index of the point of self.A with the highest mean distance to the rest of points.
+        """
+        diff = self.A[:, np.newaxis, :] - self.A[np.newaxis, :, :]
+        dist = np.sqrt(np.sum(diff ** 2, axis=2))
+        return int(np.argmax(dist.sum(axis=1)))
+
+    def find_point_highest_average_euclidean_distance(self):
+        # type: (NodeArray) -> (tuple, int)
+        m = self.num_points()
+        i = self._highest_average_euclidean_distance()
+        diff = self.A - self.A[i]
+        mean_max_distance = np.sqrt(np.sum(diff ** 2, axis=1)).sum() / (m - 1)
+        return self.get_point(i), mean_max_distance
+
+    def split(self):
+        # type: (NodeArray) -> None
+        """
+        Creation of new descendant Nodes of current Node (see Node.split).
+        """
+        while self.num_subnodes() < self.min_children and self.num_points() > 1:
+            i = self._highest_average_euclidean_distance()
+            y = self.get_point(i)
+            npr = NodeArray(parent=self, max_points=self.max_points, min_children=self.min_children)
+            npr.add_point(y)
+            npr.update_ideal_nadir(y)
+            self._keep_points(np.arange(self.num_points()) != i)
+        # The remaining points are distributed in order, as the centers of the children move with each point
+        remaining, self.A = self.L, None
+        for y in remaining:
+            npr = self.find_closest_node(y)
+            npr.add_point(y)
+            npr.update_ideal_nadir(y)
+
+    def update_node(self, x, evicted=None):
+        # type: (NodeArray, tuple, list) -> (NodeArray, bool)
+        """
+        Insertion of a new point in the Node (see Node.update_node).
+        Side effect: removal of points that are dominated by x.
+        The removed points are appended to the list 'evicted'.
+        """
+        evicted = [] if evicted is None else evicted
+        nout = self
+        rect = self.get_rectangle_sn()
+        if less_equal(rect.max_corner, x):
+            # x is rejected
+            return nout, False
+        elif less_equal(x, rect.min_corner):
+            # remove n and its whole sub-tree
+            nparent = self.get_parent()
+            nparent.remove_node(self) if nparent is not None else None
+            evicted.extend(self.s())
+            # create empty node
+            nout = NodeArray(max_points=self.max_points, min_children=self.min_children)
+        elif less_equal(rect.min_corner, x) or less_equal(x, rect.max_corner):
+            if self.is_leaf():
+                if self.A is not None:
+                    if np.any(np.all(self.A <= x, axis=1)):
+                        # x is rejected
+                        return nout, False
+                    # Points dominated by x are removed
+                    dominated = np.all(self.A >= x, axis=1)
+                    evicted.extend(tuple(y) for y in self.A[dominated].tolist())
+                    self._keep_points(~dominated)
+            else:
+                # Iterate over a copy, as empty descendants are removed from self.nodes
+                for npr in list(self.nodes):
+                    npr, update = npr.update_node(x, evicted)
+                    if not update:
+                        return nout, False
+                    elif npr.is_empty_solution():
+                        self.remove_node(npr)
+                if self.num_subnodes() == 1:
+                    # Remove node n and use npr in place of n
+                    npr = self.get_subnode()
+                    nparent = self.get_parent()
+                    nparent.replace_node(self, npr) if nparent is not None else None
+        # else:
+        # Skip this node
+        return nout, True
+
+    def dominates(self, x):
+        # type: (NodeArray, tuple) -> bool
+        """
+        Checking if a point x is dominated by any point stored in the
+        current Node or in the descendants (see Node.dominates).
+        """
+        rect = self.get_rectangle_sn()
+        if less(rect.max_corner, x):
+            # x is dominated by the Pareto front
+            return True
+        elif not less_equal(rect.min_corner, x):
+            # x dominates the Pareto front, or x is incomparable to the min corner.
+            # In both cases, no point of the current subtree is lesser or equal than x
+            return False
+        elif (rect.min_corner == x) or (rect.max_corner == x):
+            return True
+        elif self.A is not None and np.any(np.all(self.A <= x, axis=1)):
+            return True
+        else:
+            return any(n.dominates(x) for n in self.nodes)
@@ -150,6 +150,112 @@ class Oracle(object):
         """
         return lambda point: self.member(point)
 
+    def member_batch(self, points):
+        # type: (Oracle, list) -> list
+        """
+        Function answering a batch of membership queries at once.
+
+        Args:
+            self (Oracle): The Oracle.
+            points (list): The points of the space that we inspect.
+
+        Returns:
+            list: [self.member(p) for p in points]
+
+        Example:
+        >>> ora = Oracle()
+        >>> ora.member_batch([(0.0, 0.0), (1.0, 1.0)])
+        >>> [False, False]
+        """
+        return [self.member(point) for point in points]
+
+    def has_member_batch(self):
+        # type: (Oracle) -> bool
+        """
+        Capability flag. Returns True if answering a batch of queries
+        (see member_batch) is cheaper than answering them one by one,
+        e.g., because the whole batch is sent to an external tool in
+        a single round trip. Search algorithms may then group the
+        membership queries of several rectangles.
+
+        Args:
+            self (Oracle): The Oracle.
+
+        Returns:
+            bool: True if member_batch should be preferred.
+
+        Example:
+        >>> ora = Oracle()
+        >>> ora.has_member_batch()
+        >>> False
+        """
+        return False
+
+    def member_rect(self, rect):
+        # type: (Oracle, Rectangle) -> bool
+        """
+        Function answering whether a whole rectangle belongs to the
+        upward closure or not, without bisecting it.
+
+        Args:
+            self (Oracle): The Oracle.
+            rect (Rectangle): The rectangle of the space that we inspect.
+
+        Returns:
+            bool: True if every point of rect belongs to the upward
+                  closure, False if no point of rect belongs to the
+                  upward closure, and None if it is unknown.
+
+        Example:
+        >>> ora = Oracle()
+        >>> ora.member_rect(Rectangle((0.0, 0.0), (1.0, 1.0)))
+        >>> None
+        """
+        return None
+
+    def has_intersect_segment(self):
+        # type: (Oracle) -> bool
+        """
+        Capability flag. Returns True if the Oracle computes the
+        intersection of a segment with the boundary of the upward
+        closure without bisection (see intersect_segment).
+
+        Args:
+            self (Oracle): The Oracle.
+
+        Returns:
+            bool: True if intersect_segment is supported.
+
+        Example:
+        >>> ora = Oracle()
+        >>> ora.has_intersect_segment()
+        >>> False
+        """
+        return False
+
+    def intersect_segment(self, segment, error):
+        # type: (Oracle, Segment, tuple) -> Segment
+        """
+        Intersection of a segment with the boundary of the upward closure.
+        The answer is equivalent to ParetoLib.Search.CommonSearch.binary_search.
+
+        Args:
+            self (Oracle): The Oracle.
+            segment (Segment): The segment, usually the diagonal of a Rectangle.
+            error (tuple): Maximum length of the resulting segment.
+
+        Returns:
+            Segment: A segment whose low (resp. high) extreme is outside
+                     (resp. inside) the upward closure, or None if the
+                     intersection cannot be computed.
+
+        Example:
+        >>> ora = Oracle()
+        >>> ora.intersect_segment(Segment((0.0, 0.0), (1.0, 1.0)), (1e-5,))
+        >>> None
+        """
+        return None
+
     # Read/Write file functions
     def from_file(self, fname='', human_readable=False):
         # type: (Oracle, str, bool) -> None
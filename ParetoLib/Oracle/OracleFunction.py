@@ -15,21 +15,188 @@ whose coordinates satisfy x_2^1 + x_2^2 > 1 falls in the upper
 closure, and, conversely, every point x_2^1 + x_2^2< 1 in the lower
 closure. This oracle has been created as a ‘proof of concept’ for
 testing and debugging purposes.
+
+Polynomial expressions are parsed without SymPy (see Polynomial), and
+membership queries are answered by numerical functions that are
+compiled once from the polynomials. SymPy is only imported on demand
+for the expressions that are not polynomials (e.g., 'y >= 1/x'), which
+are compiled with sympy.lambdify, and for the symbolic methods of
+Condition (e.g., get_expression or eval_dict). Points where the
+compiled function does not return a finite real number (e.g.,
+divisions by zero) are evaluated symbolically with SymPy, so the
+answers are the same as the symbolic evaluation.
 """
 
 import re
 import pickle
 import io
+import math
+import operator
 
+import numpy as np
 from sortedcontainers import SortedSet
-from sympy import simplify, expand, default_sort_key, Expr, Symbol
 
 import ParetoLib.Oracle as RootOracle
 from ParetoLib.Oracle.Oracle import Oracle
+from ParetoLib.Oracle.Polynomial import Polynomial, parse_polynomial
+from ParetoLib.Geometry.Segment import Segment
 
 
 # from ParetoLib._py3k import getoutput, viewvalues, viewitems
 
+_OPERATORS = {'==': operator.eq,
+              '>': operator.gt,
+              '<': operator.lt,
+              '>=': operator.ge,
+              '<=': operator.le,
+              '<>': operator.ne}
+
+
+# Cache of _interpolation_matrix
+_INTERPOLATION = {}
+
+
+def _sympy():
+    # type: () -> module
+    """
+    SymPy module. It is imported on demand, as importing SymPy takes a long time.
+    """
+    import sympy
+    return sympy
+
+
+def _polynomial_from_sympy(expr):
+    # type: (Expr) -> Polynomial
+    """
+    Polynomial equivalent to a SymPy expression, or None if the expression is not a polynomial.
+    """
+    sympy = _sympy()
+    variables = sorted(expr.free_symbols, key=sympy.default_sort_key)
+    try:
+        if len(variables) == 0:
+            # Constant expression
+            exps, coeffs = np.zeros((1, 0), dtype=int), np.array([float(expr)])
+        else:
+            terms = sympy.Poly(expr, *variables).terms()
+            exps = np.array([monom for monom, _ in terms], dtype=int).reshape((-1, len(variables)))
+            coeffs = np.array([float(coeff) for _, coeff in terms])
+    except (sympy.PolynomialError, TypeError, ValueError):
+        return None
+    if not np.all(np.isfinite(coeffs)):
+        return None
+    return Polynomial([str(var) for var in variables], exps, coeffs)
+
+
+def _compare(f, op, point):
+    # type: (callable, callable, tuple) -> bool
+    """
+    Returns op(f(*point), 0), or None if f(*point) is not a finite real number.
+    """
+    try:
+        val = f(*point)
+        if -np.inf < val < np.inf:
+            return bool(op(val, 0))
+    except (ArithmeticError, TypeError, ValueError):
+        pass
+    return None
+
+
+def _interpolation_matrix(degree):
+    # type: (int) -> (list, list)
+    """
+    Chebyshev nodes t_j in [0, 1] and matrix M (as lists) such that M * [p(t_j)] are the
+    coefficients (in increasing order of degree) of any polynomial p of that degree.
+    """
+    if degree not in _INTERPOLATION:
+        j = np.arange(degree + 1)
+        nodes = (1.0 - np.cos((2 * j + 1) * np.pi / (2 * degree + 2))) / 2.0
+        _INTERPOLATION[degree] = (nodes.tolist(), np.linalg.inv(np.vander(nodes, increasing=True)).tolist())
+    return _INTERPOLATION[degree]
+
+
+def _roots_in_unit_interval(c):
+    # type: (list) -> list
+    """
+    Real roots in (0, 1) of the polynomial with coefficients c (in increasing order of degree).
+    """
+    while len(c) > 0 and c[-1] == 0.0:
+        c = c[:-1]
+    if len(c) <= 1:
+        # Constant polynomial
+        roots = []
+    elif len(c) == 2:
+        # Linear polynomial
+        roots = [-c[0] / c[1]]
+    elif len(c) == 3:
+        # Quadratic polynomial (numerically stable formula)
+        c0, c1, c2 = c
+        disc = c1 * c1 - 4.0 * c2 * c0
+        if disc < 0.0:
+            roots = []
+        else:
+            q = -0.5 * (c1 + math.copysign(math.sqrt(disc), c1))
+            roots = [q / c2, c0 / q] if q != 0.0 else [0.0]
+    else:
+        roots = np.roots(c[::-1])
+        roots = roots[np.abs(roots.imag) <= 1e-9 * (1.0 + np.abs(roots))].real.tolist()
+    return [r for r in roots if 0.0 < r < 1.0]
+
+
+def _interval_pow(a, b, k):
+    # type: (float, float, int) -> (float, float)
+    """
+    Interval [a, b]^k.
+    """
+    if k % 2 == 1 or a >= 0.0:
+        return a ** k, b ** k
+    elif b <= 0.0:
+        return b ** k, a ** k
+    else:
+        return 0.0, max(a ** k, b ** k)
+
+
+def _interval_polynomial(terms, low, high):
+    # type: (list, tuple, tuple) -> (float, float)
+    """
+    Interval that contains the values of the polynomial in the box [low, high].
+    The interval is slightly widened for absorbing rounding errors.
+    """
+    total_low, total_high, magnitude = 0.0, 0.0, 0.0
+    for c, factors in terms:
+        a, b = c, c
+        for i, k in factors:
+            pa, pb = _interval_pow(low[i], high[i], k)
+            prods = (a * pa, a * pb, b * pa, b * pb)
+            a, b = min(prods), max(prods)
+        total_low += a
+        total_high += b
+        magnitude += max(abs(a), abs(b))
+    margin = 1e-12 * magnitude
+    return total_low - margin, total_high + margin
+
+
+# Answer of 'p op 0' for every p in the interval [l, u]: True, False or None (unknown)
+_INTERVAL_OPERATORS = {'==': lambda l, u: True if l == u == 0.0 else (False if l > 0.0 or u < 0.0 else None),
+                       '>': lambda l, u: True if l > 0.0 else (False if u <= 0.0 else None),
+                       '<': lambda l, u: True if u < 0.0 else (False if l >= 0.0 else None),
+                       '>=': lambda l, u: True if l >= 0.0 else (False if u < 0.0 else None),
+                       '<=': lambda l, u: True if u <= 0.0 else (False if l > 0.0 else None),
+                       '<>': lambda l, u: True if l > 0.0 or u < 0.0 else (False if l == u == 0.0 else None)}
+
+
+def _compare_batch(f, op, arr):
+    # type: (callable, callable, np.ndarray) -> (np.ndarray, np.ndarray)
+    """
+    Returns op(f(*arr.T), 0) and a mask of the rows of arr where f is not a finite real number.
+    """
+    with np.errstate(all='ignore'):
+        val = np.broadcast_to(f(*arr.T), (len(arr),))
+        if np.iscomplexobj(val):
+            real = np.isreal(val)
+            val = np.where(real, val.real, np.nan)
+        unknown = ~np.isfinite(val)
+        return op(val, 0) & ~unknown, unknown
+
 
 class Condition:
     def __init__(self, f='x', op='==', g='0'):
@@ -55,19 +222,80 @@ class Condition:
         assert (not f.isdigit() or not g.isdigit()), \
             'At least '' + f + '' or '' + g + '' must be a polynomial expression (i.e., not a single number)'
         self.op = op
-        self.f = simplify(f)
-        self.g = simplify(g)
-
-        # Internally, type(f) and type(g) are sympy.Expr.
-        # Besides, Condition = [sympy.Poly(f - g) op 0] and checks that
-        # sympy.Poly(f - g) is monotone (i.e., all coefficients are positive)
+        self._init_operands(f, g)
+
+    def _init_operands(self, f, g):
+        # type: (Condition, str, str) -> None
+        """
+        Initialize the operands of Condition from two strings.
+        """
+        # Internally, Condition = [Polynomial(f - g) op 0] when f and g are polynomials.
+        # Otherwise, type(f) and type(g) are sympy.Expr.
+        # In both cases, it checks that f - g is monotone (i.e., all coefficients are positive)
+        try:
+            self._poly_f = parse_polynomial(f)
+            self._poly_g = parse_polynomial(g)
+            self._poly = self._poly_f - self._poly_g
+            # SymPy expressions are built on demand from the strings f and g
+            self._src = (f, g)
+            self._f = None
+            self._g = None
+            self._compiled = None
+        except ValueError:
+            sympy = _sympy()
+            self._init_expressions(sympy.simplify(f), sympy.simplify(g))
 
         if not self.all_coeff_are_positive():
             RootOracle.logger.warning(
-                'Expression "{0}" contains negative coefficients: {1}'.format(str(self.get_expression()),
+                'Expression "{0}" contains negative coefficients: {1}'.format(str(self._get_expression_str()),
                                                                               str(
                                                                                   self._get_expression_with_negative_coeff())))
 
+    def _init_expressions(self, f, g):
+        # type: (Condition, Expr, Expr) -> None
+        """
+        Initialize the operands of Condition from two SymPy expressions.
+        """
+        self._src = None
+        self._f = f
+        self._g = g
+        self._poly_f = _polynomial_from_sympy(f)
+        self._poly_g = _polynomial_from_sympy(g)
+        if self._poly_f is None or self._poly_g is None:
+            # Not a polynomial (e.g., 1/x)
+            self._poly_f, self._poly_g, self._poly = None, None, None
+        else:
+            self._poly = self._poly_f - self._poly_g
+        self._compiled = None
+
+    @property
+    def f(self):
+        # type: (Condition) -> Expr
+        """
+        First operand of Condition as a SymPy expression.
+        """
+        if self._f is None:
+            self._f = _sympy().simplify(self._src[0])
+        return self._f
+
+    @property
+    def g(self):
+        # type: (Condition) -> Expr
+        """
+        Second operand of Condition as a SymPy expression.
+        """
+        if self._g is None:
+            self._g = _sympy().simplify(self._src[1])
+        return self._g
+
+    def is_polynomial(self):
+        # type: (Condition) -> bool
+        """
+        Returns True if both operands of Condition are polynomials.
+        Polynomial Conditions are evaluated without SymPy.
+        """
+        return self._poly is not None
+
     def init_from_string(self, poly_function):
         # type: (Condition, str) -> None
         """
@@ -100,14 +328,7 @@ class Condition:
         # if regex_comp is not None:
         if result is not None:
             self.op = result.group('op')
-            self.f = simplify(result.group('f'))
-            self.g = simplify(result.group('g'))
-
-            if not self.all_coeff_are_positive():
-                RootOracle.logger.warning(
-                    'Expression "{0}" contains negative coefficients: {1}'.format(str(self.get_expression()),
-                                                                                  str(
-                                                                                      self._get_expression_with_negative_coeff())))
+            self._init_operands(result.group('f'), result.group('g'))
 
     def __repr__(self):
         # type: (Condition) -> str
@@ -128,6 +349,8 @@ class Condition:
         """
         Printer.
         """
+        if self.is_polynomial():
+            return str(self._poly_f) + self.op + str(self._poly_g)
         return str(self.f) + self.op + str(self.g)
 
     def __eq__(self, other):
@@ -135,6 +358,10 @@ class Condition:
         """
         self == other
         """
+        if self.is_polynomial() and other.is_polynomial():
+            return (self._poly_f == other._poly_f) and \
+                   (self.op == other.op) and \
+                   (self._poly_g == other._poly_g)
         return (self.f == other.f) and \
                (self.op == other.op) and \
                (self.g == other.g)
@@ -151,8 +378,31 @@ class Condition:
         """
         Identity function (via hashing).
         """
+        if self.is_polynomial():
+            return hash((self._poly_f, self.op, self._poly_g))
         return hash((self.f, self.op, self.g))
 
+    def __getstate__(self):
+        # type: (Condition) -> dict
+        # Compiled functions cannot be pickled, and SymPy expressions are rebuilt on demand
+        state = self.__dict__.copy()
+        state['_compiled'] = None
+        if self._src is not None:
+            state['_f'] = None
+            state['_g'] = None
+        return state
+
+    def __setstate__(self, state):
+        # type: (Condition, dict) -> None
+        if 'f' in state:
+            # Condition pickled by a previous version of ParetoLib, with SymPy operands
+            f, g = state.pop('f'), state.pop('g')
+            self.__dict__.update(state)
+            self._init_expressions(f, g)
+        else:
+            self.__dict__.update(state)
+            self._compiled = None
+
     def __contains__(self, p):
         # type: (Condition, tuple) -> bool
         """
@@ -163,6 +413,8 @@ class Condition:
 
     def all_coeff_are_positive(self):
         # type: (Condition) -> bool
+        if self.is_polynomial():
+            return bool(np.all(self._poly.coeffs >= 0))
         coeffs = self.get_coeff_of_expression()
         all_positives = True
         for i in coeffs:
@@ -186,9 +438,10 @@ class Condition:
         >>> cond.get_coeff_of_expression()
         >>> {'x': 2, 'y': -4}
         """
+        sympy = _sympy()
         expr = self.get_expression()
-        expanded_expr = expand(expr)
-        simpl_expr = simplify(expanded_expr)
+        expanded_expr = sympy.expand(expr)
+        simpl_expr = sympy.simplify(expanded_expr)
         coeffs = simpl_expr.as_coefficients_dict()
         return coeffs
 
@@ -210,9 +463,10 @@ class Condition:
         >>> cond.get_positive_coeff_of_expression()
         >>> {'x': 2}
         """
+        sympy = _sympy()
         expr = self.get_expression()
-        expanded_expr = expand(expr)
-        simpl_expr = simplify(expanded_expr)
+        expanded_expr = sympy.expand(expr)
+        simpl_expr = sympy.simplify(expanded_expr)
         coeffs = simpl_expr.as_coefficients_dict()
         positive_coeff = {i: coeffs[i] for i in coeffs if coeffs[i] >= 0}
         return positive_coeff
@@ -235,24 +489,36 @@ class Condition:
         >>> cond.get_negative_coeff_of_expression()
         >>> {'y': -4}
         """
+        sympy = _sympy()
         expr = self.get_expression()
-        expanded_expr = expand(expr)
-        simpl_expr = simplify(expanded_expr)
+        expanded_expr = sympy.expand(expr)
+        simpl_expr = sympy.simplify(expanded_expr)
         coeffs = simpl_expr.as_coefficients_dict()
         negative_coeff = {i: coeffs[i] for i in coeffs if coeffs[i] < 0}
         return negative_coeff
 
     def _get_expression_with_negative_coeff(self):
         # type: (Condition) -> Expr
+        if self.is_polynomial():
+            negative = self._poly.coeffs < 0
+            return Polynomial(self._poly.variables, self._poly.exps[negative], self._poly.coeffs[negative])
         negative_coeff = self.get_negative_coeff_of_expression()
         neg_expr = ['{0} * {1}'.format(negative_coeff[i], i) for i in negative_coeff]
-        return simplify(''.join(neg_expr))
+        return _sympy().simplify(''.join(neg_expr))
 
     def _get_expression_with_positive_coeff(self):
         # type: (Condition) -> Expr
+        if self.is_polynomial():
+            positive = self._poly.coeffs >= 0
+            return Polynomial(self._poly.variables, self._poly.exps[positive], self._poly.coeffs[positive])
         positive_coeff = self.get_positive_coeff_of_expression()
         pos_expr = ['{0} * {1}'.format(positive_coeff[i], i) for i in positive_coeff]
-        return simplify('+'.join(pos_expr))
+        return _sympy().simplify('+'.join(pos_expr))
+
+    def _get_expression_str(self):
+        # type: (Condition) -> str
+        # Printer of get_expression() that does not require SymPy for polynomials
+        return str(self._poly) if self.is_polynomial() else str(self.get_expression())
 
     def get_expression(self):
         # type: (Condition) -> Expr
@@ -270,7 +536,7 @@ class Condition:
         >>> cond.get_expression()
         >>> '2x - 4y + 10 >= 0'
         """
-        return simplify(self.f - self.g)
+        return _sympy().simplify(self.f - self.g)
 
     def get_variables(self):
         # type: (Condition) -> list
@@ -286,10 +552,33 @@ class Condition:
         Example:
         >>> cond = Condition("2x - 4y", ">=", "0")
         >>> cond.get_variables()
-        >>> ['x', 'y']
+        >>> [Symbol('x'), Symbol('y')]
         """
+        sympy = _sympy()
+        if self.is_polynomial():
+            return [sympy.Symbol(var) for var in self._poly.get_var_names()]
         expr = self.get_expression()
-        return sorted(expr.free_symbols, key=default_sort_key)
+        return sorted(expr.free_symbols, key=sympy.default_sort_key)
+
+    def get_var_names(self):
+        # type: (Condition) -> list
+        """
+        Returns the names of the variables of the polynomial expression in Condition.
+
+        Args:
+            self (Condition): The Condition.
+
+        Returns:
+            list: The list of variable names, in the same order than get_variables().
+
+        Example:
+        >>> cond = Condition("2x - 4y", ">=", "0")
+        >>> cond.get_var_names()
+        >>> ['x', 'y']
+        """
+        if self.is_polynomial():
+            return self._poly.get_var_names()
+        return [str(var) for var in self.get_variables()]
 
     def eval_var_val(self, variable=None, val='0.0'):
         # type: (Condition, Symbol, float) -> Expr
@@ -318,7 +607,7 @@ class Condition:
         res = expr.subs(fv, val)
         ex = str(res) + self.op + '0'
         # RootOracle.logger.debug('Expression ' + str(simplify(ex)))
-        return simplify(ex)
+        return _sympy().simplify(ex)
 
     def eval_tuple(self, point):
         # type: (Condition, tuple) -> Expr
@@ -368,7 +657,7 @@ class Condition:
         res = expr.subs(var_point)
         ex = str(res) + self.op + '0'
         # RootOracle.logger.debug('Expression ' + str(simplify(ex)))
-        return simplify(ex)
+        return _sympy().simplify(ex)
 
     def eval_dict(self, d=None):
         # type: (Condition, dict) -> Expr
@@ -403,11 +692,70 @@ class Condition:
         res = expr.subs(di)
         ex = str(res) + self.op + '0'
         # RootOracle.logger.debug('Expression ' + str(simplify(ex)))
-        return simplify(ex)
+        return _sympy().simplify(ex)
+
+    def compile(self, variables=None):
+        # type: (Condition, list) -> callable
+        """
+        Returns a numerical function that evaluates the polynomial expression of Condition.
+
+        Args:
+            self (Condition): The Condition.
+            variables (list): The arguments of the function. By default,
+                              the variables of Condition.
+
+        Returns:
+            callable: Function that receives a value (or a NumPy array
+                      of values) per variable.
+
+        Example:
+        >>> cond = Condition("2x - 4y", ">=", "0")
+        >>> f = cond.compile()
+        >>> f(4, 2)
+        >>> 0.0
+        """
+        variables = self.get_var_names() if variables is None else [str(var) for var in variables]
+        if self.is_polynomial():
+            return self._poly.compile(variables)
+        sympy = _sympy()
+        return sympy.lambdify([sympy.Symbol(var) for var in variables], self.get_expression(), 'numpy')
+
+    def get_polynomial(self, variables=None):
+        # type: (Condition, list) -> (np.ndarray, np.ndarray)
+        """
+        Returns the polynomial expression of Condition as a list of monomials.
+
+        Args:
+            self (Condition): The Condition.
+            variables (list): The variables of the polynomial. By default,
+                              the variables of Condition.
+
+        Returns:
+            (np.ndarray, np.ndarray): Exponents of the variables in each
+                                      monomial (array of shape (m, len(variables)))
+                                      and coefficients of the monomials,
+                                      or None if the expression is not a polynomial.
+
+        Example:
+        >>> cond = Condition("2x - 4y", ">=", "0")
+        >>> cond.get_polynomial()
+        >>> (array([[1, 0], [0, 1]]), array([ 2., -4.]))
+        """
+        if not self.is_polynomial():
+            return None
+        variables = self.get_var_names() if variables is None else variables
+        return self._poly.get_polynomial(variables)
+
+    def _get_compiled(self):
+        # type: (Condition) -> (int, callable)
+        if self._compiled is None:
+            keys = self.get_var_names()
+            self._compiled = (len(keys), self.compile(keys))
+        return self._compiled
 
     # Membership functions
     def member(self, point):
-        # type: (Condition, tuple) -> Expr
+        # type: (Condition, tuple) -> bool
         """
         Function answering whether a point satisfies the inequality
         defined by Condition or not.
@@ -417,7 +765,7 @@ class Condition:
             point (tuple): The point of the space that we inspect.
 
         Returns:
-            Expr: True if the point belongs to the upward closure.
+            bool: True if the point belongs to the upward closure.
 
         Example:
         >>> p = (1.0, 1.0)
@@ -425,9 +773,13 @@ class Condition:
         >>> cond.member(p)
         >>> False
         """
-        keys = self.get_variables()
-        di = {key: point[i] for i, key in enumerate(keys)}
-        return self.eval_dict(di)
+        n, f = self._get_compiled()
+        res = _compare(f, _OPERATORS[self.op], tuple(point[:n]))
+        if res is None:
+            keys = self.get_variables()
+            di = {key: point[i] for i, key in enumerate(keys)}
+            res = bool(self.eval_dict(di))
+        return res
 
     def membership(self):
         # type: (Condition) -> callable
@@ -502,9 +854,10 @@ class Condition:
         """
         assert (finput is not None), 'File object should not be null'
 
-        self.f = pickle.load(finput)
+        f = pickle.load(finput)
         self.op = pickle.load(finput)
-        self.g = pickle.load(finput)
+        g = pickle.load(finput)
+        self._init_expressions(f, g)
 
     def from_file_text(self, finput=None):
         # type: (Condition, io.BinaryIO) -> None
@@ -625,8 +978,10 @@ class OracleFunction(Oracle):
         """
         # super(OracleFunction, self).__init__()
         Oracle.__init__(self)
-        self.variables = SortedSet([], key=default_sort_key)
+        # Names of the variables, in lexicographic order
+        self.variables = SortedSet([])
         self.oracle = set()
+        self._compiled = None
 
     def __repr__(self):
         # type: (OracleFunction) -> str
@@ -670,6 +1025,20 @@ class OracleFunction(Oracle):
         """
         return hash(tuple(self.oracle))
 
+    def __getstate__(self):
+        # type: (OracleFunction) -> dict
+        # Compiled functions cannot be pickled
+        state = self.__dict__.copy()
+        state['_compiled'] = None
+        return state
+
+    def __setstate__(self, state):
+        # type: (OracleFunction, dict) -> None
+        self.__dict__.update(state)
+        # Previous versions of ParetoLib stored the variables as SymPy Symbols
+        self.variables = SortedSet(str(var) for var in self.variables)
+        self._compiled = None
+
     def add(self, cond):
         # type: (OracleFunction, Condition) -> None
         """
@@ -689,22 +1058,23 @@ class OracleFunction(Oracle):
         >>> cond = Condition("x + y", ">=", "0")
         >>> ora.add(cond)
         """
-        self.variables = self.variables.union(cond.get_variables())
+        self.variables = self.variables.union(cond.get_var_names())
         self.oracle.add(cond)
+        self._compiled = None
 
     def dim(self):
         # type: (OracleFunction) -> int
         """
         See Oracle.dim().
         """
-        return len(self.get_variables())
+        return len(self.variables)
 
     def get_var_names(self):
         # type: (OracleFunction) -> list
         """
         See Oracle.get_var_names().
         """
-        return [str(i) for i in self.variables]
+        return list(self.variables)
 
     def get_variables(self):
         # type: (OracleFunction) -> list
@@ -728,7 +1098,8 @@ class OracleFunction(Oracle):
         >>> [Symbol('x'), Symbol('y'), Symbol('z')]
         """
         # variable_list = sorted(self.variables, key=default_sort_key)
-        variable_list = list(self.variables)
+        sympy = _sympy()
+        variable_list = [sympy.Symbol(var) for var in self.variables]
         return variable_list
 
     def _eval_var_val(self, var=None, val='0'):
@@ -778,7 +1149,7 @@ class OracleFunction(Oracle):
     def _member_zip_tuple(self, point):
         # type: (OracleFunction, tuple) -> bool
         # keys = [x, y, z]
-        keys = self.variables
+        keys = self.get_variables()
         # point = (2, 4, 0)
         # var_point = [(x, 2), (y, 4), (z, 0)]
         var_point = list(zip(keys, point))  # Works in Python 2.7 and Python 3.x
@@ -788,21 +1159,86 @@ class OracleFunction(Oracle):
     def _member_dict(self, point):
         # type: (OracleFunction, tuple) -> bool
         # keys = [x, y, z]
-        keys = self.variables
+        keys = self.get_variables()
         # point = (2, 4, 0)
         # di = {x: 2, y: 4, z: 0}
         di = {key: point[i] for i, key in enumerate(keys)}
         return self._eval_dict(di)
 
+    def _get_compiled(self):
+        # type: (OracleFunction) -> list
+        """
+        List of (Condition, compiled function, operator, degree, monomials) with the arguments
+        of the functions being all the variables of the OracleFunction. The degree and the
+        monomials are None when the condition is not a polynomial.
+        """
+        if self._compiled is None:
+            keys = self.get_var_names()
+            self._compiled = []
+            for cond in self.oracle:
+                poly = cond.get_polynomial(keys)
+                if poly is None:
+                    degree, terms = None, None
+                else:
+                    exps, coeffs = poly
+                    degree = int(np.max(np.sum(exps, axis=1), initial=0))
+                    # Monomials as (coefficient, [(variable index, exponent),...])
+                    terms = [(c, [(i, k) for i, k in enumerate(e) if k > 0])
+                             for e, c in zip(exps.tolist(), coeffs.tolist())]
+                self._compiled.append((cond, cond.compile(keys), _OPERATORS[cond.op], degree, terms))
+        return self._compiled
+
     def member(self, point):
         # type: (OracleFunction, tuple) -> bool
         """
         See Oracle.member().
         A point belongs to the Oracle if it satisfies all the conditions.
+        The evaluation stops at the first condition that is not satisfied.
+        """
+        point = tuple(point)
+        for cond, f, op, _, _ in self._get_compiled():
+            res = _compare(f, op, point)
+            if res is None:
+                # Symbolic evaluation
+                res = bool(cond.eval_zip_tuple(list(zip(self.get_variables(), point))))
+            if not res:
+                return False
+        return True
+        # Symbolic evaluation of every condition
+        # return self._member_zip_tuple(point)
+
+    def member_batch(self, points):
+        # type: (OracleFunction, np.ndarray) -> np.ndarray
         """
-        # member_zip_var performs better than member_dict
-        return self._member_zip_tuple(point)
-        # return self.member_dict(point)
+        Vectorized version of member(point).
+
+        Args:
+            self (OracleFunction): The OracleFunction.
+            points (np.ndarray): Array of shape (n, d), with d = self.dim().
+
+        Returns:
+            np.ndarray: Boolean array of length n, True for the points that satisfy all the conditions.
+
+        Example:
+        >>> ora = OracleFunction()
+        >>> ora.add(Condition("x + y", ">", "1"))
+        >>> ora.member_batch(np.array([(0.0, 0.0), (1.0, 1.0)]))
+        >>> array([False,  True])
+        """
+        arr = np.asarray(points, dtype=float).reshape((-1, self.dim()))
+        res = np.ones(len(arr), dtype=bool)
+        for cond, f, op, _, _ in self._get_compiled():
+            # Only the points that satisfy the previous conditions are evaluated
+            index = np.nonzero(res)[0]
+            if len(index) == 0:
+                break
+            sat, unknown = _compare_batch(f, op, arr[index])
+            for i in np.nonzero(unknown)[0]:
+                # Symbolic evaluation
+                var_point = list(zip(self.get_variables(), arr[index[i]].tolist()))
+                sat[i] = bool(cond.eval_zip_tuple(var_point))
+            res[index] = sat
+        return res
 
     def membership(self):
         # type: (OracleFunction) -> callable
@@ -811,6 +1247,92 @@ class OracleFunction(Oracle):
         """
         return lambda point: self.member(point)
 
+    def member_rect(self, rect):
+        # type: (OracleFunction, Rectangle) -> bool
+        """
+        See Oracle.member_rect().
+        The polynomial conditions are bounded in rect with interval arithmetic,
+        so no point of rect is evaluated.
+        """
+        res = True
+        for cond, _, _, _, terms in self._get_compiled():
+            if terms is None:
+                res = None
+                continue
+            low, high = _interval_polynomial(terms, rect.min_corner, rect.max_corner)
+            sat = _INTERVAL_OPERATORS[cond.op](low, high)
+            if sat is False:
+                return False
+            elif sat is None:
+                res = None
+        return res
+
+    def has_intersect_segment(self):
+        # type: (OracleFunction) -> bool
+        """
+        See Oracle.has_intersect_segment().
+        Intersections are computed analytically when all the conditions are polynomials.
+        """
+        compiled = self._get_compiled()
+        return len(compiled) > 0 and all(degree is not None for _, _, _, degree, _ in compiled)
+
+    def intersect_segment(self, segment, error):
+        # type: (OracleFunction, Segment, tuple) -> Segment
+        """
+        See Oracle.intersect_segment().
+        Along the segment x(t) = low + t * (high - low), each condition is a univariate
+        polynomial in t that is interpolated from a few evaluations of the condition.
+        The membership of the points of the segment only changes at the roots of these
+        polynomials, which are computed with numpy.roots (or exactly for degree <= 2).
+        """
+        x = segment
+        compiled = self._get_compiled()
+        if len(compiled) == 0 or any(degree is None for _, _, _, degree, _ in compiled):
+            return None
+        elif self.member(x.low):
+            # All the cube belongs to B1
+            return Segment(x.low, x.low)
+        elif not self.member(x.high):
+            # All the cube belongs to B0
+            return Segment(x.high, x.high)
+
+        low = x.low
+        diff = tuple(h - l for l, h in zip(x.low, x.high))
+
+        def point(t):
+            return tuple(l + t * d for l, d in zip(low, diff))
+
+        roots = set()
+        try:
+            for _, f, _, degree, _ in compiled:
+                nodes, inv_vander = _interpolation_matrix(degree)
+                values = [f(*point(t)) for t in nodes]
+                coeffs = [sum(m * v for m, v in zip(row, values)) for row in inv_vander]
+                roots.update(_roots_in_unit_interval(coeffs))
+        except (ArithmeticError, TypeError, ValueError):
+            return None
+
+        # The membership is constant between consecutive roots.
+        # Search for the first interval (or the high extreme) that belongs to the upward closure.
+        bounds = [0.0] + sorted(roots) + [1.0]
+        t_out = 0.0
+        for t0, t1 in zip(bounds[:-1], bounds[1:]):
+            t_in = (t0 + t1) / 2.0
+            if self.member(point(t_in)):
+                root = t0
+                break
+            t_out = t_in
+        else:
+            root = t_in = 1.0
+
+        # Segment of length error[0] / 2 around the root, checked with the oracle
+        width = error[0] / x.norm() / 4.0
+        y = Segment(point(max(t_out, root - width)), point(min(t_in, root + width)))
+        if self.member(y.low) or not self.member(y.high):
+            # Numerical error in the roots
+            return None
+        return y
+
     # Read/Write file functions
     def from_file_binary(self, finput=None):
         # type: (OracleFunction, io.BinaryIO) -> None
@@ -820,7 +1342,9 @@ class OracleFunction(Oracle):
         assert (finput is not None), 'File object should not be null'
 
         self.oracle = pickle.load(finput)
-        self.variables = pickle.load(finput)
+        # Previous versions of ParetoLib stored the variables as SymPy Symbols
+        self.variables = SortedSet(str(var) for var in pickle.load(finput))
+        self._compiled = None
 
     def from_file_text(self, finput=None):
         # type: (OracleFunction, io.BinaryIO) -> None
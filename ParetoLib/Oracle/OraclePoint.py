@@ -19,23 +19,107 @@ upper part.
 [1] Andrzej Jaszkiewicz and Thibaut Lust. ND-Tree-based update: a
 fast algorithm for the dynamic non-dominance problem. IEEE Trans-
 actions on Evolutionary Computation, 2018.
+
+Large clouds of points are loaded in chunks: each chunk is parsed
+with NumPy, the dominated points of the chunk are discarded, and only
+the points of the Pareto front are inserted in the NDTree at the end.
 """
 
-import sys
-import resource
+import os
+import re
+import time
 import io
 import pickle
+import itertools
+
+import numpy as np
 
-from ParetoLib.Oracle.NDTree import NDTree
+from ParetoLib.Oracle.NDTree import NDTree, NDTREE_MAGIC, raise_recursion_limit
 from ParetoLib.Oracle.Oracle import Oracle
+from ParetoLib.Geometry.Skyline import skyline, dominated_by
+import ParetoLib.Oracle as RootOracle
+
+# Number of points that are parsed and filtered at once by the chunked loaders
+CHUNK_SIZE = 1 << 16
+# Number of points of the front used for pre-filtering a chunk
+_NUM_PIVOTS = 16
+# Parentheses and commas of the text format '(x, y, z)' are read as blanks
+_TEXT_SEPARATORS = re.compile(r'[(),]')
+
+
+def _iter_chunks_text(finput, chunk_size=CHUNK_SIZE):
+    # type: (io.TextIO, int) -> iter
+    """
+    Generator of (m, d) arrays, m <= chunk_size, with the points stored in a text file.
+    Each line of the file is a point, either in format '(x, y, z)' or 'x, y, z' (i.e., CSV).
+    Blank lines are skipped. Raises ValueError if the points have different dimensions.
+    """
+    d = None
+    while True:
+        lines = list(itertools.islice(finput, chunk_size))
+        if len(lines) == 0:
+            break
+        lines = [line.decode() if isinstance(line, bytes) else line for line in lines]
+        if d is None:
+            # The dimension is the number of coordinates of the first non-blank line
+            d = next((len(coords) for coords in (_TEXT_SEPARATORS.sub(' ', line).split() for line in lines)
+                      if len(coords) > 0), None)
+            if d is None:
+                continue
+        text = _TEXT_SEPARATORS.sub(' ', ''.join(lines))
+        if text.isspace():
+            # np.fromstring does not return an empty array for a blank text
+            continue
+        arr = np.fromstring(text, dtype=float, sep=' ')
+        if arr.size % d != 0:
+            raise ValueError('Every point must have {0} coordinates'.format(d))
+        yield arr.reshape((-1, d))
+
+
+def _iter_chunks_array(arr, chunk_size=CHUNK_SIZE):
+    # type: (np.ndarray, int) -> iter
+    for i in range(0, len(arr), chunk_size):
+        yield np.asarray(arr[i:i + chunk_size], dtype=float)
+
+
+def _skyline_chunks(chunks):
+    # type: (iter) -> (np.ndarray, int)
+    """
+    Non-dominated points of a sequence of (m, d) arrays, and total number of points read.
+    The front is filtered after every chunk, so memory is bounded by the size of the front and of a chunk.
+    """
+    front = None
+    num_points = 0
+    for arr in chunks:
+        num_points += len(arr)
+        if front is not None and len(front) > 0 and len(arr) > 0:
+            # Cheap pre-filter: most of the points are dominated by the points of the front closest to the origin
+            pivots = front[np.argsort(np.sum(front, axis=1))[:_NUM_PIVOTS]]
+            arr = arr[~dominated_by(arr, pivots)]
+        front = arr if front is None else np.concatenate((front, arr))
+        front = front[skyline(front)] if len(front) > 0 else front
+    return front, num_points
 
 
 class OraclePoint(Oracle):
-    def __init__(self, max_points=2, min_children=2):
-        # type: (OraclePoint, int, int) -> None
+    def __init__(self, max_points=None, min_children=2, tree_class=NDTree):
+        # type: (OraclePoint, int, int, type) -> None
+        """
+        An OraclePoint stores the cloud of points in a tree_class (NDTree or NDTreeArray).
+        By default, the leaves of the tree store up to the default max_points of tree_class.
+
+        Example:
+        >>> ora = OraclePoint(tree_class=NDTreeArray)
+        >>> ora.add_points({(0.0, 0.5), (0.5, 0.0)})
+        >>> ora.membership()((1.0, 1.0))
+        >>> True
+        """
         # super(OraclePoint, self).__init__()
         Oracle.__init__(self)
-        self.oracle = NDTree(max_points=max_points, min_children=min_children)
+        if max_points is None:
+            self.oracle = tree_class(min_children=min_children)
+        else:
+            self.oracle = tree_class(max_points=max_points, min_children=min_children)
 
     # Printers
     def __repr__(self):
@@ -101,8 +185,78 @@ class OraclePoint(Oracle):
         >>> ora = OraclePoint()
         >>> ora.add_points(xset)
         """
-        for point in setpoints:
-            self.add_point(point)
+        self.oracle.bulk_load(setpoints)
+
+    def _bulk_load_chunks(self, chunks):
+        # type: (OraclePoint, iter) -> dict
+        start = time.time()
+        front, num_points = _skyline_chunks(chunks)
+        self.oracle = type(self.oracle)(max_points=self.oracle.max_points, min_children=self.oracle.min_children)
+        if front is not None:
+            self.oracle.bulk_load(tuple(p) for p in front.tolist())
+        end = time.time()
+        time0 = end - start
+
+        stats = {'points': num_points,
+                 'front': len(self.oracle.get_points()),
+                 'time': time0,
+                 'throughput': num_points / time0 if time0 > 0 else float('inf')}
+        RootOracle.logger.debug('Loaded {0} points ({1} non-dominated) in {2} seconds: {3} points/s'
+                                .format(stats['points'], stats['front'], stats['time'], stats['throughput']))
+        return stats
+
+    def from_array(self, arr, chunk_size=CHUNK_SIZE):
+        # type: (OraclePoint, np.ndarray, int) -> dict
+        """
+        Loading an OraclePoint from an array of points.
+        The points previously stored in the OraclePoint are discarded.
+
+        Args:
+            self (OraclePoint): The OraclePoint.
+            arr (np.ndarray): Array of shape (n, d). It may be a memory-mapped array.
+            chunk_size (int): Number of points filtered at once.
+
+        Returns:
+            dict: Number of points read ('points'), number of points
+                  stored in the OraclePoint ('front'), time in seconds
+                  ('time') and points read per second ('throughput').
+
+        Example:
+        >>> ora = OraclePoint()
+        >>> ora.from_array(np.random.rand(1000, 3))
+        """
+        assert chunk_size > 0, 'chunk_size must be positive'
+        return self._bulk_load_chunks(_iter_chunks_array(arr, chunk_size))
+
+    def load_points(self, fname, chunk_size=CHUNK_SIZE):
+        # type: (OraclePoint, str, int) -> dict
+        """
+        Loading an OraclePoint from a file of points.
+        The points previously stored in the OraclePoint are discarded.
+
+        Args:
+            self (OraclePoint): The OraclePoint.
+            fname (str): The file name. NumPy arrays of shape (n, d)
+                         are read from '.npy' files. Any other file is
+                         read as text with a point per line, either in
+                         format '(x, y, z)' or 'x, y, z'.
+            chunk_size (int): Number of points parsed and filtered at once.
+
+        Returns:
+            dict: Statistics of the loading (see from_array).
+
+        Example:
+        >>> ora = OraclePoint()
+        >>> stats = ora.load_points('points.csv')
+        >>> stats['throughput']
+        """
+        assert chunk_size > 0, 'chunk_size must be positive'
+        assert os.path.isfile(fname), 'File {0} does not exists or it is not a file'.format(fname)
+
+        if fname.endswith('.npy'):
+            return self.from_array(np.load(fname, mmap_mode='r'), chunk_size)
+        with open(fname, 'r') as finput:
+            return self._bulk_load_chunks(_iter_chunks_text(finput, chunk_size))
 
     def get_points(self):
         # type: (OraclePoint) -> set
@@ -193,7 +347,7 @@ class OraclePoint(Oracle):
         >>> False
         """
         # Returns 'True' if p belongs to the set of points stored in the Pareto archive
-        return p in self.get_points()
+        return p in self.oracle
 
     def membership(self):
         # type: (OraclePoint) -> callable
@@ -240,11 +394,18 @@ class OraclePoint(Oracle):
         >>> infile.close()
         """
         assert (finput is not None), 'File object should not be null'
+
+        offset = finput.tell()
+        magic = finput.read(len(NDTREE_MAGIC))
+        finput.seek(offset)
+        if magic == NDTREE_MAGIC:
+            # Flat format (see NDTree.to_file_binary)
+            self.oracle.from_file_flat(finput)
+            return
+
+        # Files written by older versions of ParetoLib (i.e., pickle).
         # Setting maximum recursion. It is required for the NDTree build
-        # sys.getrecursionlimit()
-        max_rec = 0x100000
-        resource.setrlimit(resource.RLIMIT_STACK, [0x100 * max_rec, resource.RLIM_INFINITY])
-        sys.setrecursionlimit(max_rec)
+        raise_recursion_limit()
 
         self.oracle = pickle.load(finput)
 
@@ -268,18 +429,7 @@ class OraclePoint(Oracle):
         """
         assert (finput is not None), 'File object should not be null'
 
-        def _line2tuple(inline):
-            line = inline
-            line = line.replace('(', '')
-            line = line.replace(')', '')
-            line = line.split(',')
-            return tuple(float(pi) for pi in line)
-
-        self.oracle = NDTree()
-
-        point_list = (_line2tuple(line) for line in finput)
-        for point in point_list:
-            self.oracle.update_point(point)
+        self._bulk_load_chunks(_iter_chunks_text(finput))
 
     def to_file_binary(self, foutput=None):
         # type: (OraclePoint, io.BinaryIO) -> None
@@ -302,13 +452,8 @@ class OraclePoint(Oracle):
         """
         assert (foutput is not None), 'File object should not be null'
 
-        # Setting maximum recursion. It is required for the NDTree build
-        # sys.getrecursionlimit()
-        max_rec = 0x100000
-        resource.setrlimit(resource.RLIMIT_STACK, [0x100 * max_rec, resource.RLIM_INFINITY])
-        sys.setrecursionlimit(max_rec)
-
-        pickle.dump(self.oracle, foutput, pickle.HIGHEST_PROTOCOL)
+        # Flat format, written without recursion
+        self.oracle.to_file_binary(foutput)
 
     def to_file_text(self, foutput=None):
         # type: (OraclePoint, io.BinaryIO) -> None
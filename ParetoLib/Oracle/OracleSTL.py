@@ -14,21 +14,167 @@ import re
 import pickle
 import subprocess
 import tempfile
+import shutil
+import collections
 import csv
 import io
 import sys
 import os
+import time
 import filecmp
 
 import ParetoLib.Oracle as RootOracle
 from ParetoLib.Oracle.Oracle import Oracle
+from ParetoLib.Oracle.STLTemplate import STLTemplate
 from ParetoLib.JAMT.JAMT import JAVA_BIN, JAVA_OPT_JAR, JAMT_BIN, JAMT_OPT_ALIAS, JAMT_OPT_STL, JAMT_OPT_RES, \
-    JAMT_OPT_SIGNAL
+    JAMT_OPT_SIGNAL, JAMT_SERVER, JAMT_SERVER_OK, JAMT_MAX_ASSERTIONS, \
+    JAMT_MAX_UNKNOWN
+
+# Header of an assertion in a STL file of JAMT (e.g., 'assertion prop:')
+ASSERTION = re.compile(r'\bassertion\s+(\w+)\s*:')
+
+# Prefix of the assertions of the k-th point in a batch (see OracleSTL.member_batch)
+BATCH_ASSERTION = re.compile(r'pt(\d+)_')
+
+# Directory in memory (tmpfs) for the files exchanged with JAMT
+SHM_DIR = '/dev/shm'
+
+
+class JAMTScratch(object):
+    def __init__(self, max_retained=JAMT_MAX_UNKNOWN):
+        # type: (JAMTScratch, int) -> None
+        """
+        Scratch directory of an OracleSTL, placed in memory (i.e., SHM_DIR) when available.
+        The STL file and the result file of JAMT are written in the same slots for every query.
+        The files of the last max_retained queries whose verdict is 'unknown' are retained.
+        """
+        shm_dir = SHM_DIR if os.path.isdir(SHM_DIR) and os.access(SHM_DIR, os.W_OK) else None
+        self.path = tempfile.mkdtemp(prefix='paretolib_', dir=shm_dir)
+        self.stl_prop_file = os.path.join(self.path, 'prop.stl')
+        self.result_file = os.path.join(self.path, 'result.csv')
+
+        self.max_retained = max_retained
+        self.retained = collections.deque()
+        self.num_retained = 0
+
+    def retain(self):
+        # type: (JAMTScratch) -> tuple
+        """
+        Moves the files of the last query out of the slots, and removes the oldest retained files.
+        Returns the new names of the STL file and the result file.
+        """
+        fnames = (os.path.join(self.path, 'unknown_{0}.stl'.format(self.num_retained)),
+                  os.path.join(self.path, 'unknown_{0}.csv'.format(self.num_retained)))
+        os.rename(self.stl_prop_file, fnames[0])
+        os.rename(self.result_file, fnames[1])
+        self.num_retained += 1
+        self.retained.append(fnames)
+        while len(self.retained) > self.max_retained:
+            for fname in self.retained.popleft():
+                try:
+                    os.remove(fname)
+                except OSError:
+                    pass
+        return fnames
+
+    def cleanup(self):
+        # type: (JAMTScratch) -> None
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+class JAMTServer(object):
+    def __init__(self, command):
+        # type: (JAMTServer, list) -> None
+        """
+        Long-lived driver of JAMT started with 'command' (see ParetoLib/JAMT/JAMTServer.java).
+        The JVM and JAMT are loaded once, and the driver evaluates one STL file per request.
+        JAMTServer is not thread safe.
+        """
+        self.command = command
+        self.proc = None
+        self.start()
+
+    def start(self):
+        # type: (JAMTServer) -> None
+        """
+        (Re)starts the driver, and waits until it is ready.
+        """
+        self.terminate()
+
+        RootOracle.logger.debug('Starting: {0}'.format(self.command))
+        DEVNULL = open(os.path.devnull, 'w')
+        try:
+            self.proc = subprocess.Popen(self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=DEVNULL,
+                                         universal_newlines=True, bufsize=1)
+        finally:
+            DEVNULL.close()
+
+        ok = self.proc.stdout.readline().strip(' \n\t')
+        if ok != JAMT_SERVER_OK:
+            self.terminate()
+            message = 'Unexpected error when starting {0}: {1}'.format(' '.join(self.command), ok)
+            RootOracle.logger.info(message)
+            raise RuntimeError(message)
+
+    def is_alive(self):
+        # type: (JAMTServer) -> bool
+        return self.proc is not None and self.proc.poll() is None
+
+    def terminate(self):
+        # type: (JAMTServer) -> None
+        if self.proc is not None:
+            for pipe in (self.proc.stdin, self.proc.stdout):
+                try:
+                    pipe.close()
+                except (OSError, IOError):
+                    pass
+            # The driver exits when stdin is closed.
+            # Popen.wait has no timeout before Python 3.3, so the driver is polled for one second
+            deadline = time.time() + 1.0
+            while self.proc.poll() is None and time.time() < deadline:
+                time.sleep(0.01)
+            if self.proc.poll() is None:
+                try:
+                    self.proc.kill()
+                except OSError:
+                    # The driver exited meanwhile
+                    pass
+                self.proc.wait()
+            self.proc = None
+
+    def run(self, stl_prop_file, result_file_name):
+        # type: (JAMTServer, str, str) -> str
+        """
+        Evaluates stl_prop_file over the signal, and writes the verdicts in result_file_name
+        with the same format than JAMT. Returns the answer of the driver ('ok' or 'error message').
+        """
+        line = ''
+        try:
+            self.proc.stdin.write('{0}\t{1}\n'.format(stl_prop_file, result_file_name))
+            self.proc.stdin.flush()
+            line = self.proc.stdout.readline()
+        except (OSError, IOError, ValueError):
+            # Broken or closed pipe
+            pass
+        if line == '':
+            message = 'JAMT server terminated unexpectedly with code {0}'.format(self.proc.poll())
+            RootOracle.logger.error(message)
+            raise RuntimeError(message)
+        return line.strip(' \n\t')
 
 
 class OracleSTL(Oracle):
-    def __init__(self, stl_prop_file='', vcd_signal_file='', var_alias_file='', stl_param_file=''):
-        # type: (OracleSTL, str, str, str, str) -> None
+    def __init__(self, stl_prop_file='', vcd_signal_file='', var_alias_file='', stl_param_file='', use_server=True,
+                 use_batch=False):
+        # type: (OracleSTL, str, str, str, str, bool, bool) -> None
+        """
+        Initialization of OracleSTL.
+        OracleSTL evaluates the STL formulas with JAMT. If use_server is True, the formulas are evaluated
+        by a long-lived JAMT process (see JAMTServer). Otherwise, or if the server cannot be started,
+        a new JAMT process is started for every query.
+        If use_batch is True, ParSearch sends the queries of each bisection step in one batch to a single
+        JAMT process (see member_batch) instead of running them in parallel in one JAMT process per worker.
+        """
         Oracle.__init__(self)
 
         # Load STLe formula
@@ -43,8 +189,18 @@ class OracleSTL(Oracle):
         self.vcd_signal_file = vcd_signal_file.strip(' \n\t')
         self.var_alias_file = var_alias_file.strip(' \n\t')
 
-        # Load the pattern for evaluating arithmetic expressions in STL
-        self.pattern = OracleSTL._regex_arithm_expr_stl_eval()
+        # Template of the STL formula with slots for the parameters
+        self.stl_template = None
+
+        # Long-lived JAMT process (False if it is not used)
+        self.use_server = use_server
+        self.jamt_server = None
+
+        # Batched membership queries are preferred by ParSearch
+        self.use_batch = use_batch
+
+        # Files exchanged with JAMT
+        self.scratch = None
 
     def _lazy_init(self):
         # type: (OracleSTL) -> None
@@ -56,12 +212,42 @@ class OracleSTL(Oracle):
         # Lazy initialization of the OracleSTL
         self.stl_formula = OracleSTL._load_stl_formula(self.stl_prop_file)
         self.stl_parameters = OracleSTL._get_parameters_stl(self.stl_param_file)
+        self.stl_template = STLTemplate(self.stl_formula, self.stl_parameters)
+        if self.__dict__.get('jamt_server') is None:
+            self.jamt_server = self._start_jamt_server() if self.use_server else False
+        if self.__dict__.get('scratch') is None:
+            self.scratch = JAMTScratch()
+
+    def _jamt_server_command(self):
+        # type: (OracleSTL) -> list
+        # java JAMTServer.java jamt.jar ./vcd_signal_file.vcd ./variables.alias
+        return [JAVA_BIN, JAMT_SERVER, JAMT_BIN, self.vcd_signal_file, self.var_alias_file]
+
+    def _start_jamt_server(self):
+        # type: (OracleSTL) -> object
+        try:
+            return JAMTServer(self._jamt_server_command())
+        except (OSError, RuntimeError):
+            RootOracle.logger.warning('JAMT server cannot be started. Starting one JAMT process per query.')
+            return False
+
+    def __del__(self):
+        # type: (OracleSTL) -> None
+        """
+        Removes 'self' from the namespace.
+        """
+        jamt_server = self.__dict__.get('jamt_server')
+        if jamt_server:
+            jamt_server.terminate()
+        scratch = self.__dict__.get('scratch')
+        if scratch is not None:
+            scratch.cleanup()
 
     def __copy__(self):
         """
         other = copy.copy(self)
         """
-        return OracleSTL(stl_prop_file=self.stl_prop_file, vcd_signal_file=self.vcd_signal_file, var_alias_file=self.var_alias_file, stl_param_file=self.stl_param_file)
+        return OracleSTL(stl_prop_file=self.stl_prop_file, vcd_signal_file=self.vcd_signal_file, var_alias_file=self.var_alias_file, stl_param_file=self.stl_param_file, use_server=self.use_server, use_batch=self.use_batch)
 
     def __deepcopy__(self, memo):
         """
@@ -69,7 +255,7 @@ class OracleSTL(Oracle):
         """
         # deepcopy function is required for creating multiple instances of the Oracle in ParSearch.
         # deepcopy cannot handle neither regex nor Popen processes
-        return OracleSTL(stl_prop_file=self.stl_prop_file, vcd_signal_file=self.vcd_signal_file, var_alias_file=self.var_alias_file, stl_param_file=self.stl_param_file)
+        return OracleSTL(stl_prop_file=self.stl_prop_file, vcd_signal_file=self.vcd_signal_file, var_alias_file=self.var_alias_file, stl_param_file=self.stl_param_file, use_server=self.use_server, use_batch=self.use_batch)
 
     def __getattr__(self, name):
         # type: (OracleSTL, str) -> _
@@ -196,15 +382,6 @@ class OracleSTL(Oracle):
         finally:
             return formula
 
-    @staticmethod
-    def _regex_arithm_expr_stl_eval():
-        # type: () -> re.Pattern
-        # Regex for detecting an arithmetic expression inside a STL formula
-        number = '([+-]?(\d+(\.\d*)?)|(\.\d+))([eE][-+]?\d+)?'
-        op = '(\*|\/|\+|\-)+'
-        math_regex = r'(\b{0}\b({1}\b{2}\b)*)'.format(number, op, number)
-        return re.compile(math_regex)
-
     def _replace_par_val_stl_formula(self, xpoint):
         # type: (OracleSTL, tuple) -> str
 
@@ -215,32 +392,45 @@ class OracleSTL(Oracle):
         # Returns a string (body of the JAMT stl file).
         assert self.dim() <= len(xpoint)
 
-        def eval_expr(match):
-            # Evaluate the arithmetic expression detected by 'match'
-            res = 0
-            try:
-                res = str(eval(match.group(0)))
-            except SyntaxError:
-                RootOracle.logger.error('Syntax error: {0}'.format(str(match)))
-            finally:
-                return res
-
         RootOracle.logger.debug('Evaluating STL formula')
-        # Create a temporal file with an instance of the STL formula
-        stl_prop_file_subst = tempfile.NamedTemporaryFile(mode='w', delete=False)
-        stl_prop_file_subst_name = stl_prop_file_subst.name
+        # Write the instance of the STL formula in the slot of the scratch directory
+        stl_prop_file_subst_name = self.scratch.stl_prop_file
+        stl_prop_file_subst = open(stl_prop_file_subst_name, 'w')
 
         # Substitute the parameters in the parametric STL formula by numbers
-        val_formula = self.stl_formula
-        for i, par in enumerate(self.stl_parameters):
-            val_formula = re.sub(r'\b{0}\b'.format(par), str(xpoint[i]), val_formula)
-        val_formula = self.pattern.sub(eval_expr, val_formula)
+        val_formula = self.stl_template.instantiate(xpoint)
 
         stl_prop_file_subst.write(val_formula)
         stl_prop_file_subst.close()
 
         return stl_prop_file_subst_name
 
+    def _replace_par_val_stl_formula_batch(self, points):
+        # type: (OracleSTL, list) -> str
+
+        # Writes the instances of the STL formula for every point in a single STL file.
+        # The signals are declared once, and the assertions of the k-th point are renamed 'pt<k>_<name>'.
+        #
+        # Returns a string (body of the JAMT stl file).
+        assert all(self.dim() <= len(xpoint) for xpoint in points)
+
+        RootOracle.logger.debug('Evaluating batch of STL formulas')
+        stl_prop_file_subst_name = self.scratch.stl_prop_file
+        stl_prop_file_subst = open(stl_prop_file_subst_name, 'w')
+
+        for k, xpoint in enumerate(points):
+            val_formula = self.stl_template.instantiate(xpoint)
+            match = ASSERTION.search(val_formula)
+            start = match.start() if match is not None else len(val_formula)
+            if k == 0:
+                # Declarations of the signals
+                stl_prop_file_subst.write(val_formula[:start])
+            assertions = ASSERTION.sub(lambda m: 'assertion pt{0}_{1}:'.format(k, m.group(1)), val_formula[start:])
+            stl_prop_file_subst.write(assertions + '\n')
+        stl_prop_file_subst.close()
+
+        return stl_prop_file_subst_name
+
     def eval_stl_formula(self, stl_prop_file):
         # type: (OracleSTL, str) -> str
         """
@@ -250,19 +440,30 @@ class OracleSTL(Oracle):
             self (OracleSTLeLib): The Oracle.
             stl_prop_file: File containing the instance of the parametrized STL formula that will be evaluated.
         Returns:
-            bool: True if the stl_prop_file is satisfied.
+            str: File containing the result of JAMT. The file is overwritten by the next evaluation.
 
         Example:
         >>> ora = OracleSTL()
         >>> stl_prop_file = '/tmp/tmp9878'
         >>> ora.eval_stl_formula(stl_prop_file)
-        >>> False
+        >>> '/dev/shm/paretolib_x8a1/result.csv'
         """
-        # File having the result of the STL property evaluation over the signal
-        # temp_dir = tempfile.gettempdir()
-        # temp_name = next(tempfile._get_candidate_names())
-        # result_file_name = os.path.join(temp_dir, temp_name)
-        fd, result_file_name = tempfile.mkstemp()
+        # File having the result of the STL property evaluation over the signal.
+        # Results of the previous query are discarded
+        result_file_name = self.scratch.result_file
+        open(result_file_name, 'w').close()
+
+        if self.jamt_server:
+            try:
+                answer = self.jamt_server.run(stl_prop_file, result_file_name)
+                if answer != JAMT_SERVER_OK:
+                    RootOracle.logger.info('Evaluating "{0}" raised an exception: {1}'.format(stl_prop_file, answer))
+                return result_file_name
+            except RuntimeError:
+                RootOracle.logger.warning('JAMT server died. Starting one JAMT process per query.')
+                self.jamt_server.terminate()
+                self.jamt_server = False
+
         try:
             # java -jar ./jamt.jar -x ./stl_prop_file.stl -s ./vcd_signal_file.vcd -a ./variables.alias -v out
 
@@ -282,8 +483,6 @@ class OracleSTL(Oracle):
             RootOracle.logger.info(message)
             # raise RuntimeError(message)
         finally:
-            # close the temporary file
-            os.close(fd)
             # Return the result of evaluating the STL formula
             return result_file_name
 
@@ -344,6 +543,92 @@ class OracleSTL(Oracle):
         
         return _eval, delete
 
+    @staticmethod
+    def _parse_amt_result_batch(res_file, n):
+        # type: (str, int) -> (list, bool)
+        """
+        Interprets the result of evaluating a batch of n instances of a parametrized STL formula
+        (see _replace_par_val_stl_formula_batch).
+
+        Args:
+            res_file (str): The file containing the result provided by JAMT (STL).
+            n (int): Number of instances.
+        Returns:
+            list: For every instance, True if the STL formula is satisfied, else False.
+            bool: True if JAMT succeed in evaluating every STL expression (i.e., no error happened)
+        """
+        tp_result = {'violated': False, 'satisfied': True, 'unknown': None}
+
+        # Verdicts of the assertions of each instance
+        _eval_lists = [[] for _ in range(n)]
+
+        f = open(res_file, 'r')
+        f2 = (line.replace(' ', '') for line in f)
+        reader = csv.DictReader(f2)
+
+        RootOracle.logger.debug('CSV keys of {0}: {1}'.format(res_file, reader.fieldnames))
+
+        if reader.fieldnames is not None:
+            # First (resp. last) column of the CSV file contains the name (resp. result) of the assertion
+            key_assert = reader.fieldnames[0]
+            key_veredict = reader.fieldnames[-1]
+            for line in reader:
+                match = BATCH_ASSERTION.match(line[key_assert])
+                if match is not None and int(match.group(1)) < n:
+                    _eval_lists[int(match.group(1))].append(tp_result.get(line[key_veredict]))
+        f.close()
+
+        # All conditions are true (i.e., 'and' policy).
+        # Instances without verdict are considered as 'unknown'.
+        _eval = [len(_eval_list) > 0 and all(_eval_list) for _eval_list in _eval_lists]
+        delete = all(len(_eval_list) > 0 and None not in _eval_list for _eval_list in _eval_lists)
+
+        RootOracle.logger.debug('Result of evaluating {0}: {1}'.format(res_file, _eval))
+
+        return _eval, delete
+
+    def member_batch(self, points):
+        # type: (OracleSTL, list) -> list
+        """
+        See Oracle.member_batch().
+        The instances of the STL formula for up to JAMT_MAX_ASSERTIONS points are written as
+        the assertions of a single STL file, which is evaluated by one call to JAMT.
+        """
+        assert self.stl_prop_file != ''
+        assert self.vcd_signal_file != ''
+        assert self.var_alias_file != ''
+        assert self.stl_parameters != []
+
+        RootOracle.logger.debug('Running batched membership function')
+        res = []
+        for i in range(0, len(points), JAMT_MAX_ASSERTIONS):
+            batch = points[i:i + JAMT_MAX_ASSERTIONS]
+
+            # Replace parameters of the STL formula with current values in every xpoint tuple
+            stl_prop_file_subst_name = self._replace_par_val_stl_formula_batch(batch)
+
+            # Invoke AMT for solving the STL formulas
+            result_file_name = self.eval_stl_formula(stl_prop_file_subst_name)
+
+            # Parse the AMT result
+            res_batch, delet = OracleSTL._parse_amt_result_batch(result_file_name, len(batch))
+            res.extend(res_batch)
+
+            # Files are retained when some verdict is 'unknown'
+            if not delet:
+                RootOracle.logger.warning(
+                    'Evaluation of file {0} returns "unkown" (see {1}).'.format(*self.scratch.retain()))
+        return res
+
+    def has_member_batch(self):
+        # type: (OracleSTL) -> bool
+        """
+        See Oracle.has_member_batch().
+        One JAMT call evaluates a whole batch, but sequentially, whereas ParSearch runs one JAMT process
+        per worker otherwise. Batches are only preferred on demand (use_batch).
+        """
+        return self.use_batch
+
     def member(self, xpoint):
         # type: (OracleSTL, tuple) -> bool
         """
@@ -371,14 +656,10 @@ class OracleSTL(Oracle):
         # Parse the AMT result
         res, delet = OracleSTL._parse_amt_result(result_file_name)
 
-        # Remove temporal files
-        if delet:
-            os.remove(stl_prop_file_subst_name)
-            os.remove(result_file_name)
-        else:
+        # Files are retained when the verdict is 'unknown'
+        if not delet:
             RootOracle.logger.warning(
-                'Evaluation of file {0} returns "unkown" (see {1}).'.format(stl_prop_file_subst_name,
-                                                                            result_file_name))
+                'Evaluation of file {0} returns "unkown" (see {1}).'.format(*self.scratch.retain()))
 
         return res
 
@@ -410,7 +691,8 @@ class OracleSTL(Oracle):
                     RootOracle.logger.info('File {0} does not exists or it is not a file'.format(fname))
 
             self.__init__(stl_prop_file=stl_prop_file, stl_param_file=stl_param_file, var_alias_file=var_alias_file,
-                          vcd_signal_file=vcd_signal_file)
+                          vcd_signal_file=vcd_signal_file, use_server=self.use_server,
+                          use_batch=self.use_batch)
 
         except EOFError:
             RootOracle.logger.error('Unexpected error when loading {0}: {1}'.format(finput, sys.exc_info()[0]))
@@ -453,7 +735,8 @@ class OracleSTL(Oracle):
                     RootOracle.logger.info('File {0} does not exists or it is not a file'.format(fname))
 
             self.__init__(stl_prop_file=stl_prop_file, stl_param_file=stl_param_file, var_alias_file=var_alias_file,
-                          vcd_signal_file=vcd_signal_file)
+                          vcd_signal_file=vcd_signal_file, use_server=self.use_server,
+                          use_batch=self.use_batch)
 
         except EOFError:
             RootOracle.logger.error('Unexpected error when loading {0}: {1}'.format(finput, sys.exc_info()[0]))
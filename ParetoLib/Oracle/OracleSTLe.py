@@ -15,26 +15,658 @@ In Proceedings of the 25th International Conference on Tools and
 Algorithms for the Construction and Analysis of Systems (TACAS)
 """
 
-import re
 import pickle
 import subprocess
 import io
 import sys
 import os
 import filecmp
-from ctypes import c_double
+import threading
+import itertools
+import functools
+import ctypes.util
+from ctypes import c_double, c_int, c_size_t, Structure, CDLL
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
 
 import ParetoLib.Oracle as RootOracle
 from ParetoLib.Oracle.Oracle import Oracle
-from ParetoLib.STLe.STLe import STLeLibInterface, STLE_BIN, STLE_INTERACTIVE, STLE_READ_SIGNAL, STLE_EVAL, STLE_RESET, STLE_VERSION, STLE_OK, MAX_STLE_CALLS
+from ParetoLib.Oracle.STLTemplate import STLTemplate
+from ParetoLib.STLe.STLe import STLeLibInterface, STLE_BIN, STLE_INTERACTIVE, STLE_READ_SIGNAL, STLE_EVAL, STLE_RESET, STLE_VERSION, STLE_OK, STLE_ERROR, MAX_STLE_CALLS, MAX_STLE_PIPELINE, \
+    MAX_STLE_MEMORY, MIN_STLE_HIT_RATE, STLE_MEMORY_CHECK
+
+# Lazy initialization of oracles shared by several threads
+_lazy_init_lock = threading.Lock()
+
+
+def resident_memory(pid='self'):
+    # type: (object) -> int
+    """
+    Resident memory (in bytes) of the process pid, or None if it cannot be measured.
+    """
+    try:
+        with open('/proc/{0}/statm'.format(pid), 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (IOError, OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _load_mallinfo():
+    # type: () -> callable
+    # mallinfo2 (glibc >= 2.33) reports sizes in size_t; older mallinfo in int
+    try:
+        libc = CDLL(ctypes.util.find_library('c'))
+    except (OSError, TypeError):
+        return None
+    for name, field_type in (('mallinfo2', c_size_t), ('mallinfo', c_int)):
+        mallinfo = getattr(libc, name, None)
+        if mallinfo is not None:
+            class MallInfo(Structure):
+                _fields_ = [(field, field_type) for field in ('arena', 'ordblks', 'smblks', 'hblks', 'hblkhd',
+                                                              'usmblks', 'fsmblks', 'uordblks', 'fordblks',
+                                                              'keepcost')]
+
+            mallinfo.restype = MallInfo
+            mallinfo.argtypes = []
+            return mallinfo
+    return None
+
+
+_mallinfo = _load_mallinfo()
+
+
+def heap_memory():
+    # type: () -> int
+    """
+    Memory (in bytes) allocated with malloc and not freed yet in the current process,
+    or None if it cannot be measured (i.e., the C library is not glibc).
+    Unlike the resident memory, it decreases when memory is freed.
+    """
+    if _mallinfo is None:
+        return None
+    info = _mallinfo()
+    return info.uordblks + info.hblkhd
+
+
+class SignalCache(object):
+    def __init__(self):
+        # type: (SignalCache) -> None
+        """
+        Process-wide cache of the signals loaded by the STLe library, shared by the OracleSTLeLibs
+        that read the same signal file. Only the signal is shared: every oracle has its own monitors.
+        Signal files are identified by their path, modification time and size.
+        Entries are reference counted, and unloaded when the last oracle releases them.
+        Entries are not inherited by forked processes (e.g., workers of ParSearch), which load
+        their own signals.
+        """
+        self.lock = threading.Lock()
+        # key -> [value, number of references]
+        self.entries = {}
+
+    def _after_fork(self):
+        # type: (SignalCache) -> None
+        # The copies of the signals of the parent are left to the oracles that were copied with them
+        self.lock = threading.Lock()
+        self.entries = {}
+
+    @staticmethod
+    def signal_key(csv_signal_file):
+        # type: (str) -> tuple
+        try:
+            stat = os.stat(csv_signal_file)
+        except OSError:
+            message = 'Unexpected error when loading {0}'.format(csv_signal_file)
+            RootOracle.logger.error(message)
+            raise RuntimeError(message)
+        return os.path.realpath(csv_signal_file), stat.st_mtime, stat.st_size
+
+    def acquire(self, key, load):
+        # type: (SignalCache, tuple, callable) -> object
+        """
+        Returns the value cached for key, or the value returned by load() if there is none.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                entry = [load(), 0]
+                self.entries[key] = entry
+            entry[1] += 1
+            return entry[0]
+
+    def release(self, key, unload):
+        # type: (SignalCache, tuple, callable) -> None
+        """
+        Calls unload(value) when the last reference to key is released.
+        Keys acquired by the parent of a forked process are ignored.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self.entries[key]
+                unload(entry[0])
+
+
+# Signals loaded in the current process
+signal_cache = SignalCache()
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=signal_cache._after_fork)
+
+
+class STLeCache(object):
+    def __init__(self, max_memory=MAX_STLE_MEMORY):
+        # type: (STLeCache, int) -> None
+        """
+        Statistics and cleaning policy of the cache of a STLe worker (i.e., STLeProcess or STLeMonitor).
+        STLe memoizes the sub-formulas that it evaluates. The cache is cleaned when the memory
+        of the worker exceeds max_memory bytes, or when it exceeds max_memory/2 bytes and the cache is
+        rarely hit (see must_clean). Hits are approximated by the evaluations of formulas that
+        were already evaluated since the last cleaning.
+        """
+        self.max_memory = max_memory
+
+        # Hashes of the formulas evaluated since the last cleaning of the cache of STLe
+        self.formulas = set()
+
+        # Number of evaluations and hits since the last cleaning of the cache of STLe
+        self.num_oracle_calls = 0
+        self.num_hits = 0
+
+        # Number of evaluations, hits and cleanings since the creation of the worker
+        self.total_oracle_calls = 0
+        self.total_hits = 0
+        self.num_cleanings = 0
+
+        # Memory after the last cleaning of the cache of STLe (None if it cannot be measured)
+        self.memory_clean = None
+
+    def memory_usage(self):
+        # type: (STLeCache) -> int
+        """
+        Memory (in bytes) of the worker, or None if it cannot be measured
+        (i.e., resident memory of a STLeProcess, or memory allocated by a STLeMonitor).
+        """
+        return None
+
+    def _reset_cache_stats(self):
+        # type: (STLeCache) -> None
+        self.formulas.clear()
+        self.num_oracle_calls = 0
+        self.num_hits = 0
+        self.memory_clean = self.memory_usage()
+
+    def _count(self, stl_formula):
+        # type: (STLeCache, str) -> None
+        key = hash(stl_formula)
+        if key in self.formulas:
+            self.num_hits += 1
+            self.total_hits += 1
+        else:
+            self.formulas.add(key)
+        self.num_oracle_calls += 1
+        self.total_oracle_calls += 1
+
+    def must_clean(self):
+        # type: (STLeCache) -> bool
+        """
+        Returns True if the cache of STLe should be cleaned before the next evaluation.
+        """
+        if self.memory_clean is None:
+            # Resident memory cannot be measured: the cache is cleaned after MAX_STLE_CALLS
+            return self.num_oracle_calls > MAX_STLE_CALLS
+        elif self.num_oracle_calls == 0 or self.num_oracle_calls % STLE_MEMORY_CHECK != 0:
+            return False
+
+        memory = self.memory_usage()
+        if memory is None:
+            return False
+
+        # The memory released by cleaning the cache is reused by STLe, but it is not returned to the OS.
+        # So, the cache is only cleaned once it grows beyond its size at the last cleaning.
+        hit_rate = float(self.num_hits) / self.num_oracle_calls
+        return memory > max(self.max_memory, self.memory_clean) or \
+            (memory > max(self.max_memory // 2, self.memory_clean) and hit_rate < MIN_STLE_HIT_RATE)
+
+    def clean_cache(self):
+        # type: (STLeCache) -> None
+        self.num_cleanings += 1
+        self._reset_cache_stats()
+
+    def cache_stats(self):
+        # type: (STLeCache) -> dict
+        """
+        Statistics of the cache of STLe.
+        """
+        return {'calls': self.total_oracle_calls,
+                'hits': self.total_hits,
+                'hit_rate': float(self.total_hits) / max(self.total_oracle_calls, 1),
+                'cleanings': self.num_cleanings,
+                'memory': self.memory_usage(),
+                'max_memory': self.max_memory}
+
+
+class STLeProcess(STLeCache):
+    def __init__(self, csv_signal_file, max_memory=MAX_STLE_MEMORY):
+        # type: (STLeProcess, str, int) -> None
+        """
+        STLe running in interactive mode, with the signal csv_signal_file loaded in memory.
+        The resident memory of the process is kept below max_memory bytes (see STLeCache).
+        STLeProcess is not thread safe (see STLePool).
+        """
+        STLeCache.__init__(self, max_memory)
+        self.csv_signal_file = csv_signal_file
+
+        self.proc = None
+        self.start()
+
+    def start(self):
+        # type: (STLeProcess) -> None
+        """
+        (Re)starts STLe and loads the signal in memory.
+        """
+        self.terminate()
+
+        # Start STLe oracle in interactive mode (i.e., more efficient).
+        # Buffered binary pipes, so that a batch of commands is written at once (see eval_stl_formula_batch)
+        args = [STLE_BIN, STLE_INTERACTIVE]
+        RootOracle.logger.debug('Starting: {0}'.format(args))
+        self.proc = subprocess.Popen(args, stdin=subprocess.PIPE, stdout=subprocess.PIPE, bufsize=-1)
+
+        # Load the signal in memory
+        try:
+            self._read_signal()
+        except RuntimeError:
+            self.terminate()
+            raise
+        self._reset_cache_stats()
+
+    def _read_signal(self):
+        # type: (STLeProcess) -> None
+        # (read-signal-csv "file_name")
+        expression = '({0} "{1}")'.format(STLE_READ_SIGNAL, self.csv_signal_file)
+        ok = self.run([expression])[0]
+        ok = ok.strip(' \n\t')
+        #
+        RootOracle.logger.debug('ok: {0}'.format(ok))
+        if ok != STLE_OK:
+            message = 'Unexpected error when loading {0}: {1}'.format(self.csv_signal_file, ok)
+            RootOracle.logger.error(message)
+            raise RuntimeError(message)
+
+    def read_signal(self, csv_signal_file):
+        # type: (STLeProcess, str) -> None
+        """
+        Replaces the signal loaded in STLe by csv_signal_file.
+        STLe keeps monitoring the first signal that it reads, so STLe is restarted.
+        """
+        self.csv_signal_file = csv_signal_file
+        self.start()
+
+    def is_alive(self):
+        # type: (STLeProcess) -> bool
+        return self.proc is not None and self.proc.poll() is None
+
+    def memory_usage(self):
+        # type: (STLeProcess) -> int
+        return resident_memory(self.proc.pid) if self.proc is not None else None
+
+    def terminate(self):
+        # type: (STLeProcess) -> None
+        if self.proc is not None:
+            if self.proc.poll() is None:
+                self.proc.terminate()
+            self.proc.wait()
+            for pipe in (self.proc.stdout, self.proc.stdin):
+                try:
+                    pipe.close()
+                except OSError:
+                    pass
+            self.proc = None
+
+    def run(self, expressions):
+        # type: (STLeProcess, list) -> list
+        """
+        Writes a batch of commands to STLe with a single flush, and returns the answers.
+        STLe answers every command with one line.
+        """
+        expression = ''.join(expressions)
+        RootOracle.logger.debug('Running: {0}'.format(expression))
+        lines = []
+        try:
+            self.proc.stdin.write(expression.encode('utf-8'))
+            self.proc.stdin.flush()
+            lines = [self.proc.stdout.readline().decode('utf-8') for _ in expressions]
+        except (OSError, ValueError):
+            # Broken or closed pipe
+            pass
+        RootOracle.logger.debug('result: {0}'.format(lines))
+        if len(lines) < len(expressions) or not all(lines):
+            message = 'STLe terminated unexpectedly with code {0}'.format(self.proc.poll())
+            RootOracle.logger.error(message)
+            raise RuntimeError(message)
+        return lines
+
+    def clean_cache(self):
+        # type: (STLeProcess) -> None
+        memory = self.memory_usage()
+        if memory is not None and memory > 2 * self.max_memory:
+            # Restarting STLe is the only way of returning its memory to the OS
+            RootOracle.logger.debug('Restarting STLe: {0} bytes'.format(memory))
+            self.start()
+        else:
+            # Cleaning cache
+            # (clear-monitor)
+            expression = '({0})'.format(STLE_RESET)
+            self.run([expression])
+        STLeCache.clean_cache(self)
+
+    def _eval_pipeline(self, expressions):
+        # type: (STLeProcess, list) -> list
+        results = []
+        if len(expressions) > 0:
+            for expression, res1 in zip(expressions, self.run(expressions)):
+                if res1.startswith('({0}'.format(STLE_ERROR)):
+                    RootOracle.logger.warning('Error when evaluating formula {0}: {1}'.format(expression, res1))
+                    results.append(False)
+                else:
+                    results.append(OracleSTLe._parse_stle_result(res1))
+        return results
+
+    def eval_stl_formula_batch(self, stl_formulas):
+        # type: (STLeProcess, list) -> list
+        """
+        See OracleSTLe.eval_stl_formula_batch().
+        """
+        results = []
+        # (eval formula_1)(eval formula_2)...
+        expressions = []
+        for stl_formula in stl_formulas:
+            # Cleaning the cache of STLe (i.e., 'gargage collector')
+            if self.must_clean():
+                results.extend(self._eval_pipeline(expressions))
+                expressions = []
+                self.clean_cache()
+            self._count(stl_formula)
+            expressions.append('({0} {1})'.format(STLE_EVAL, stl_formula))
+            if len(expressions) == MAX_STLE_PIPELINE:
+                results.extend(self._eval_pipeline(expressions))
+                expressions = []
+        results.extend(self._eval_pipeline(expressions))
+        return results
+
+
+class STLeMonitor(STLeCache):
+    def __init__(self, stle, signal, signalvars, max_memory=MAX_STLE_MEMORY):
+        # type: (STLeMonitor, STLeLibInterface, c_void_p, c_void_p, int) -> None
+        """
+        Expression set and offline monitor of the STLe library over a signal.
+        The signal is only read, so it can be shared by several STLeMonitors.
+        Monitors live in the current process, so the memory of a monitor is measured as the
+        memory allocated and not freed during its own evaluations since it was (re)started
+        (see heap_memory and STLeCache).
+        STLeMonitor is not thread safe (see STLePool).
+        """
+        STLeCache.__init__(self, max_memory)
+        self.stle = stle
+        self.signal = signal
+        self.signalvars = signalvars
+
+        # Memory allocated by the monitor, and heap_memory() when the running evaluation started
+        self.memory = 0
+        self.mark = None
+
+        # exprset is a set of STLe formulas in C API format
+        self.exprset = None
+        self.monitor = None
+        self.start()
+
+    def start(self):
+        # type: (STLeMonitor) -> None
+        """
+        Creates a new expression set and signal monitor.
+        """
+        self.terminate()
+
+        # Create a new exprset
+        self.exprset = self.stle.stl_make_exprset()
+        RootOracle.logger.debug('Exprset created: {0}'.format(self.exprset))
+
+        # Create a monitor for analyzing the signal
+        self.monitor = self.stle.stl_make_offlinepcmonitor(self.signal, self.signalvars, self.exprset)
+        RootOracle.logger.debug('Monitor created: {0}'.format(self.monitor))
+
+        # The memory of the old monitor has been freed
+        self.memory = 0
+        if self.mark is not None:
+            self.mark = heap_memory()
+        self._reset_cache_stats()
+
+    def read_signal(self, signal, signalvars):
+        # type: (STLeMonitor, c_void_p, c_void_p) -> None
+        """
+        Replaces the signal of the monitor, and creates a new expression set and signal monitor.
+        """
+        self.signal = signal
+        self.signalvars = signalvars
+        self.start()
+
+    def is_alive(self):
+        # type: (STLeMonitor) -> bool
+        return self.monitor is not None
+
+    def terminate(self):
+        # type: (STLeMonitor) -> None
+        RootOracle.logger.debug('Cleaning cache of exprsets')
+
+        # Remove monitor
+        if self.monitor is not None:
+            self.stle.stl_delete_offlinepcmonitor(self.monitor)
+            self.monitor = None
+
+        # Remove exprset
+        if self.exprset is not None:
+            self.stle.stl_delete_exprset(self.exprset)
+            self.exprset = None
+
+    def memory_usage(self):
+        # type: (STLeMonitor) -> int
+        memory = heap_memory()
+        if memory is None:
+            return None
+        elif self.mark is None:
+            return self.memory
+        return max(self.memory + memory - self.mark, 0)
+
+    def clean_cache(self):
+        # type: (STLeMonitor) -> None
+        # Remove signal monitor and expression set, and create new ones
+        self.start()
+        STLeCache.clean_cache(self)
+
+    def eval_stl_formula(self, stl_formula):
+        # type: (STLeMonitor, str) -> bool
+        """
+        See OracleSTLeLib.eval_stl_formula().
+        """
+        RootOracle.logger.debug('Evaluating: {0}'.format(stl_formula))
+
+        # Add STLe formula to the expression set
+        expr = self.stle.stl_parse_sexpr_str(self.exprset, stl_formula)
+
+        RootOracle.logger.debug('STLe formula parsed: {0}'.format(expr))
+
+        # Evaluating formula
+        stl_series = self.stle.stl_offlinepcmonitor_make_output(self.monitor, expr)
+        RootOracle.logger.debug('STLe series: {0}'.format(stl_series))
+
+        res = self.stle.stl_pcseries_value0(stl_series)
+        RootOracle.logger.debug('Result: {0}'.format(res))
+
+        # Remove STLe formula from the expression set
+        self.stle.stl_unref_expr(expr)
+
+        # Return the result of evaluating the STL formula.
+        return OracleSTLeLib._parse_stle_result(res)
+
+    def eval_stl_formula_batch(self, stl_formulas):
+        # type: (STLeMonitor, list) -> list
+        """
+        See OracleSTLe.eval_stl_formula_batch().
+        """
+        results = []
+        # Memory allocated meanwhile is charged to this monitor.
+        # Concurrent monitors of the pool are charged for the allocations of each other,
+        # but their own allocations are freed when they are cleaned.
+        self.mark = heap_memory()
+        try:
+            for stl_formula in stl_formulas:
+                # Cleaning the cache of STLe (i.e., 'gargage collector')
+                if self.must_clean():
+                    self.clean_cache()
+                self._count(stl_formula)
+                results.append(self.eval_stl_formula(stl_formula))
+        finally:
+            self.memory = self.memory_usage()
+            self.mark = None
+        return results
+
+
+class STLePool(object):
+    def __init__(self, new_worker, num_proc=1):
+        # type: (STLePool, callable, int) -> None
+        """
+        Pool of num_proc workers (i.e., STLeProcess or STLeMonitor) created by calling new_worker().
+        Queries coming from several threads are dispatched to idle workers,
+        and workers that die are restarted.
+        """
+        assert num_proc >= 1
+
+        self.num_proc = num_proc
+
+        # Threads for dispatching concurrent queries (see OracleSTLe.member_async)
+        self.executor = ThreadPoolExecutor(max_workers=num_proc)
+
+        # Workers are started concurrently (e.g., STLe processes load the signal in parallel)
+        self.workers = [future.result() for future in [self.executor.submit(new_worker) for _ in range(num_proc)]]
+        self.idle = queue.Queue()
+        for worker in self.workers:
+            self.idle.put(worker)
+
+    @contextmanager
+    def worker(self):
+        # type: (STLePool) -> object
+        """
+        Borrows an idle worker from the pool.
+        """
+        worker = self.idle.get()
+        try:
+            if not worker.is_alive():
+                RootOracle.logger.warning('Restarting STLe')
+                worker.start()
+            yield worker
+        finally:
+            self.idle.put(worker)
+
+    def run(self, expressions):
+        # type: (STLePool, list) -> list
+        """
+        See STLeProcess.run().
+        """
+        with self.worker() as worker:
+            return worker.run(expressions)
+
+    def clean_cache(self):
+        # type: (STLePool) -> None
+        # Every worker is borrowed, so that no evaluation is running meanwhile
+        workers = [self.idle.get() for _ in self.workers]
+        try:
+            for worker in workers:
+                if worker.is_alive():
+                    worker.clean_cache()
+        finally:
+            for worker in workers:
+                self.idle.put(worker)
+
+    def read_signal(self, *args):
+        # type: (STLePool, tuple) -> None
+        """
+        Calls read_signal(*args) on every worker (see STLeProcess.read_signal and STLeMonitor.read_signal).
+        """
+        # Every worker is borrowed, so that no evaluation is running meanwhile
+        workers = [self.idle.get() for _ in self.workers]
+        try:
+            for worker in workers:
+                worker.read_signal(*args)
+        finally:
+            for worker in workers:
+                self.idle.put(worker)
+
+    def _eval_slice(self, stl_formulas):
+        # type: (STLePool, list) -> list
+        with self.worker() as worker:
+            try:
+                return worker.eval_stl_formula_batch(stl_formulas)
+            except RuntimeError:
+                # STLe died while evaluating one of the formulas
+                worker.start()
+                if len(stl_formulas) == 1:
+                    RootOracle.logger.warning('Error when evaluating formula {0}.'.format(stl_formulas[0]))
+                    return [False]
+        # Evaluate the formulas one by one for isolating the culprit
+        return list(itertools.chain.from_iterable(self._eval_slice([stl_formula]) for stl_formula in stl_formulas))
+
+    def eval_stl_formula_batch(self, stl_formulas):
+        # type: (STLePool, list) -> list
+        """
+        See OracleSTLe.eval_stl_formula_batch().
+        The batch is split in one slice per worker, and the slices are evaluated concurrently.
+        """
+        size = -(-len(stl_formulas) // self.num_proc)
+        if size == 0 or size == len(stl_formulas):
+            return self._eval_slice(stl_formulas)
+        slices = [stl_formulas[i:i + size] for i in range(0, len(stl_formulas), size)]
+        return list(itertools.chain.from_iterable(self.executor.map(self._eval_slice, slices)))
+
+    def cache_stats(self):
+        # type: (STLePool) -> dict
+        """
+        Statistics of the caches of the workers (see STLeCache.cache_stats).
+        """
+        stats = [worker.cache_stats() for worker in self.workers]
+        calls = sum(stat['calls'] for stat in stats)
+        hits = sum(stat['hits'] for stat in stats)
+        memory = [stat['memory'] for stat in stats]
+        return {'calls': calls,
+                'hits': hits,
+                'hit_rate': float(hits) / max(calls, 1),
+                'cleanings': sum(stat['cleanings'] for stat in stats),
+                'memory': sum(memory) if None not in memory else None,
+                'max_memory': sum(stat['max_memory'] for stat in stats)}
+
+    def terminate(self):
+        # type: (STLePool) -> None
+        self.executor.shutdown(wait=False)
+        for worker in self.workers:
+            worker.terminate()
 
 
 class OracleSTLe(Oracle):
-    def __init__(self, stl_prop_file='', csv_signal_file='', stl_param_file=''):
-        # type: (OracleSTLe, str, str, str) -> None
+    def __init__(self, stl_prop_file='', csv_signal_file='', stl_param_file='', num_proc=1,
+                 max_memory=MAX_STLE_MEMORY):
+        # type: (OracleSTLe, str, str, str, int, int) -> None
         """
         Initialization of OracleSTLe.
         OracleSTLe interacts with the binary executable STLe via PIPEs and string passing.
+        The queries are answered by a pool of num_proc STLe processes (see member_batch and member_async).
+        The cache of STLe is cleaned for keeping the resident memory of the processes below
+        max_memory bytes (see cache_stats).
         """
         Oracle.__init__(self)
 
@@ -49,14 +681,17 @@ class OracleSTLe(Oracle):
         # Load the signal
         self.csv_signal_file = csv_signal_file.strip(' \n\t')
 
-        # Load the pattern for evaluating arithmetic expressions in STLe
-        self.pattern = OracleSTLe._regex_arithm_expr_stl_eval()
+        # Template of the STL formula with slots for the parameters
+        self.stl_template = None
 
-        # Number of calls to the STLe oracle
-        self.num_oracle_calls = 0
+        # Number of STLe processes
+        self.num_proc = num_proc
+
+        # Memory ceiling of the STLe processes (in bytes)
+        self.max_memory = max_memory
 
-        # STLe oracle
-        self.stle_oracle = None
+        # Pool of STLe oracles
+        self.stle_pool = None
 
         # Flag for indicating that Oracle is not initialized yet
         self.initialized = False
@@ -67,55 +702,73 @@ class OracleSTLe(Oracle):
         assert self.stl_param_file != ''
         assert self.csv_signal_file != ''
 
-        # Lazy initialization of the OracleSTLe
-        RootOracle.logger.debug('Initializing OracleSTLe')
+        with _lazy_init_lock:
+            # Another thread may have initialized the OracleSTLe meanwhile
+            if self.initialized:
+                return
 
-        self.stl_formula = OracleSTLe._load_stl_formula(self.stl_prop_file)
-        self.stl_parameters = OracleSTLe._get_parameters_stl(self.stl_param_file)
+            # Lazy initialization of the OracleSTLe
+            RootOracle.logger.debug('Initializing OracleSTLe')
 
-        # Start STLe oracle in interactive mode (i.e., more efficient)
-        args = [STLE_BIN, STLE_INTERACTIVE]
-        RootOracle.logger.debug('Starting: {0}'.format(args))
-        self.stle_oracle = subprocess.Popen(args, stdin=subprocess.PIPE, stdout=subprocess.PIPE, universal_newlines=True, bufsize=0)
-
-        # Loading the signal in memory
-        self._load_signal_in_mem()
+            self.stl_formula = OracleSTLe._load_stl_formula(self.stl_prop_file)
+            self.stl_parameters = OracleSTLe._get_parameters_stl(self.stl_param_file)
+            self.stl_template = STLTemplate(self.stl_formula, self.stl_parameters)
 
-        # Marking the Oracle as initialized
-        self.initialized = True
+            # Start the STLe oracles with the signal loaded in memory
+            new_worker = functools.partial(STLeProcess, self.csv_signal_file,
+                                           max_memory=self.max_memory // self.num_proc)
+            self.stle_pool = STLePool(new_worker, self.num_proc)
 
-    def _load_signal_in_mem(self):
-        # type: (OracleSTLe) -> None
-        # Load the signal in memory
-        # (read-signal-csv "file_name")
-        expression = '({0} "{1}")'.format(STLE_READ_SIGNAL, self.csv_signal_file)
-        RootOracle.logger.debug('Running: {0}'.format(expression))
-        self.stle_oracle.stdin.write(expression)
-        self.stle_oracle.stdin.flush()
-        #
-        ok = self.stle_oracle.stdout.readline()
-        ok = ok.strip(' \n\t')
-        #
-        RootOracle.logger.debug('ok: {0}'.format(ok))
-        if ok != STLE_OK:
-            message = 'Unexpected error when loading {0}: {1}'.format(self.csv_signal_file, ok)
-            RootOracle.logger.error(message)
-            raise RuntimeError(message)
+            # Marking the Oracle as initialized
+            self.initialized = True
 
     def _clean_cache(self):
         # type: (OracleSTLe) -> None
-        assert self.stle_oracle is not None
-        assert not self.stle_oracle.stdin.closed
-        assert not self.stle_oracle.stdout.closed
+        assert self.stle_pool is not None
+        self.stle_pool.clean_cache()
 
-        # Cleaning cache
-        # (clear-monitor)
-        expression = '({0})'.format(STLE_RESET)
-        RootOracle.logger.debug('Running: {0}'.format(expression))
-        self.stle_oracle.stdin.write(expression)
-        self.stle_oracle.stdin.flush()
-        res2 = self.stle_oracle.stdout.readline()
-        RootOracle.logger.debug('result: {0}'.format(res2))
+    def set_signal(self, csv_signal_file):
+        # type: (OracleSTLe, str) -> None
+        """
+        Replaces the signal of the oracle by csv_signal_file.
+        The STL formula, its parameters and the pool of STLe processes are kept,
+        and the STLe processes are restarted with the new signal.
+
+        Args:
+            self (OracleSTLe): The Oracle.
+            csv_signal_file (str): File with the new signal.
+
+        Example:
+        >>> ora = OracleSTLe(stl_prop_file='prop.stl', csv_signal_file='s1.csv', stl_param_file='prop.param')
+        >>> rs1 = SearchND_2(ora, list_intervals)
+        >>> ora.set_signal('s2.csv')
+        >>> rs2 = SearchND_2(ora, list_intervals)
+        """
+        self.csv_signal_file = csv_signal_file.strip(' \n\t')
+        if self.initialized:
+            self.stle_pool.read_signal(self.csv_signal_file)
+
+    def cache_stats(self):
+        # type: (OracleSTLe) -> dict
+        """
+        Statistics of the cache of STLe.
+
+        Args:
+            self (OracleSTLe): The Oracle.
+        Returns:
+            dict: Number of evaluations ('calls'), evaluations of formulas that were already evaluated
+                  since the last cleaning of the cache ('hits' and 'hit_rate'), cleanings of the cache
+                  ('cleanings'), and memory of the STLe workers in bytes ('memory', None if it cannot be
+                  measured, see STLeCache.memory_usage) and its ceiling ('max_memory').
+
+        Example:
+        >>> ora = OracleSTLe(max_memory=2 ** 30)
+        >>> ora.member_batch(points)
+        >>> ora.cache_stats()
+        >>> {'calls': 600, 'hits': 12, 'hit_rate': 0.02, 'cleanings': 0, 'memory': 70160384, 'max_memory': 1073741824}
+        """
+        assert self.stle_pool is not None
+        return self.stle_pool.cache_stats()
 
     def __repr__(self):
         # type: (OracleSTLe) -> str
@@ -170,15 +823,17 @@ class OracleSTLe(Oracle):
         """
         Removes 'self' from the namespace.
         """
-        if self.initialized and self.stle_oracle is not None:
-            self.stle_oracle.terminate()
+        if self.initialized and self.stle_pool is not None:
+            self.stle_pool.terminate()
 
     def __copy__(self):
         # type: (OracleSTLe) -> OracleSTLe
         """
         other = copy.copy(self)
         """
-        return OracleSTLe(stl_prop_file=self.stl_prop_file, csv_signal_file=self.csv_signal_file, stl_param_file=self.stl_param_file)
+        return OracleSTLe(stl_prop_file=self.stl_prop_file, csv_signal_file=self.csv_signal_file,
+                          stl_param_file=self.stl_param_file, num_proc=self.num_proc,
+                          max_memory=self.max_memory)
 
     def __deepcopy__(self, memo):
         # type: (OracleSTLe, dict) -> OracleSTLe
@@ -187,7 +842,9 @@ class OracleSTLe(Oracle):
         """
         # deepcopy function is required for creating multiple instances of the Oracle in ParSearch.
         # deepcopy cannot handle neither regex nor Popen processes
-        return OracleSTLe(stl_prop_file=self.stl_prop_file, csv_signal_file=self.csv_signal_file, stl_param_file=self.stl_param_file)
+        return OracleSTLe(stl_prop_file=self.stl_prop_file, csv_signal_file=self.csv_signal_file,
+                          stl_param_file=self.stl_param_file, num_proc=self.num_proc,
+                          max_memory=self.max_memory)
 
     def __getattr__(self, name):
         # type: (OracleSTLe, str) -> _
@@ -221,19 +878,13 @@ class OracleSTLe(Oracle):
         """
         Version of STLe.
         """
-        assert self.stle_oracle is not None
-        assert not self.stle_oracle.stdin.closed
-        assert not self.stle_oracle.stdout.closed
+        assert self.stle_pool is not None
 
         res1 = '0'
         # Version of STLe formula
         # (version)
         expression = '({0})'.format(STLE_VERSION)
-        RootOracle.logger.debug('Running: {0}'.format(expression))
-        self.stle_oracle.stdin.write(expression)
-        self.stle_oracle.stdin.flush()
-        res1 = self.stle_oracle.stdout.readline()
-        RootOracle.logger.debug('result: {0}'.format(res1))
+        res1 = self.stle_pool.run([expression])[0]
         return res1
 
     def dim(self):
@@ -280,15 +931,6 @@ class OracleSTLe(Oracle):
         finally:
             return formula
 
-    @staticmethod
-    def _regex_arithm_expr_stl_eval():
-        # type: () -> re.Pattern
-        # Regex for detecting an arithmetic expression inside a STL formula
-        number = '([+-]?(\d+(\.\d*)?)|(\.\d+))([eE][-+]?\d+)?'
-        op = '(\*|\/|\+|\-)+'
-        math_regex = r'(\b{0}\b({1}\b{2}\b)*)'.format(number, op, number)
-        return re.compile(math_regex)
-
     def _replace_val_stl_formula(self, xpoint):
         # type: (OracleSTLe, tuple) -> str
 
@@ -302,27 +944,8 @@ class OracleSTLe(Oracle):
         assert self.stl_formula != ''
         assert self.stl_parameters != []
 
-        def eval_expr(match):
-            # type: (re.SRE_Pattern) -> str
-            # Evaluate the arithmetic expression detected by 'match'
-            result = '0'
-            #'{:.15f}'
-            # float_format = '{:.' + str(ParetoLib.Geometry.__numdigits__) + 'f}'
-            try:
-                result = str(eval(match.group(0)))
-                # result = float_format.format(eval(match.group(0)))
-            except SyntaxError:
-                RootOracle.logger.error('Syntax error: {0}'.format(str(match)))
-            finally:
-                return result
-
         RootOracle.logger.debug('Evaluating STL formula')
-        val_formula = self.stl_formula
-        for i, par in enumerate(self.stl_parameters):
-            val_formula = re.sub(r'\b{0}\b'.format(par), str(xpoint[i]), val_formula)
-        val_formula = self.pattern.sub(eval_expr, val_formula)
-
-        return val_formula
+        return self.stl_template.instantiate(xpoint)
 
     def eval_stl_formula(self, stl_formula):
         # type: (OracleSTLe, str) -> bool
@@ -341,23 +964,42 @@ class OracleSTLe(Oracle):
         >>> ora.eval_stl_formula(stl_formula)
         >>> False
         """
-        assert self.stle_oracle is not None
-        assert not self.stle_oracle.stdin.closed
-        assert not self.stle_oracle.stdout.closed
+        assert self.stle_pool is not None
 
         res1 = '0'
         # Evaluating formula
         # (eval formula)
         expression = '({0} {1})'.format(STLE_EVAL, stl_formula)
-        RootOracle.logger.debug('Running: {0}'.format(expression))
-        self.stle_oracle.stdin.write(expression)
-        self.stle_oracle.stdin.flush()
-        res1 = self.stle_oracle.stdout.readline()
-        RootOracle.logger.debug('result: {0}'.format(res1))
+        res1 = self.stle_pool.run([expression])[0]
 
         # Return the result of evaluating the STL formula.
         return OracleSTLe._parse_stle_result(res1)
 
+    def eval_stl_formula_batch(self, stl_formulas):
+        # type: (OracleSTLe, list) -> list
+        """
+        Evaluates a batch of instances of a parametrized STL formula.
+        The batch is split among the STLe processes of the pool, and the
+        evaluations are pipelined: up to MAX_STLE_PIPELINE commands are
+        written to STLe before reading their answers.
+        The cache of each STLe process is cleaned according to its resident memory (see cache_stats).
+
+        Args:
+            self (OracleSTLe): The Oracle.
+            stl_formulas (list): Strings representing the instances of the parametrized STL formula.
+        Returns:
+            list: [self.eval_stl_formula(stl_formula) for stl_formula in stl_formulas],
+                  with False for the formulas that STLe fails to evaluate.
+
+        Example:
+        >>> ora = OracleSTLe()
+        >>> stl_formulas = ['(< (On (0 inf) (- (Max x0) (Min x0))) 0.5)', '(< (On (0 inf) (- (Max x0) (Min x0))) 5)']
+        >>> ora.eval_stl_formula_batch(stl_formulas)
+        >>> [False, True]
+        """
+        assert self.stle_pool is not None
+        return self.stle_pool.eval_stl_formula_batch(stl_formulas)
+
     @staticmethod
     def _parse_stle_result(result):
         # type: (str) -> bool
@@ -384,24 +1026,61 @@ class OracleSTLe(Oracle):
         See Oracle.member().
         """
         RootOracle.logger.debug('Running membership function')
-        # Cleaning the cache of STLe after MAX_ORACLE_CALLS (i.e., 'gargage collector')
-        if self.num_oracle_calls > MAX_STLE_CALLS:
-            self.num_oracle_calls = 0
-            self._clean_cache()
-
         # Replace parameters of the STL formula with current values in xpoint tuple
         val_stl_formula = self._replace_val_stl_formula(xpoint)
 
-        # Invoke STLe for solving the STL formula for the current values for the parameters
+        # Invoke STLe for solving the STL formula for the current values for the parameters.
+        # The cache of STLe is cleaned according to its resident memory (i.e., 'gargage collector')
         result = False
         try:
-            self.num_oracle_calls = self.num_oracle_calls + 1
-            result = self.eval_stl_formula(val_stl_formula)
+            result = self.eval_stl_formula_batch([val_stl_formula])[0]
         except RuntimeError:
             RootOracle.logger.warning('Error when evaluating formula {0}.'.format(val_stl_formula))
         finally:
             return result
 
+    def member_batch(self, points):
+        # type: (OracleSTLe, list) -> list
+        """
+        See Oracle.member_batch().
+        """
+        RootOracle.logger.debug('Running batched membership function')
+        val_stl_formulas = [self._replace_val_stl_formula(xpoint) for xpoint in points]
+        return self.eval_stl_formula_batch(val_stl_formulas)
+
+    def has_member_batch(self):
+        # type: (OracleSTLe) -> bool
+        """
+        See Oracle.has_member_batch().
+        Batches are only worth when they are split among several STLe processes.
+        Otherwise, ParSearch runs the queries in parallel with a copy of the OracleSTLe per worker.
+        """
+        return self.num_proc > 1
+
+    def member_async(self, xpoint):
+        # type: (OracleSTLe, tuple) -> Future
+        """
+        Non-blocking version of member(xpoint).
+        The query is answered by the first idle STLe process of the pool.
+
+        Args:
+            self (OracleSTLe): The Oracle.
+            xpoint (tuple): The point of the space that we inspect.
+
+        Returns:
+            Future: Future result of member(xpoint). Use asyncio.wrap_future()
+                    for awaiting it from a coroutine.
+
+        Example:
+        >>> ora = OracleSTLe(num_proc=4)
+        >>> futures = [ora.member_async(p) for p in points]
+        >>> [f.result() for f in futures]
+        >>> [True, False, ...]
+        >>> await asyncio.wrap_future(ora.member_async(p))
+        >>> True
+        """
+        return self.stle_pool.executor.submit(self.member, xpoint)
+
     # Read/Write file functions
     def from_file_binary(self, finput=None):
         # type: (OracleSTLe, io.BinaryIO) -> None
@@ -426,7 +1105,8 @@ class OracleSTLe(Oracle):
                 if not os.path.isfile(fname):
                     RootOracle.logger.info('File {0} does not exists or it is not a file'.format(fname))
 
-            self.__init__(stl_prop_file=stl_prop_file, stl_param_file=stl_param_file, csv_signal_file=csv_signal_file)
+            self.__init__(stl_prop_file=stl_prop_file, stl_param_file=stl_param_file, csv_signal_file=csv_signal_file,
+                          num_proc=self.num_proc, max_memory=self.max_memory)
 
         except EOFError:
             RootOracle.logger.error('Unexpected error when loading {0}: {1}'.format(finput, sys.exc_info()[0]))
@@ -464,7 +1144,8 @@ class OracleSTLe(Oracle):
                 if not os.path.isfile(fname):
                     RootOracle.logger.info('File {0} does not exists or it is not a file'.format(fname))
 
-            self.__init__(stl_prop_file=stl_prop_file, stl_param_file=stl_param_file, csv_signal_file=csv_signal_file)
+            self.__init__(stl_prop_file=stl_prop_file, stl_param_file=stl_param_file, csv_signal_file=csv_signal_file,
+                          num_proc=self.num_proc, max_memory=self.max_memory)
 
         except EOFError:
             RootOracle.logger.error('Unexpected error when loading {0}: {1}'.format(finput, sys.exc_info()[0]))
@@ -493,12 +1174,17 @@ class OracleSTLe(Oracle):
 
 
 class OracleSTLeLib(OracleSTLe):
-    def __init__(self, stl_prop_file='', csv_signal_file='', stl_param_file=''):
-        # type: (OracleSTLeLib, str, str, str) -> None
+    def __init__(self, stl_prop_file='', csv_signal_file='', stl_param_file='', num_proc=1,
+                 max_memory=MAX_STLE_MEMORY):
+        # type: (OracleSTLeLib, str, str, str, int, int) -> None
         """
         Initialization of OracleSTLeLib.
         OracleSTLeLib interacts directly with the C library of STLe via the C API that STLe exports.
-        OracleSTLeLib should be usually faster than OracleSTLe
+        OracleSTLeLib should be usually faster than OracleSTLe.
+        The signal is loaded once, and shared by num_proc monitors that evaluate formulas
+        concurrently in a pool of threads (see member_batch and member_async).
+        The monitors are recycled for keeping the memory that the oracle allocates in the current
+        process below max_memory bytes (see cache_stats).
         """
 
         Oracle.__init__(self)
@@ -514,23 +1200,27 @@ class OracleSTLeLib(OracleSTLe):
         # Load the signal
         self.csv_signal_file = csv_signal_file.strip(' \n\t')
 
-        # Load the pattern for evaluating arithmetic expressions in STLe
-        self.pattern = super(OracleSTLeLib, self)._regex_arithm_expr_stl_eval()
+        # Template of the STL formula with slots for the parameters
+        self.stl_template = None
 
-        # Number of calls to the STLe oracle
-        self.num_oracle_calls = 0
+        # Number of monitors
+        self.num_proc = num_proc
+
+        # Memory ceiling of the signal and monitors (in bytes)
+        self.max_memory = max_memory
 
         # Load interface with STLeLib (C)
         # STLeLibInterface()
         self.stle = None
 
-        # signalvars are the parameters of STLe formula in C API format
+        # signalvars are the parameters of STLe formula in C API format.
+        # The signal is shared by the oracles with the same signal (see SignalCache)
         self.signalvars = None
         self.signal = None
+        self.signal_key = None
 
-        # exprset is a set of STLe formulas in C API format
-        self.exprset = None
-        self.monitor = None
+        # Pool of monitors (i.e., exprset and monitor in C API format) over the signal
+        self.stle_pool = None
 
         # Flag for indicating that Oracle is not initialized yet
         self.initialized = False
@@ -541,79 +1231,90 @@ class OracleSTLeLib(OracleSTLe):
         assert self.stl_param_file != ''
         assert self.csv_signal_file != ''
 
-        # Lazy initialization of the OracleSTLeLib
-        RootOracle.logger.debug('Initializing OracleSTLeLib')
+        with _lazy_init_lock:
+            # Another thread may have initialized the OracleSTLeLib meanwhile
+            if self.initialized:
+                return
 
-        self.stl_formula = super(OracleSTLeLib, self)._load_stl_formula(self.stl_prop_file)
-        self.stl_parameters = super(OracleSTLeLib, self)._get_parameters_stl(self.stl_param_file)
-        self.stle = STLeLibInterface()
+            # Lazy initialization of the OracleSTLeLib
+            RootOracle.logger.debug('Initializing OracleSTLeLib')
 
-        RootOracle.logger.debug('Starting: {0}'.format(self.csv_signal_file))
+            self.stl_formula = super(OracleSTLeLib, self)._load_stl_formula(self.stl_prop_file)
+            self.stl_parameters = super(OracleSTLeLib, self)._get_parameters_stl(self.stl_param_file)
+            self.stl_template = STLTemplate(self.stl_formula, self.stl_parameters)
+            self.stle = STLeLibInterface()
 
-        # Loading the signal in memory
-        self._load_signal_in_mem()
+            RootOracle.logger.debug('Starting: {0}'.format(self.csv_signal_file))
 
-        # Creating signal monitor and expression set
-        self._create_monitor_exprset()
+            # Loading the signal in memory
+            self._load_signal_in_mem()
 
-        # Marking the Oracle as initialized
-        self.initialized = True
+            # Creating signal monitors and expression sets
+            new_worker = functools.partial(STLeMonitor, self.stle, self.signal, self.signalvars,
+                                           max_memory=self.max_memory // self.num_proc)
+            self.stle_pool = STLePool(new_worker, self.num_proc)
+
+            # Marking the Oracle as initialized
+            self.initialized = True
 
     def _load_signal_in_mem(self):
         # type: (OracleSTLeLib) -> None
         assert self.stle is not None
-        
-        # Load the signal in memory
+
+        # Load the signal in memory, or reuse the one loaded by another oracle
+        self.signal_key = SignalCache.signal_key(self.csv_signal_file)
+        self.signal, self.signalvars = signal_cache.acquire(self.signal_key, self._read_signal)
+
+    def _read_signal(self):
+        # type: (OracleSTLeLib) -> tuple
         RootOracle.logger.debug('Loading signal "{0}" into memory'.format(self.csv_signal_file))
-        self.signal = self.stle.stl_read_pcsignal_csv_fname(self.csv_signal_file)
+        signal = self.stle.stl_read_pcsignal_csv_fname(self.csv_signal_file)
 
-        if self.signal is None:
+        if signal is None:
             message = 'Unexpected error when loading {0}'.format(self.csv_signal_file)
             RootOracle.logger.error(message)
             raise RuntimeError(message)
 
-        n = self.stle.stl_pcsignal_size(self.signal)
-        self.signalvars = self.stle.stl_make_signalvars_xn(n)
-        RootOracle.logger.debug('Signalvars created: {0}'.format(self.signalvars))
-
-    def _clean_cache(self):
-        # type: (OracleSTLeLib) -> None
-        assert self.stle is not None
-        assert self.signalvars is not None
-        
-        # Remove signal monitor and expression set
-        self._remove_monitor_exprset()
-
-        # Create a new signal monitor and expression set
-        self._create_monitor_exprset()
-
-    def _remove_monitor_exprset(self):
-        # type: (OracleSTLeLib) -> None
-        assert self.stle is not None
-        assert self.signalvars is not None
-
-        RootOracle.logger.debug('Cleaning cache of exprsets')
+        n = self.stle.stl_pcsignal_size(signal)
+        signalvars = self.stle.stl_make_signalvars_xn(n)
+        RootOracle.logger.debug('Signalvars created: {0}'.format(signalvars))
+        return signal, signalvars
 
-        # Remove exprset
-        if self.exprset is not None:
-            self.stle.stl_delete_exprset(self.exprset)
+    def _delete_signal(self, signal_signalvars):
+        # type: (OracleSTLeLib, tuple) -> None
+        signal, signalvars = signal_signalvars
+        self.stle.stl_delete_pcsignal(signal)
+        self.stle.stl_delete_signalvars(signalvars)
 
-        # Remove monitor
-        if self.monitor is not None:
-            self.stle.stl_delete_offlinepcmonitor(self.monitor)
-
-    def _create_monitor_exprset(self):
+    def _clean_cache(self):
         # type: (OracleSTLeLib) -> None
-        assert self.stle is not None
-        assert self.signalvars is not None
+        assert self.stle_pool is not None
+        self.stle_pool.clean_cache()
 
-        # Create a new exprset
-        self.exprset = self.stle.stl_make_exprset()
-        RootOracle.logger.debug('Exprset created: {0}'.format(self.exprset))
+    def set_signal(self, csv_signal_file):
+        # type: (OracleSTLeLib, str) -> None
+        """
+        See OracleSTLe.set_signal().
+        The new signal is loaded (or reused, see SignalCache) before the old one is released.
+        """
+        csv_signal_file = csv_signal_file.strip(' \n\t')
+        if not self.initialized:
+            self.csv_signal_file = csv_signal_file
+            return
+
+        old_csv_signal_file, old_signal_key = self.csv_signal_file, self.signal_key
+        old_signal, old_signalvars = self.signal, self.signalvars
+        self.csv_signal_file = csv_signal_file
+        try:
+            self._load_signal_in_mem()
+        except RuntimeError:
+            self.csv_signal_file, self.signal_key = old_csv_signal_file, old_signal_key
+            raise
 
-        # Create a monitor for analyzing the signal
-        self.monitor = self.stle.stl_make_offlinepcmonitor(self.signal, self.signalvars, self.exprset)
-        RootOracle.logger.debug('Monitor created: {0}'.format(self.monitor))
+        # Monitors are moved to the new signal before the old one is released
+        self.stle_pool.read_signal(self.signal, self.signalvars)
+        if old_signal is not None:
+            signal_cache.release(old_signal_key, self._delete_signal)
 
     def _to_str(self):
         # type: (OracleSTLeLib) -> str
@@ -639,7 +1340,8 @@ class OracleSTLeLib(OracleSTLe):
         other = copy.copy(self)
         """
         return OracleSTLeLib(stl_prop_file=self.stl_prop_file, csv_signal_file=self.csv_signal_file,
-                             stl_param_file=self.stl_param_file)
+                             stl_param_file=self.stl_param_file, num_proc=self.num_proc,
+                             max_memory=self.max_memory)
 
     def __deepcopy__(self, memo):
         # type: (OracleSTLeLib) -> OracleSTLeLib
@@ -649,7 +1351,8 @@ class OracleSTLeLib(OracleSTLe):
         # deepcopy function is required for creating multiple instances of the Oracle in ParSearch.
         # deepcopy cannot handle neither regex nor Popen processes
         return OracleSTLeLib(stl_prop_file=self.stl_prop_file, csv_signal_file=self.csv_signal_file,
-                             stl_param_file=self.stl_param_file)
+                             stl_param_file=self.stl_param_file, num_proc=self.num_proc,
+                             max_memory=self.max_memory)
 
     def __getattr__(self, name):
         # type: (OracleSTLeLib, str) -> _
@@ -673,14 +1376,11 @@ class OracleSTLeLib(OracleSTLe):
         Removes 'self' from the namespace.
         """
         if self.initialized and self.stle is not None:
+            # Monitors are removed before the signal
+            if self.stle_pool is not None:
+                self.stle_pool.terminate()
             if self.signal is not None:
-                self.stle.stl_delete_pcsignal(self.signal)
-            if self.signalvars is not None:
-                self.stle.stl_delete_signalvars(self.signalvars)
-            if self.exprset is not None:
-                self.stle.stl_delete_exprset(self.exprset)
-            if self.monitor is not None:
-                self.stle.stl_delete_offlinepcmonitor(self.monitor)
+                signal_cache.release(self.signal_key, self._delete_signal)
 
     @staticmethod
     def _parse_stle_result(result):
@@ -711,29 +1411,15 @@ class OracleSTLeLib(OracleSTLe):
         >>> ora.eval_stl_formula(stl_formula)
         >>> False
         """
-        assert self.stle is not None
-        assert self.monitor is not None
-        assert self.signal is not None
-        assert self.signalvars is not None
-        assert self.exprset is not None
+        assert self.stle_pool is not None
 
-        RootOracle.logger.debug('Evaluating: {0}'.format(stl_formula))
-
-        # Add STLe formula to the expression set
-        expr = self.stle.stl_parse_sexpr_str(self.exprset, stl_formula)
-
-        RootOracle.logger.debug('STLe formula parsed: {0}'.format(expr))
-
-        # Evaluating formula
-        stl_series = self.stle.stl_offlinepcmonitor_make_output(self.monitor, expr)
-        RootOracle.logger.debug('STLe series: {0}'.format(stl_series))
-
-        res = self.stle.stl_pcseries_value0(stl_series)
-        RootOracle.logger.debug('Result: {0}'.format(res))
-
-        # Remove STLe formula from the expression set
-        self.stle.stl_unref_expr(expr)
-
-        # Return the result of evaluating the STL formula.
-        return OracleSTLeLib._parse_stle_result(res)
+        with self.stle_pool.worker() as monitor:
+            return monitor.eval_stl_formula(stl_formula)
 
+    def has_member_batch(self):
+        # type: (OracleSTLeLib) -> bool
+        """
+        See Oracle.has_member_batch().
+        Batches are only worth when they are split among several monitors.
+        """
+        return self.num_proc > 1
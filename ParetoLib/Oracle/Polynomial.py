@@ -0,0 +1,351 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 J.I. Requeno et al
+#
+# This file is part of the ParetoLib software tool and governed by the
+# 'GNU License v3'. Please see the LICENSE file that should have been
+# included as part of this software.
+"""Polynomial.
+
+This module implements a lightweight representation of the polynomial
+expressions that appear in the Conditions of an OracleFunction.
+A Polynomial is stored as a NumPy array with the exponents of the
+variables in each monomial, and a NumPy array with the coefficients
+of the monomials.
+
+Polynomials are parsed with the Python module 'ast' from the same
+syntax accepted by SymPy (e.g., 'x**2 + 2*y - 1/3', or 'x^2' as a
+synonym of 'x**2'), so they do not require importing SymPy.
+Expressions that are not polynomials (e.g., '1/x' or 'sin(x)'), as
+well as names that SymPy reads as constants (e.g., 'E' or 'I'),
+raise a ValueError.
+"""
+
+import ast
+import re
+import sys
+import numbers
+
+import numpy as np
+
+# Names of variables accepted by the parser: a letter, optionally followed by digits (e.g., 'x', 'x1', 'p_2').
+# SymPy reads the following names as constants or functions instead of variables.
+_VARIABLE = re.compile(r'^[A-Za-z](_?\d+)?$')
+_RESERVED = frozenset(['E', 'E1', 'I', 'N', 'O', 'Q', 'S'])
+
+# Highest exponent of a variable accepted by the parser
+MAX_DEGREE = 64
+
+# Numbers are parsed as ast.Num before Python 3.8, and as ast.Constant since then
+if sys.version_info >= (3, 8):
+    _NUMBER = ast.Constant
+
+    def _number_value(node):
+        # type: (ast.Constant) -> object
+        return node.value
+else:
+    _NUMBER = ast.Num
+
+    def _number_value(node):
+        # type: (ast.Num) -> object
+        return node.n
+
+
+def _constant(terms):
+    # type: (dict) -> float
+    """
+    Value of a constant polynomial, or None if the polynomial depends on some variable.
+    """
+    if any(len(monomial) > 0 for monomial in terms):
+        return None
+    return terms.get((), 0.0)
+
+
+def _add(terms1, terms2, sign=1.0):
+    # type: (dict, dict, float) -> dict
+    terms = dict(terms1)
+    for monomial, coeff in terms2.items():
+        terms[monomial] = terms.get(monomial, 0.0) + sign * coeff
+    return terms
+
+
+def _mul(terms1, terms2):
+    # type: (dict, dict) -> dict
+    terms = {}
+    for monomial1, coeff1 in terms1.items():
+        for monomial2, coeff2 in terms2.items():
+            exps = dict(monomial1)
+            for var, k in monomial2:
+                exps[var] = exps.get(var, 0) + k
+            monomial = tuple(sorted(exps.items()))
+            terms[monomial] = terms.get(monomial, 0.0) + coeff1 * coeff2
+    return terms
+
+
+def _parse_node(node):
+    # type: (ast.AST) -> dict
+    """
+    Polynomial of an ast node as a dictionary {((variable, exponent),...): coefficient}.
+    """
+    if isinstance(node, ast.Expression):
+        return _parse_node(node.body)
+    elif isinstance(node, _NUMBER) and isinstance(_number_value(node), numbers.Real) and \
+            not isinstance(_number_value(node), bool):
+        return {(): float(_number_value(node))}
+    elif isinstance(node, ast.Name) and _VARIABLE.match(node.id) and node.id not in _RESERVED:
+        return {((node.id, 1),): 1.0}
+    elif isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+        terms = _parse_node(node.operand)
+        return terms if isinstance(node.op, ast.UAdd) else _add({}, terms, -1.0)
+    elif isinstance(node, ast.BinOp):
+        left = _parse_node(node.left)
+        right = _parse_node(node.right)
+        if isinstance(node.op, ast.Add):
+            return _add(left, right)
+        elif isinstance(node.op, ast.Sub):
+            return _add(left, right, -1.0)
+        elif isinstance(node.op, ast.Mult):
+            return _mul(left, right)
+        elif isinstance(node.op, ast.Div):
+            divisor = _constant(right)
+            if divisor is None or divisor == 0.0:
+                raise ValueError('Division by zero or by a non-constant expression')
+            return {monomial: coeff / divisor for monomial, coeff in left.items()}
+        elif isinstance(node.op, ast.Pow):
+            k = _constant(right)
+            base = _constant(left)
+            if k is None:
+                raise ValueError('Non-constant exponent')
+            elif base is not None:
+                val = base ** k
+                if not isinstance(val, float) or not np.isfinite(val):
+                    raise ValueError('Power is not a real number')
+                return {(): val}
+            elif k < 0 or k > MAX_DEGREE or k != int(k):
+                raise ValueError('Exponent is not a natural number')
+            terms = {(): 1.0}
+            for _ in range(int(k)):
+                terms = _mul(terms, left)
+            return terms
+    raise ValueError('Unsupported expression: {0}'.format(ast.dump(node)))
+
+
+def _format_coeff(coeff):
+    # type: (float) -> str
+    # Shortest representation of the float that is read back without loss of precision
+    return str(int(coeff)) if coeff.is_integer() and abs(coeff) < 1e15 else repr(coeff)
+
+
+class Polynomial:
+    def __init__(self, variables=(), exps=None, coeffs=None):
+        # type: (Polynomial, iter, np.ndarray, np.ndarray) -> None
+        """
+        A Polynomial is a sum of monomials c_i * x_1^k_i1 * ... * x_n^k_in.
+
+        Args:
+            self (Polynomial): The Polynomial.
+            variables (iter): Names of the variables x_1,..., x_n.
+            exps (np.ndarray): Array of shape (m, n) with the exponents k_ij.
+            coeffs (np.ndarray): Array of length m with the coefficients c_i.
+
+        Returns:
+            None: Polynomial with the monomials merged, the null monomials
+                  removed, and the variables restricted to the ones that appear
+                  in some monomial (in lexicographic order).
+
+        Example:
+        >>> poly = Polynomial(('x', 'y'), np.array([[2, 0], [0, 1]]), np.array([1.0, -4.0]))
+        >>> str(poly)
+        >>> 'x**2 - 4*y'
+        """
+        variables = list(variables)
+        exps = np.zeros((0, len(variables)), dtype=int) if exps is None else np.asarray(exps, dtype=int)
+        coeffs = np.zeros(0) if coeffs is None else np.asarray(coeffs, dtype=float)
+        terms = {}
+        for e, c in zip(exps.tolist(), coeffs.tolist()):
+            monomial = tuple(sorted((var, k) for var, k in zip(variables, e) if k != 0))
+            terms[monomial] = terms.get(monomial, 0.0) + c
+        self._from_terms(terms)
+
+    def _from_terms(self, terms):
+        # type: (Polynomial, dict) -> None
+        terms = {monomial: coeff for monomial, coeff in terms.items() if coeff != 0.0}
+        self.variables = tuple(sorted(set(var for monomial in terms for var, _ in monomial)))
+        index = {var: i for i, var in enumerate(self.variables)}
+        exps = np.zeros((len(terms), len(self.variables)), dtype=int)
+        # Monomials sorted by decreasing degree, and lexicographically for the same degree
+        monomials = sorted(terms, key=lambda m: (-sum(k for _, k in m), [(var, -k) for var, k in m]))
+        for i, monomial in enumerate(monomials):
+            for var, k in monomial:
+                exps[i, index[var]] = k
+        self.exps = exps
+        self.coeffs = np.array([terms[monomial] for monomial in monomials], dtype=float)
+
+    def _to_terms(self):
+        # type: (Polynomial) -> dict
+        return {tuple((var, k) for var, k in zip(self.variables, e) if k != 0): c
+                for e, c in zip(self.exps.tolist(), self.coeffs.tolist())}
+
+    def __repr__(self):
+        # type: (Polynomial) -> str
+        """
+        Printer.
+        """
+        return self._to_str()
+
+    def __str__(self):
+        # type: (Polynomial) -> str
+        """
+        Printer.
+        """
+        return self._to_str()
+
+    def _to_str(self):
+        # type: (Polynomial) -> str
+        """
+        Printer. The output is accepted by parse_polynomial and by SymPy.
+        """
+        s = ''
+        for e, c in zip(self.exps.tolist(), self.coeffs.tolist()):
+            factors = [var if k == 1 else '{0}**{1}'.format(var, k) for var, k in zip(self.variables, e) if k > 0]
+            if abs(c) != 1.0 or len(factors) == 0:
+                factors.insert(0, _format_coeff(abs(c)))
+            sign = '-' if c < 0 else '+'
+            monomial = '*'.join(factors)
+            s = (sign + monomial if sign == '-' else monomial) if s == '' else '{0} {1} {2}'.format(s, sign, monomial)
+        return s if s != '' else '0'
+
+    def __eq__(self, other):
+        # type: (Polynomial, Polynomial) -> bool
+        """
+        self == other
+        """
+        return (self.variables == other.variables) and \
+               np.array_equal(self.exps, other.exps) and \
+               np.array_equal(self.coeffs, other.coeffs)
+
+    def __ne__(self, other):
+        # type: (Polynomial, Polynomial) -> bool
+        """
+        self != other
+        """
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        # type: (Polynomial) -> int
+        """
+        Identity function (via hashing).
+        """
+        return hash((self.variables, self.exps.tobytes(), self.coeffs.tobytes()))
+
+    def __sub__(self, other):
+        # type: (Polynomial, Polynomial) -> Polynomial
+        """
+        self - other
+        """
+        poly = Polynomial()
+        poly._from_terms(_add(self._to_terms(), other._to_terms(), -1.0))
+        return poly
+
+    def get_var_names(self):
+        # type: (Polynomial) -> list
+        """
+        Returns the names of the variables of the Polynomial in lexicographic order.
+        """
+        return list(self.variables)
+
+    def degree(self):
+        # type: (Polynomial) -> int
+        """
+        Returns the total degree of the Polynomial (0 for constant polynomials).
+        """
+        return int(np.max(np.sum(self.exps, axis=1), initial=0))
+
+    def get_polynomial(self, variables=None):
+        # type: (Polynomial, list) -> (np.ndarray, np.ndarray)
+        """
+        Returns the exponents and the coefficients of the monomials, with the columns
+        of the exponents following the order of variables.
+
+        Args:
+            self (Polynomial): The Polynomial.
+            variables (list): Names of the variables. It must contain the variables
+                              of the Polynomial. By default, self.variables.
+
+        Returns:
+            (np.ndarray, np.ndarray): Exponents of the variables in each monomial
+                                      (array of shape (m, len(variables))) and
+                                      coefficients of the monomials.
+        """
+        variables = self.variables if variables is None else [str(var) for var in variables]
+        assert set(variables).issuperset(self.variables), \
+            'Variables {0} do not contain {1}'.format(variables, self.variables)
+        exps = np.zeros((len(self.coeffs), len(variables)), dtype=int)
+        for i, var in enumerate(self.variables):
+            exps[:, variables.index(var)] = self.exps[:, i]
+        return exps, self.coeffs.copy()
+
+    def compile(self, variables=None):
+        # type: (Polynomial, list) -> callable
+        """
+        Returns a numerical function that evaluates the Polynomial.
+
+        Args:
+            self (Polynomial): The Polynomial.
+            variables (list): The names of the arguments of the function.
+                              By default, self.variables.
+
+        Returns:
+            callable: Function that receives a value (or a NumPy array
+                      of values) per variable.
+
+        Example:
+        >>> poly = parse_polynomial('2*x - 4*y')
+        >>> f = poly.compile()
+        >>> f(4, 2)
+        >>> 0.0
+        """
+        exps, coeffs = self.get_polynomial(variables)
+        args = ['_{0}'.format(i) for i in range(exps.shape[1])]
+        body = ''
+        for e, c in zip(exps.tolist(), coeffs.tolist()):
+            factors = [arg if k == 1 else '{0}**{1}'.format(arg, k) for arg, k in zip(args, e) if k > 0]
+            if abs(c) != 1.0 or len(factors) == 0:
+                factors.insert(0, repr(abs(c)))
+            body += ' {0} {1}'.format('-' if c < 0 else '+', '*'.join(factors))
+        # The leading 0.0 gives a float for integer arguments
+        body = '0.0' + body
+        source = 'lambda {0}: {1}'.format(', '.join(args), body)
+        return eval(compile(source, '<Polynomial>', 'eval'), {'__builtins__': {}})
+
+
+def parse_polynomial(expression):
+    # type: (str) -> Polynomial
+    """
+    Parses a polynomial expression.
+
+    Args:
+        expression (str): Polynomial expression (e.g., 'x**2 + 2*y - 1/3').
+
+    Returns:
+        Polynomial: The Polynomial.
+
+    Raises:
+        ValueError: If the expression is not a polynomial, or it contains
+                    syntax that is not supported without SymPy.
+
+    Example:
+    >>> poly = parse_polynomial('x**2 + y**2 - 0.5**2')
+    >>> poly.get_var_names()
+    >>> ['x', 'y']
+    """
+    # As in SymPy, '^' is a synonym of '**' (with the same precedence)
+    expression = expression.strip().replace('^', '**')
+    try:
+        tree = ast.parse(expression, mode='eval')
+        terms = _parse_node(tree)
+    except (SyntaxError, ArithmeticError, RuntimeError) as e:
+        # RecursionError (Python 3.5+) is a RuntimeError
+        raise ValueError('Cannot parse "{0}": {1}'.format(expression, e))
+    poly = Polynomial()
+    poly._from_terms(terms)
+    return poly
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 J.I. Requeno et al
+#
+# This file is part of the ParetoLib software tool and governed by the
+# 'GNU License v3'. Please see the LICENSE file that should have been
+# included as part of this software.
+"""STLTemplate.
+
+This module implements the instantiation of parametrized STL formulas
+used by OracleSTL and OracleSTLe.
+
+A parametrized STL formula is instantiated for a point by replacing
+every parameter with its value, and then evaluating the arithmetic
+expressions of the result (e.g., '(0 300-p2)' becomes '(0 299.5)' for
+p2 = 0.5). The STLTemplate parses the formula once into a format string
+with one slot per parameter. The arithmetic expressions that do not
+depend on the parameters are evaluated once, so that instantiating the
+template for a point usually reduces to a single call to str.format.
+"""
+
+import re
+
+import ParetoLib.Oracle as RootOracle
+
+# Regex for detecting an arithmetic expression inside a STL formula
+_NUMBER = r'([+-]?(\d+(\.\d*)?)|(\.\d+))([eE][-+]?\d+)?'
+_OPERATOR = r'(\*|\/|\+|\-)+'
+ARITHM_EXPR = re.compile(r'(\b{0}\b({1}\b{2}\b)*)'.format(_NUMBER, _OPERATOR, _NUMBER))
+
+# Characters that may be part of an arithmetic expression.
+# An arithmetic expression never starts nor ends at any other character.
+_ARITHM_CHARS = frozenset('0123456789.eE+-*/')
+
+
+def eval_arithm_expr(match):
+    # type: (re.Match) -> str
+    """
+    Evaluates the arithmetic expression detected by 'match'.
+    Invalid expressions (e.g., '05' or '1/0') are evaluated to '0'.
+    """
+    result = '0'
+    try:
+        result = str(eval(match.group(0)))
+    except SyntaxError:
+        RootOracle.logger.error('Syntax error: {0}'.format(str(match)))
+    except Exception:
+        RootOracle.logger.error('Error when evaluating: {0}'.format(str(match)))
+    return result
+
+
+def fold_arithm_expr(text):
+    # type: (str) -> str
+    """
+    Replaces every arithmetic expression in text by its value.
+
+    Example:
+    >>> fold_arithm_expr('(F (0 300-0.5) (< x0 1/4))')
+    >>> '(F (0 299.5) (< x0 0.25))'
+    """
+    return ARITHM_EXPR.sub(eval_arithm_expr, text)
+
+
+class STLTemplate(object):
+    def __init__(self, stl_formula, stl_parameters):
+        # type: (STLTemplate, str, list) -> None
+        """
+        Template of the parametrized STL formula stl_formula, with
+        parameters stl_parameters.
+
+        Args:
+            self (STLTemplate): The STLTemplate.
+            stl_formula (str): The parametrized STL formula.
+            stl_parameters (list): Names of the parameters.
+
+        Example:
+        >>> tmp = STLTemplate('(F (0 p1) (< (On (0 300-p2) x0) 2*3))', ['p1', 'p2'])
+        >>> tmp.instantiate((10.0, 0.5))
+        >>> '(F (0 10.0) (< (On (0 299.5) x0) 6))'
+        """
+        self.stl_formula = stl_formula
+        self.stl_parameters = list(stl_parameters)
+
+        # Format string of the instance, and arithmetic expressions that are evaluated for each point
+        self._format = ''
+        self._runs = []
+        self._compile()
+
+    def _compile(self):
+        # type: (STLTemplate) -> None
+        # Sequence of characters and parameter slots (indices) of the formula
+        items = []
+        if len(self.stl_parameters) > 0:
+            index = {}
+            for i, par in enumerate(self.stl_parameters):
+                index.setdefault(par, i)
+            names = '|'.join(re.escape(par) for par in index)
+            tokens = re.split(r'\b({0})\b'.format(names), self.stl_formula)
+            for j, token in enumerate(tokens):
+                if j % 2 == 0:
+                    items.extend(token)
+                else:
+                    items.append(index[token])
+        else:
+            items.extend(self.stl_formula)
+
+        # Runs of characters that may be part of an arithmetic expression and contain some parameter
+        fmt = []
+        static = []
+        start = 0
+        while start <= len(items):
+            end = start
+            while end < len(items) and (isinstance(items[end], int) or items[end] in _ARITHM_CHARS):
+                end += 1
+            run = items[start:end]
+            if any(isinstance(item, int) for item in run):
+                fmt.append(self._compile_static(static))
+                static = []
+                if len(run) == 1:
+                    # The value of a parameter is already a number
+                    fmt.append('{{{0}}}'.format(run[0]))
+                else:
+                    # The characters before and after the run decide where an arithmetic expression begins
+                    left = items[start - 1] if start > 0 else ''
+                    right = items[end] if end < len(items) else ''
+                    fmt.append('{{r{0}}}'.format(len(self._runs)))
+                    self._runs.append((left, run, right))
+            else:
+                static.extend(run)
+            if end < len(items):
+                static.append(items[end])
+            start = end + 1
+        fmt.append(self._compile_static(static))
+        self._format = ''.join(fmt)
+
+    @staticmethod
+    def _compile_static(chars):
+        # type: (list) -> str
+        # Text without parameters is evaluated once
+        text = fold_arithm_expr(''.join(chars))
+        return text.replace('{', '{{').replace('}', '}}')
+
+    @staticmethod
+    def _fold_run(left, run, right, values):
+        # type: (str, list, str, list) -> str
+        text = left + ''.join(values[item] if isinstance(item, int) else item for item in run) + right
+        text = fold_arithm_expr(text)
+        return text[len(left):len(text) - len(right)]
+
+    def instantiate(self, xpoint):
+        # type: (STLTemplate, tuple) -> str
+        """
+        Replaces the parameters of the STL formula by the numerical values in tuple xpoint,
+        and evaluates the arithmetic expressions of the result.
+        The number of parameters should be less or equal than the number of coordinates in the tuple.
+
+        Args:
+            self (STLTemplate): The STLTemplate.
+            xpoint (tuple): The values of the parameters.
+
+        Returns:
+            str: Instance of the STL formula.
+        """
+        values = [str(v) for v in xpoint]
+        if len(self._runs) == 0:
+            return self._format.format(*values)
+        runs = {'r{0}'.format(k): self._fold_run(left, run, right, values)
+                for k, (left, run, right) in enumerate(self._runs)}
+        return self._format.format(*values, **runs)
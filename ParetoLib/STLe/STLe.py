@@ -124,8 +124,21 @@ STLE_READ_SIGNAL = 'read-signal-csv'
 STLE_EVAL = 'eval'
 STLE_RESET = 'clear-monitor'
 STLE_OK = 'ok'
+STLE_ERROR = 'error'
 STLE_VERSION = 'version'
+# Number of evaluations between two cleanings of the cache of STLe,
+# when the resident memory of STLe cannot be measured (see OracleSTLe).
 MAX_STLE_CALLS = 50
+# Otherwise, the cache of STLe (i.e., memoized sub-formulas) is cleaned when
+# its resident memory exceeds MAX_STLE_MEMORY bytes per oracle, or when it
+# exceeds half of it and less than MIN_STLE_HIT_RATE evaluations are repeated.
+# The resident memory is measured every STLE_MEMORY_CHECK evaluations.
+MAX_STLE_MEMORY = 512 * 2 ** 20
+MIN_STLE_HIT_RATE = 0.05
+STLE_MEMORY_CHECK = 64
+# Maximum number of commands written to STLe before reading their answers.
+# The answers of a pipelined batch must fit in the buffer of the pipe.
+MAX_STLE_PIPELINE = 256
 
 # -------------------------------------------------------------------------------
 # API for interacting with STLe via C functions
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 J.I. Requeno et al
+#
+# This file is part of the ParetoLib software tool and governed by the
+# 'GNU License v3'. Please see the LICENSE file that should have been
+# included as part of this software.
+"""Campaign.
+
+This module learns the validity domain of the parameters of one
+parametrized STL formula over many signals (i.e., a campaign).
+
+The signals are distributed among a pool of worker processes. Each
+worker builds one OracleSTLe or OracleSTLeLib for the whole campaign,
+so the STLe library, the STL formula and its parameters are loaded once
+per worker instead of once per signal. For each signal it is given, the
+worker swaps the signal of its oracle (see OracleSTLe.set_signal) and
+runs a sequential search (see SearchND_2).
+
+The ResultSet of every signal is saved to disk by the worker as soon as
+it is available, and read back by the main process (instead of being
+sent through a pipe). The intersection of the ResultSets (see
+ResultSet.intersection) is updated incrementally, so a campaign that is
+interrupted keeps the results of the signals that finished.
+
+The campaign can be run from the command line:
+
+python -m ParetoLib.Search.Campaign formula.stl formula.param signal1.csv signal2.csv ... \
+    -o output_dir --interval 0 1000 --interval 0 300
+
+One argument '@file' is replaced by the arguments in the lines of the file
+(e.g., a list of signals).
+"""
+
+import os
+import sys
+import argparse
+from multiprocessing import Pool, cpu_count
+
+from ParetoLib.Oracle.OracleSTLe import OracleSTLe, OracleSTLeLib
+from ParetoLib.Search.Search import SearchND_2
+from ParetoLib.Search.CommonSearch import EPS, DELTA, STEPS
+from ParetoLib.Search.ResultSet import ResultSet
+import ParetoLib.Search as RootSearch
+
+# Oracles available from the command line
+ORACLES = {'stle': OracleSTLe, 'stlelib': OracleSTLeLib}
+
+# Name of the file with the intersection of the ResultSets of a campaign
+INTERSECTION_FILE = 'intersection.zip'
+
+# Arguments and oracle shared by the tasks of a worker process (see _init_worker)
+_campaign_args = None
+_oracle = None
+
+
+def _init_worker(campaign_args):
+    # type: (tuple) -> None
+    global _campaign_args, _oracle
+    oracle_class, stl_prop_file, stl_param_file = campaign_args[:3]
+    _campaign_args = campaign_args[3:]
+    # The oracle is initialized with the first signal (see _search_signal)
+    _oracle = oracle_class(stl_prop_file=stl_prop_file, stl_param_file=stl_param_file)
+
+
+def _close_worker():
+    # type: () -> None
+    global _campaign_args, _oracle
+    _campaign_args = None
+    _oracle = None
+
+
+def _result_file_name(output_dir, i, csv_signal_file):
+    # type: (str, int, str) -> str
+    # Signals with the same name in different folders are saved in different files
+    name = os.path.splitext(os.path.basename(csv_signal_file))[0]
+    return os.path.join(output_dir, '{0:04d}_{1}.zip'.format(i, name))
+
+
+def _search_signal(task):
+    # type: (tuple) -> tuple
+    i, csv_signal_file = task
+    list_intervals, search_args, output_dir = _campaign_args
+
+    rs_file = None
+    try:
+        _oracle.set_signal(csv_signal_file)
+        intervals = list_intervals if list_intervals is not None else [(0.0, 1.0)] * _oracle.dim()
+        rs = SearchND_2(_oracle, intervals, parallel=False, **search_args)
+
+        rs_file = _result_file_name(output_dir, i, csv_signal_file)
+        rs.to_file(rs_file)
+    except Exception as e:
+        # A signal that fails does not stop the campaign
+        RootSearch.logger.error('Unexpected error when searching {0}: {1}'.format(csv_signal_file, e))
+        rs_file = None
+    return i, csv_signal_file, rs_file
+
+
+def _load_result(result):
+    # type: (tuple) -> tuple
+    _, csv_signal_file, rs_file = result
+    rs = None
+    if rs_file is not None:
+        rs = ResultSet()
+        rs.from_file(rs_file)
+    return csv_signal_file, rs_file, rs
+
+
+def campaign(stl_prop_file,
+             stl_param_file,
+             csv_signal_files,
+             output_dir,
+             list_intervals=None,
+             oracle_class=OracleSTLeLib,
+             num_proc=cpu_count(),
+             epsilon=EPS,
+             delta=DELTA,
+             max_step=STEPS,
+             opt_level=2,
+             logging=False):
+    # type: (str, str, list, str, list, type, int, float, float, int, int, bool) -> iter
+    """
+    Learns the validity domain of the parameters of one STL formula over every signal in csv_signal_files.
+
+    Args:
+        stl_prop_file (str): File with the parametrized STL formula.
+        stl_param_file (str): File with the names of the parameters.
+        csv_signal_files (list): Files with the signals.
+        output_dir (str): Folder where the ResultSets are saved.
+        list_intervals (list): [(minx, maxx), (miny, maxy), ...] bounds of the parameters ([0, 1] by default).
+        oracle_class (type): OracleSTLe or OracleSTLeLib.
+        num_proc (int): Number of worker processes (1 for running the campaign in the current process).
+        epsilon, delta, max_step, opt_level, logging: see SearchND_2.
+
+    Returns:
+        iter: Tuples (csv_signal_file, rs_file, rs) in the order the searches finish,
+              with rs_file and rs set to None if the search failed.
+
+    Example:
+    >>> for csv_signal_file, rs_file, rs in campaign('prop.stl', 'prop.param', ['s1.csv', 's2.csv'], 'out'):
+    >>>     print(csv_signal_file, rs_file)
+    >>> s2.csv out/0001_s2.zip
+    >>> s1.csv out/0000_s1.zip
+    """
+    if not os.path.isdir(output_dir):
+        os.makedirs(output_dir)
+
+    search_args = {'epsilon': epsilon, 'delta': delta, 'max_step': max_step, 'opt_level': opt_level,
+                   'logging': logging, 'blocking': False, 'sleep': 0.0}
+    campaign_args = (oracle_class, stl_prop_file, stl_param_file, list_intervals, search_args, output_dir)
+    tasks = list(enumerate(csv_signal_files))
+
+    if num_proc <= 1 or len(tasks) <= 1:
+        _init_worker(campaign_args)
+        try:
+            for task in tasks:
+                yield _load_result(_search_signal(task))
+        finally:
+            _close_worker()
+        return
+
+    p = Pool(min(num_proc, len(tasks)), initializer=_init_worker, initargs=(campaign_args,))
+    try:
+        for result in p.imap_unordered(_search_signal, tasks):
+            yield _load_result(result)
+    finally:
+        # Stop multiprocessing
+        p.close()
+        p.join()
+
+
+def run_campaign(stl_prop_file,
+                 stl_param_file,
+                 csv_signal_files,
+                 output_dir,
+                 **kwargs):
+    # type: (str, str, list, str, dict) -> ResultSet
+    """
+    Runs a campaign (see campaign), and saves the intersection of the ResultSets
+    of every signal in output_dir/INTERSECTION_FILE.
+    The intersection is updated (and saved) every time a search finishes.
+
+    Returns:
+        ResultSet: Intersection of the ResultSets, or None if every search failed.
+
+    Example:
+    >>> rs = run_campaign('prop.stl', 'prop.param', ['s1.csv', 's2.csv'], 'out', list_intervals=[(0, 1000), (0, 300)])
+    >>> rs.volume_yup()
+    >>> 1234.5
+    """
+    intersection = None
+    intersection_file = os.path.join(output_dir, INTERSECTION_FILE)
+    finished = 0
+    for csv_signal_file, rs_file, rs in campaign(stl_prop_file, stl_param_file, csv_signal_files, output_dir,
+                                                 **kwargs):
+        if rs is None:
+            continue
+        intersection = rs if intersection is None else intersection.intersection(rs)
+        intersection.to_file(intersection_file)
+        finished += 1
+        RootSearch.logger.info('[{0}/{1}] {2}: {3}'.format(finished, len(csv_signal_files), csv_signal_file, rs_file))
+    return intersection
+
+
+def main(argv=None):
+    # type: (list) -> int
+    """
+    Command line interface of run_campaign.
+    """
+    parser = argparse.ArgumentParser(prog='python -m ParetoLib.Search.Campaign',
+                                     description='Learn the parameters of one STL formula over many signals.',
+                                     fromfile_prefix_chars='@')
+    parser.add_argument('stl_prop_file', help='parametrized STL formula (STLe format)')
+    parser.add_argument('stl_param_file', help='names of the parameters, one per line')
+    parser.add_argument('csv_signal_files', nargs='+', help='signals (csv)')
+    parser.add_argument('-o', '--output-dir', default='.', help='folder for the ResultSets')
+    parser.add_argument('--interval', nargs=2, type=float, action='append', metavar=('MIN', 'MAX'),
+                        help='bounds of a parameter (once per parameter; [0, 1] by default)')
+    parser.add_argument('--oracle', choices=sorted(ORACLES), default='stlelib')
+    parser.add_argument('-j', '--num-proc', type=int, default=cpu_count(), help='number of worker processes')
+    parser.add_argument('--epsilon', type=float, default=EPS)
+    parser.add_argument('--delta', type=float, default=DELTA)
+    parser.add_argument('--max-step', type=float, default=STEPS)
+    parser.add_argument('--opt-level', type=int, default=2)
+    args = parser.parse_args(argv)
+
+    csv_signal_files = [f.strip(' \n\t') for f in args.csv_signal_files if f.strip(' \n\t') != '']
+    list_intervals = [tuple(interval) for interval in args.interval] if args.interval is not None else None
+    rs = run_campaign(args.stl_prop_file, args.stl_param_file, csv_signal_files, args.output_dir,
+                      list_intervals=list_intervals,
+                      oracle_class=ORACLES[args.oracle],
+                      num_proc=args.num_proc,
+                      epsilon=args.epsilon,
+                      delta=args.delta,
+                      max_step=args.max_step,
+                      opt_level=args.opt_level)
+    return 0 if rs is not None else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -23,6 +23,7 @@ actions on Evolutionary Computation, 2018.
 
 from ParetoLib.Geometry.Point import add, subtract, less_equal, div
 from ParetoLib.Geometry.Segment import Segment
+from ParetoLib.Geometry.Rectangle import Rectangle
 
 # EPS = sys.float_info.epsilon
 # DELTA = sys.float_info.epsilon
@@ -65,3 +66,68 @@ def binary_search(x,
             # dist = subtract(y.high, y.low)
             dist = y.norm()
     return y, i
+
+
+def binary_search_batch(x_list,
+                        member_batch,
+                        error):
+    # type: (list, callable, tuple) -> list
+    """
+    Equivalent to [binary_search(x, member, error) for x in x_list],
+    with member_batch(points) == [member(p) for p in points].
+    The segments are bisected in lockstep, so the oracle answers one
+    batch of queries per step instead of one query at a time.
+    """
+    y_list = list(x_list)
+    steps = [0] * len(y_list)
+
+    # Segments whose lower extreme is inside the upward closure belong to B1
+    low_inside = member_batch([y.low for y in y_list])
+    pending = [j for j, inside in enumerate(low_inside) if not inside]
+    for j, inside in enumerate(low_inside):
+        if inside:
+            y_list[j].high = y_list[j].low
+
+    # Segments whose upper extreme is outside the upward closure belong to B0
+    high_inside = member_batch([y_list[j].high for j in pending])
+    for j, inside in zip(pending, high_inside):
+        if not inside:
+            y_list[j].low = y_list[j].high
+
+    # We don't know. We search for a point in the diagonal
+    active = [j for j, inside in zip(pending, high_inside) if inside and y_list[j].norm() > error[0]]
+    while len(active) > 0:
+        yval_list = [y_list[j].center() for j in active]
+        for j, yval, inside in zip(active, yval_list, member_batch(yval_list)):
+            steps[j] += 1
+            if inside:
+                y_list[j].high = yval
+            else:
+                y_list[j].low = yval
+        active = [j for j in active if y_list[j].norm() > error[0]]
+    return list(zip(y_list, steps))
+
+
+def intersection_search(x,
+                        oracle,
+                        member,
+                        error):
+    # type: (Segment, Oracle, callable, tuple) -> (Segment, int)
+    """
+    Equivalent to binary_search(x, member, error), but the rectangle
+    of diagonal x is first classified as a whole (see Oracle.member_rect),
+    and the intersection is computed analytically when the oracle
+    supports it (see Oracle.intersect_segment).
+    """
+    inside = oracle.member_rect(Rectangle(x.low, x.high))
+    if inside is True:
+        # All the cube belongs to B1
+        return Segment(x.low, x.low), 0
+    elif inside is False:
+        # All the cube belongs to B0
+        return Segment(x.high, x.high), 0
+    elif oracle.has_intersect_segment():
+        y = oracle.intersect_segment(x, error)
+        if y is not None:
+            return y, 0
+    return binary_search(x, member, error)
@@ -26,7 +26,7 @@ from sortedcontainers import SortedSet
 
 import ParetoLib.Search as RootSearch
 
-from ParetoLib.Search.CommonSearch import EPS, DELTA, STEPS, binary_search
+from ParetoLib.Search.CommonSearch import EPS, DELTA, STEPS, binary_search, binary_search_batch, intersection_search
 from ParetoLib.Search.ParResultSet import ParResultSet
 
 from ParetoLib.Oracle.Oracle import Oracle
@@ -55,12 +55,23 @@ def pbin_search(args):
     f = ora.membership()
     RootSearch.logger.debug('f = {0}'.format(f))
     error = (epsilon,) * n
-    y, steps_binsearch = binary_search(xrectangle.diag(), f, error)
+    y, steps_binsearch = intersection_search(xrectangle.diag(), ora, f, error)
     RootSearch.logger.debug('End parallel binary search')
     RootSearch.logger.debug('y, steps_binsearch: {0}, {1}'.format(y, steps_binsearch))
     return y
 
 
+def pbin_search_batch(slice_border, oracle, epsilon, n):
+    # type: (list, Oracle, float, int) -> list
+    RootSearch.logger.debug('Executing batched binary search')
+    RootSearch.logger.debug('slice_border, epsilon, n: {0}, {1}, {2}'.format(slice_border, epsilon, n))
+    error = (epsilon,) * n
+    y_list = binary_search_batch([xrectangle.diag() for xrectangle in slice_border], oracle.member_batch, error)
+    RootSearch.logger.debug('End batched binary search')
+    RootSearch.logger.debug('y_list: {0}'.format(y_list))
+    return [y for y, steps_binsearch in y_list]
+
+
 def pb0(args):
     # b0 = Rectangle(xspace.min_corner, y.low)
     xrectangle, y = args
@@ -203,16 +214,20 @@ def multidim_search_deep_first_opt_3(xspace,
     # oracle function
     # f = oracle.membership()
 
-    man = Manager()
-    dict_man = man.dict()
+    # Batched membership queries are answered by the oracle of the main process (see pbin_search_batch)
+    batch = oracle.has_member_batch()
+    dict_man = None
+    if not batch:
+        man = Manager()
+        dict_man = man.dict()
 
-    # 'f = oracle.membership()' is not thread safe!
-    # Create a copy of 'oracle' for each concurrent process
+        # 'f = oracle.membership()' is not thread safe!
+        # Create a copy of 'oracle' for each concurrent process
 
-    # dict_man = {proc.name: copy.deepcopy(oracle) for proc in mp.active_children()}
-    for proc in mp.active_children():
-        RootSearch.logger.debug('cloning: {0}'.format(oracle))
-        dict_man[proc.name] = copy.deepcopy(oracle)
+        # dict_man = {proc.name: copy.deepcopy(oracle) for proc in mp.active_children()}
+        for proc in mp.active_children():
+            RootSearch.logger.debug('cloning: {0}'.format(oracle))
+            dict_man[proc.name] = copy.deepcopy(oracle)
 
     RootSearch.logger.debug('xspace: {0}'.format(xspace))
     RootSearch.logger.debug('vol_border: {0}'.format(vol_border))
@@ -251,8 +266,12 @@ def multidim_search_deep_first_opt_3(xspace,
 
         # Search the intersection point of the Pareto front and the diagonal
         # args_pbin_search = [(xrectangle, dict_man, epsilon, n) for xrectangle in slice_border]
-        args_pbin_search = ((xrectangle, dict_man, epsilon, n) for xrectangle in slice_border)
-        y_list = p.map(pbin_search, args_pbin_search)
+        if batch:
+            # One batch of membership queries per bisection step (see Oracle.member_batch)
+            y_list = pbin_search_batch(slice_border, oracle, epsilon, n)
+        else:
+            args_pbin_search = ((xrectangle, dict_man, epsilon, n) for xrectangle in slice_border)
+            y_list = p.map(pbin_search, args_pbin_search)
 
         # Compute comparable rectangles b0 and b1
         # b0_list = p.map(pb0, zip(slice_border, y_list))
@@ -458,16 +477,20 @@ def multidim_search_deep_first_opt_2(xspace,
     # oracle function
     # f = oracle.membership()
 
-    man = Manager()
-    dict_man = man.dict()
+    # Batched membership queries are answered by the oracle of the main process (see pbin_search_batch)
+    batch = oracle.has_member_batch()
+    dict_man = None
+    if not batch:
+        man = Manager()
+        dict_man = man.dict()
 
-    # 'f = oracle.membership()' is not thread safe!
-    # Create a copy of 'oracle' for each concurrent process
+        # 'f = oracle.membership()' is not thread safe!
+        # Create a copy of 'oracle' for each concurrent process
 
-    # dict_man = {proc.name: copy.deepcopy(oracle) for proc in mp.active_children()}
-    for proc in mp.active_children():
-        RootSearch.logger.debug('cloning: {0}'.format(oracle))
-        dict_man[proc.name] = copy.deepcopy(oracle)
+        # dict_man = {proc.name: copy.deepcopy(oracle) for proc in mp.active_children()}
+        for proc in mp.active_children():
+            RootSearch.logger.debug('cloning: {0}'.format(oracle))
+            dict_man[proc.name] = copy.deepcopy(oracle)
 
     RootSearch.logger.debug('xspace: {0}'.format(xspace))
     RootSearch.logger.debug('vol_border: {0}'.format(vol_border))
@@ -503,8 +526,12 @@ def multidim_search_deep_first_opt_2(xspace,
 
         # Search the intersection point of the Pareto front and the diagonal
         # args_pbin_search = [(xrectangle, dict_man, epsilon, n) for xrectangle in slice_border]
-        args_pbin_search = ((xrectangle, dict_man, epsilon, n) for xrectangle in slice_border)
-        y_list = p.map(pbin_search, args_pbin_search)
+        if batch:
+            # One batch of membership queries per bisection step (see Oracle.member_batch)
+            y_list = pbin_search_batch(slice_border, oracle, epsilon, n)
+        else:
+            args_pbin_search = ((xrectangle, dict_man, epsilon, n) for xrectangle in slice_border)
+            y_list = p.map(pbin_search, args_pbin_search)
 
         # Compute comparable rectangles b0 and b1
         # b0_list = p.map(pb0, zip(slice_border, y_list))
@@ -683,16 +710,20 @@ def multidim_search_deep_first_opt_1(xspace,
     # oracle function
     # f = oracle.membership()
 
-    man = Manager()
-    dict_man = man.dict()
+    # Batched membership queries are answered by the oracle of the main process (see pbin_search_batch)
+    batch = oracle.has_member_batch()
+    dict_man = None
+    if not batch:
+        man = Manager()
+        dict_man = man.dict()
 
-    # 'f = oracle.membership()' is not thread safe!
-    # Create a copy of 'oracle' for each concurrent process
+        # 'f = oracle.membership()' is not thread safe!
+        # Create a copy of 'oracle' for each concurrent process
 
-    # dict_man = {proc.name: copy.deepcopy(oracle) for proc in mp.active_children()}
-    for proc in mp.active_children():
-        RootSearch.logger.debug('cloning: {0}'.format(oracle))
-        dict_man[proc.name] = copy.deepcopy(oracle)
+        # dict_man = {proc.name: copy.deepcopy(oracle) for proc in mp.active_children()}
+        for proc in mp.active_children():
+            RootSearch.logger.debug('cloning: {0}'.format(oracle))
+            dict_man[proc.name] = copy.deepcopy(oracle)
 
     RootSearch.logger.debug('xspace: {0}'.format(xspace))
     RootSearch.logger.debug('vol_border: {0}'.format(vol_border))
@@ -728,8 +759,12 @@ def multidim_search_deep_first_opt_1(xspace,
 
         # Search the intersection point of the Pareto front and the diagonal
         # args_pbin_search = [(xrectangle, dict_man, epsilon, n) for xrectangle in slice_border]
-        args_pbin_search = ((xrectangle, dict_man, epsilon, n) for xrectangle in slice_border)
-        y_list = p.map(pbin_search, args_pbin_search)
+        if batch:
+            # One batch of membership queries per bisection step (see Oracle.member_batch)
+            y_list = pbin_search_batch(slice_border, oracle, epsilon, n)
+        else:
+            args_pbin_search = ((xrectangle, dict_man, epsilon, n) for xrectangle in slice_border)
+            y_list = p.map(pbin_search, args_pbin_search)
 
         # Compute comparable rectangles b0 and b1
         b0_list = p.map(pb0, zip(slice_border, y_list))
@@ -905,16 +940,20 @@ def multidim_search_deep_first_opt_inf(xspace,
     # oracle function
     # f = oracle.membership()
 
-    man = Manager()
-    dict_man = man.dict()
+    # Batched membership queries are answered by the oracle of the main process (see pbin_search_batch)
+    batch = oracle.has_member_batch()
+    dict_man = None
+    if not batch:
+        man = Manager()
+        dict_man = man.dict()
 
-    # 'f = oracle.membership()' is not thread safe!
-    # Create a copy of 'oracle' for each concurrent process
+        # 'f = oracle.membership()' is not thread safe!
+        # Create a copy of 'oracle' for each concurrent process
 
-    # dict_man = {proc.name: copy.deepcopy(oracle) for proc in mp.active_children()}
-    for proc in mp.active_children():
-        RootSearch.logger.debug('cloning: {0}'.format(oracle))
-        dict_man[proc.name] = copy.deepcopy(oracle)
+        # dict_man = {proc.name: copy.deepcopy(oracle) for proc in mp.active_children()}
+        for proc in mp.active_children():
+            RootSearch.logger.debug('cloning: {0}'.format(oracle))
+            dict_man[proc.name] = copy.deepcopy(oracle)
 
     RootSearch.logger.debug('xspace: {0}'.format(xspace))
     RootSearch.logger.debug('vol_border: {0}'.format(vol_border))
@@ -951,8 +990,12 @@ def multidim_search_deep_first_opt_inf(xspace,
 
         # Search the intersection point of the Pareto front and the diagonal
         # args_pbin_search = [(xrectangle, dict_man, epsilon, n) for xrectangle in slice_border]
-        args_pbin_search = ((xrectangle, dict_man, epsilon, n) for xrectangle in slice_border)
-        y_list = p.map(pbin_search, args_pbin_search)
+        if batch:
+            # One batch of membership queries per bisection step (see Oracle.member_batch)
+            y_list = pbin_search_batch(slice_border, oracle, epsilon, n)
+        else:
+            args_pbin_search = ((xrectangle, dict_man, epsilon, n) for xrectangle in slice_border)
+            y_list = p.map(pbin_search, args_pbin_search)
 
         # Compute comparable rectangles b0 and b1
         b0_list = p.map(pb0, zip(slice_border, y_list))
@@ -1096,16 +1139,20 @@ def multidim_search_deep_first_opt_0(xspace,
     # oracle function
     # f = oracle.membership()
 
-    man = Manager()
-    dict_man = man.dict()
+    # Batched membership queries are answered by the oracle of the main process (see pbin_search_batch)
+    batch = oracle.has_member_batch()
+    dict_man = None
+    if not batch:
+        man = Manager()
+        dict_man = man.dict()
 
-    # 'f = oracle.membership()' is not thread safe!
-    # Create a copy of 'oracle' for each concurrent process
+        # 'f = oracle.membership()' is not thread safe!
+        # Create a copy of 'oracle' for each concurrent process
 
-    # dict_man = {proc.name: copy.deepcopy(oracle) for proc in mp.active_children()}
-    for proc in mp.active_children():
-        RootSearch.logger.debug('cloning: {0}'.format(oracle))
-        dict_man[proc.name] = copy.deepcopy(oracle)
+        # dict_man = {proc.name: copy.deepcopy(oracle) for proc in mp.active_children()}
+        for proc in mp.active_children():
+            RootSearch.logger.debug('cloning: {0}'.format(oracle))
+            dict_man[proc.name] = copy.deepcopy(oracle)
 
     RootSearch.logger.debug('xspace: {0}'.format(xspace))
     RootSearch.logger.debug('vol_border: {0}'.format(vol_border))
@@ -1142,8 +1189,12 @@ def multidim_search_deep_first_opt_0(xspace,
 
         # Search the intersection point of the Pareto front and the diagonal
         # args_pbin_search = [(xrectangle, dict_man, epsilon, n) for xrectangle in slice_border]
-        args_pbin_search = ((xrectangle, dict_man, epsilon, n) for xrectangle in slice_border)
-        y_list = p.map(pbin_search, args_pbin_search)
+        if batch:
+            # One batch of membership queries per bisection step (see Oracle.member_batch)
+            y_list = pbin_search_batch(slice_border, oracle, epsilon, n)
+        else:
+            args_pbin_search = ((xrectangle, dict_man, epsilon, n) for xrectangle in slice_border)
+            y_list = p.map(pbin_search, args_pbin_search)
 
         # Compute comparable rectangles b0 and b1
         b0_list = p.map(pb0, zip(slice_border, y_list))
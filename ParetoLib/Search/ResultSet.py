@@ -19,15 +19,29 @@ The ResultSet class provides functions for:
 - Testing the membership of a new point y to any of the closures.
 - Plotting 2D and 3D spaces
 - Exporting/Importing the results to text and binary files.
+
+Besides the default .zip format (i.e., a pickled list of Rectangles
+per closure), a ResultSet can be saved in a columnar binary format.
+The columnar file contains a small header followed by one float64
+array of shape (n, 2, d) per closure, where [i, 0, :] and [i, 1, :]
+are the min and max corners of the i-th rectangle:
+
+    magic (8 bytes), version (uint32), d (uint32),
+    (offset, n) (2 x uint64) for xspace, yup, ylow and border,
+    data.
+
+Columnar files are memory-mapped when loaded, so closures are exposed
+as arrays without materialising Rectangle objects until they are
+explicitly accessed as lists (e.g., rs.yup).
 """
-import os
 import sys
 import pickle
+import struct
 from itertools import chain, combinations  # combinations_with_replacement
 import zipfile
-import tempfile
 # import shutil
 
+import numpy as np
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
 
@@ -35,12 +49,90 @@ from ParetoLib.Oracle.NDTree import NDTree
 from ParetoLib.Geometry.Rectangle import Rectangle
 import ParetoLib.Search as RootSearch
 
+# Columnar file format
+COLUMNAR_MAGIC = b'PARESSET'
+COLUMNAR_VERSION = 1
+COLUMNAR_CLOSURES = ('xspace', 'yup', 'ylow', 'border')
+_COLUMNAR_HEADER = struct.Struct('<8sII')
+_COLUMNAR_ENTRY = struct.Struct('<QQ')
+_COLUMNAR_DTYPE = np.dtype('<f8')
+
+
+def _zip_write_pickle(zf, name, obj):
+    # type: (zipfile.ZipFile, str, object) -> None
+    """
+    Pickles obj into the entry name of the .zip file zf.
+    """
+    if sys.version_info >= (3, 6):
+        # Pickled directly into the entry, without a copy in memory
+        with zf.open(name, mode='w') as output:
+            pickle.dump(obj, output, pickle.HIGHEST_PROTOCOL)
+    else:
+        # ZipFile.open cannot write before Python 3.6
+        zf.writestr(name, pickle.dumps(obj, pickle.HIGHEST_PROTOCOL))
+
+
+def rect_list_to_array(rect_list, d):
+    # type: (iter, int) -> np.ndarray
+    """
+    Array of shape (n, 2, d) with the min and max corners of a list of n rectangles.
+    """
+    arr = np.array([(r.min_corner, r.max_corner) for r in rect_list], dtype=_COLUMNAR_DTYPE)
+    return arr.reshape((-1, 2, d))
+
+
+def array_to_rect_list(arr):
+    # type: (np.ndarray) -> list
+    """
+    List of rectangles stored in an array of shape (n, 2, d).
+    """
+    return [Rectangle(tuple(minc), tuple(maxc)) for minc, maxc in arr.tolist()]
+
+
+def read_columnar(f):
+    # type: (str) -> dict
+    """
+    Memory-mapped arrays of shape (n, 2, d) stored in a columnar file, indexed by closure.
+    """
+    with open(f, 'rb') as inputfile:
+        magic, version, d = _COLUMNAR_HEADER.unpack(inputfile.read(_COLUMNAR_HEADER.size))
+        assert magic == COLUMNAR_MAGIC, '{0} is not a ResultSet file'.format(f)
+        assert version == COLUMNAR_VERSION, 'Unsupported version {0} of file {1}'.format(version, f)
+        entries = [_COLUMNAR_ENTRY.unpack(inputfile.read(_COLUMNAR_ENTRY.size)) for _ in COLUMNAR_CLOSURES]
+
+    arrays = {}
+    for name, (offset, n) in zip(COLUMNAR_CLOSURES, entries):
+        if n == 0:
+            arrays[name] = np.empty((0, 2, d), dtype=_COLUMNAR_DTYPE)
+        else:
+            arrays[name] = np.memmap(f, dtype=_COLUMNAR_DTYPE, mode='r', offset=offset, shape=(n, 2, d))
+    return arrays
+
+
+def _array_volume(arr):
+    # type: (np.ndarray) -> float
+    return float(np.prod(arr[:, 1, :] - arr[:, 0, :], axis=1).sum())
+
+
+def array_metadata(arr):
+    # type: (np.ndarray) -> dict
+    """
+    Number of rectangles, sum of their volumes and bounding box of an array of shape (n, 2, d).
+    """
+    bounding_box = None
+    if len(arr) > 0:
+        bounding_box = (tuple(arr[:, 0, :].min(axis=0).tolist()), tuple(arr[:, 1, :].max(axis=0).tolist()))
+    return {'count': len(arr), 'volume': _array_volume(arr), 'bounding_box': bounding_box}
+
 
 class ResultSet(object):
     def __init__(self, border=list(), ylow=list(), yup=list(), xspace=Rectangle()):
         # type: (ResultSet, iter, iter, iter, Rectangle) -> None
         assert xspace is not None, 'xspace is None, it must be defined'
 
+        # Closures loaded from a columnar file that are not materialised yet as lists of Rectangles
+        self._arrays = {}
+
         # self.border = list(border) is required for forcing the creation of a local list.
         # If two ResultSets are created by making an empty call to ResultSet() (i.e., rs1, rs2),
         # then rs1.border and rs2.border will point to the same list. Modifications in rs1.border
@@ -61,6 +153,7 @@ class ResultSet(object):
         self.filename_ylow = 'low'
         self.filename_border = 'border'
         self.filename_space = 'space'
+        self.filename_metadata = 'metadata'
 
         self.ylow_pareto = NDTree()
         self.yup_pareto = NDTree()
@@ -104,10 +197,27 @@ class ResultSet(object):
             # self.__dict__[str_yup_pareto] = NDTree()
             object.__setattr__(self, str_ylow_pareto, NDTree())
             object.__setattr__(self, str_yup_pareto, NDTree())
+            # A new value for the closure overrides the array loaded from a columnar file (if any)
+            self.__dict__.get('_arrays', {}).pop(name, None)
 
         # self.__dict__[name] = None
         object.__setattr__(self, name, value)
 
+    def __getattr__(self, name):
+        # type: (ResultSet, str) -> list
+        """
+        Lazy materialisation of the closures loaded from a columnar file.
+        It is only called when the attribute is not found in the usual places.
+        """
+        arrays = self.__dict__.get('_arrays', {})
+        if name not in arrays:
+            raise AttributeError('{0} object has no attribute {1}'.format(type(self).__name__, name))
+        value = array_to_rect_list(arrays[name])
+        # Bypass __setattr__ for keeping the Pareto archives
+        object.__setattr__(self, name, value)
+        del arrays[name]
+        return value
+
     # Printers
     def _to_str(self):
         # type: (ResultSet) -> str
@@ -273,12 +383,16 @@ class ResultSet(object):
 
     def volume_yup(self):
         # type: (ResultSet) -> float
+        if 'yup' in self._arrays:
+            return _array_volume(self._arrays['yup'])
         # vol_list = p.map(Rectangle.volume, self.yup)
         vol_list = (rect.volume() for rect in self.yup)
         return sum(vol_list)
 
     def volume_ylow(self):
         # type: (ResultSet) -> float
+        if 'ylow' in self._arrays:
+            return _array_volume(self._arrays['ylow'])
         # vol_list = p.map(Rectangle.volume, self.ylow)
         vol_list = (rect.volume() for rect in self.ylow)
         return sum(vol_list)
@@ -417,16 +531,14 @@ class ResultSet(object):
     def get_points_pareto_yup(self):
         # type: (ResultSet) -> set
         if self.yup_pareto.is_empty():
-            for p in (r.min_corner for r in self.yup):
-                self.yup_pareto.update_point(p)
+            self.yup_pareto.bulk_load(r.min_corner for r in self.yup)
 
         return self.yup_pareto.get_points()
 
     def get_points_pareto_ylow(self):
         # type: (ResultSet) -> set
         if self.ylow_pareto.is_empty():
-            for p in (r.max_corner for r in self.ylow):
-                self.ylow_pareto.update_point(p)
+            self.ylow_pareto.bulk_load(r.max_corner for r in self.ylow)
 
         return self.ylow_pareto.get_points()
 
@@ -991,42 +1103,64 @@ class ResultSet(object):
         with open(f, 'wb') as output:
             pickle.dump(self.xspace, output, pickle.HIGHEST_PROTOCOL)
 
-    def to_file(self, f):
-        # type: (ResultSet, str) -> None
-        # fname = os.path.basename(f)
-        # name = os.path.splitext(fname)
-        # ('file', '.ext')
-        # basename = name[0]
-        # extension = name[1]
-
-        # Save each closure into a separated file, and, then, compress them in a single .zip
-        tempdir = tempfile.mkdtemp()
-
-        yup_name = os.path.join(tempdir, self.filename_yup)
-        ylow_name = os.path.join(tempdir, self.filename_ylow)
-        border_name = os.path.join(tempdir, self.filename_border)
-        space_name = os.path.join(tempdir, self.filename_space)
-
-        self.to_file_yup(yup_name)
-        self.to_file_ylow(ylow_name)
-        self.to_file_border(border_name)
-        self.to_file_space(space_name)
-
-        filename_list = (yup_name, ylow_name, border_name, space_name)
-        zf = zipfile.ZipFile(f, mode='w', compression=zipfile.ZIP_DEFLATED)
-        for outfile in filename_list:
-            try:
-                fname = os.path.basename(outfile)
-                # Adding new file to the .zip
-                zf.write(outfile, arcname=fname)
-            except OSError:
-                RootSearch.logger.error('Unexpected error when saving {0}: {1}'.format(outfile, sys.exc_info()[0]))
-            os.remove(outfile)
-        zf.close()
-
-        # Remove temporary folder
-        os.rmdir(tempdir)
-        # shutil.rmtree(tempdir, ignore_errors=True)
+    def metadata(self):
+        # type: (ResultSet) -> dict
+        """
+        Aggregate information of the ResultSet: dimension, limits of xspace and,
+        for each closure, the number of rectangles, the sum of their volumes and their bounding box.
+
+        Args:
+            self (ResultSet): The ResultSet.
+
+        Returns:
+            dict: {'dim': d, 'xspace': (min_corner, max_corner), 'yup': {'count': n, 'volume': v, 'bounding_box': b}, ...}
+        """
+        meta = {'dim': self.xspace.dim(),
+                'xspace': (self.xspace.min_corner, self.xspace.max_corner)}
+        for closure in COLUMNAR_CLOSURES[1:]:
+            meta[closure] = array_metadata(self._get_array(closure))
+        return meta
+
+    def _closure_filenames(self):
+        # type: (ResultSet) -> dict
+        # Name of the entry in the .zip file that stores each closure
+        return {'yup': self.filename_yup,
+                'ylow': self.filename_ylow,
+                'border': self.filename_border,
+                'xspace': self.filename_space}
+
+    def to_file(self, f, columnar=False, compresslevel=None):
+        # type: (ResultSet, str, bool, int) -> None
+        """
+        Save the ResultSet in a file.
+
+        Args:
+            self (ResultSet): The ResultSet.
+            f (str): Name of the output file.
+            columnar (bool): Save the ResultSet in the columnar format instead of a .zip of pickles.
+            compresslevel (int): Level of compression of the .zip file,
+            from 0 (no compression) to 9 (best compression). None for the default level of zlib.
+            It is ignored before Python 3.7.
+
+        Returns:
+            None: The ResultSet is saved in f.
+        """
+        if columnar:
+            self.to_file_columnar(f)
+            return
+
+        # ZipFile accepts compresslevel since Python 3.7
+        kwargs = {}
+        if compresslevel is not None and sys.version_info >= (3, 7):
+            kwargs['compresslevel'] = compresslevel
+
+        # Each closure is pickled into its entry of the .zip file, without intermediate files
+        closure_filenames = self._closure_filenames()
+        with zipfile.ZipFile(f, mode='w', compression=zipfile.ZIP_DEFLATED, **kwargs) as zf:
+            for closure in ('yup', 'ylow', 'border', 'xspace'):
+                _zip_write_pickle(zf, closure_filenames[closure], getattr(self, closure))
+            # Aggregate information for reading it without loading the closures (see ResultSetReader)
+            _zip_write_pickle(zf, self.filename_metadata, self.metadata())
 
     def from_file_yup(self, f):
         # type: (ResultSet, str) -> None
@@ -1052,47 +1186,88 @@ class ResultSet(object):
         with open(f, 'rb') as inputfile:
             self.xspace = pickle.load(inputfile)
 
-    def from_file(self, f):
-        # type: (ResultSet, str) -> None
-        # fname = os.path.basename(f)
-        # name = os.path.splitext(fname)
-        # ('file', '.ext')
-        # basename = name[0]
-        # extension = name[1]
-
-        # Extracts all the files into a temporal folder.
-        # Each file contains a closure.
-        tempdir = tempfile.mkdtemp()
-
-        zf = zipfile.ZipFile(f, mode='r')
-        try:
-            zf.extractall(tempdir)
-        except KeyError:
-            RootSearch.logger.error('Did not find {0} file'.format(f))
-        else:
-            zf.close()
-
-        yup_name = os.path.join(tempdir, self.filename_yup)
-        ylow_name = os.path.join(tempdir, self.filename_ylow)
-        border_name = os.path.join(tempdir, self.filename_border)
-        space_name = os.path.join(tempdir, self.filename_space)
-
-        self.from_file_yup(yup_name)
-        self.from_file_ylow(ylow_name)
-        self.from_file_border(border_name)
-        self.from_file_space(space_name)
-
-        # Remove temporal files before removing the temporary folder
-        filename_list = (yup_name, ylow_name, border_name, space_name)
-        for infile in filename_list:
-            if os.path.exists(infile):
+    def from_file(self, f, closures=('yup', 'ylow', 'border', 'xspace')):
+        # type: (ResultSet, str, iter) -> None
+        """
+        Load the ResultSet from a file.
+
+        Args:
+            self (ResultSet): The ResultSet.
+            f (str): Name of the input file, either a .zip or a columnar file.
+            closures (iter): Closures to be loaded (i.e., 'yup', 'ylow', 'border' and/or 'xspace').
+            The rest of closures are not read from the file and keep their current value.
+
+        Returns:
+            None: The ResultSet is loaded from f.
+
+        Example:
+        >>> rs = ResultSet()
+        >>> rs.from_file('result.zip', closures=('yup',))
+        """
+        if not zipfile.is_zipfile(f):
+            self.from_file_columnar(f, closures=closures)
+            return
+
+        # Each closure is unpickled directly from its entry of the .zip file, without intermediate files
+        closure_filenames = self._closure_filenames()
+        with zipfile.ZipFile(f, mode='r') as zf:
+            for closure in closures:
                 try:
-                    os.remove(infile)
-                except OSError:
-                    RootSearch.logger.error('Unexpected error when removing {0}: {1}'.format(infile, sys.exc_info()[0]))
-
-        # Remove temporary folder
-        try:
-            os.rmdir(tempdir)
-        except OSError:
-            RootSearch.logger.error('Unexpected error when removing folder {0}: {1}'.format(tempdir, sys.exc_info()[0]))
+                    with zf.open(closure_filenames[closure]) as inputfile:
+                        setattr(self, closure, pickle.load(inputfile))
+                except KeyError:
+                    RootSearch.logger.error('Did not find {0} in file {1}'.format(closure, f))
+
+    # Columnar format
+    def get_array_yup(self):
+        # type: (ResultSet) -> np.ndarray
+        return self._get_array('yup')
+
+    def get_array_ylow(self):
+        # type: (ResultSet) -> np.ndarray
+        return self._get_array('ylow')
+
+    def get_array_border(self):
+        # type: (ResultSet) -> np.ndarray
+        return self._get_array('border')
+
+    def _get_array(self, name):
+        # type: (ResultSet, str) -> np.ndarray
+        # Array of shape (n, 2, d) with the corners of the rectangles in the closure.
+        # If the closure was loaded from a columnar file and it is not materialised yet,
+        # then the memory-mapped array is returned without copying it.
+        if name in self._arrays:
+            return self._arrays[name]
+        return rect_list_to_array(getattr(self, name), self.xspace.dim())
+
+    def to_file_columnar(self, f):
+        # type: (ResultSet, str) -> None
+        d = self.xspace.dim()
+        arrays = [rect_list_to_array([self.xspace], d)]
+        arrays += [self._get_array(name) for name in COLUMNAR_CLOSURES[1:]]
+
+        offset = _COLUMNAR_HEADER.size + _COLUMNAR_ENTRY.size * len(COLUMNAR_CLOSURES)
+        with open(f, 'wb') as output:
+            output.write(_COLUMNAR_HEADER.pack(COLUMNAR_MAGIC, COLUMNAR_VERSION, d))
+            for arr in arrays:
+                output.write(_COLUMNAR_ENTRY.pack(offset, len(arr)))
+                offset += arr.size * _COLUMNAR_DTYPE.itemsize
+            for arr in arrays:
+                output.write(np.ascontiguousarray(arr, dtype=_COLUMNAR_DTYPE).tobytes())
+
+    def from_file_columnar(self, f, lazy=True, closures=('yup', 'ylow', 'border', 'xspace')):
+        # type: (ResultSet, str, bool, iter) -> None
+        # If lazy, the closures are memory-mapped and only converted into lists of Rectangles when accessed
+        arrays = read_columnar(f)
+
+        if 'xspace' in closures:
+            self.xspace = array_to_rect_list(arrays['xspace'])[0]
+        for name in COLUMNAR_CLOSURES[1:]:
+            if name not in closures:
+                continue
+            if lazy:
+                # Removing the closure from the object forces the call to __getattr__ on the next access
+                self.__dict__.pop(name, None)
+                self._arrays[name] = arrays[name]
+            else:
+                setattr(self, name, array_to_rect_list(arrays[name]))
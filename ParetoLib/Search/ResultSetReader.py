@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 J.I. Requeno et al
+#
+# This file is part of the ParetoLib software tool and governed by the
+# 'GNU License v3'. Please see the LICENSE file that should have been
+# included as part of this software.
+"""ResultSetReader.
+
+Lazy access to a ResultSet stored in a file (see ResultSet.to_file).
+
+The ResultSetReader class provides functions for:
+- Reading the aggregate information of the closures (number of
+  rectangles, volume and bounding box) without loading the rectangles.
+- Iterating over the rectangles of a single closure in chunks.
+
+Aggregate information is recorded in the .zip files at saving time.
+Columnar files are memory-mapped, so the aggregate information is
+computed over the arrays without building any Rectangle, and chunks
+are materialised one at a time.
+Zip files saved by older versions of ParetoLib do not include the
+aggregate information, so the closures are loaded for computing it.
+
+Only the columnar format is streamed with bounded memory. Each closure
+of a .zip file is a single pickled list, so iterating over its chunks
+unpickles the whole closure first. Save the ResultSet with
+to_file(f, columnar=True) when the closures do not fit in memory.
+"""
+
+import pickle
+import zipfile
+
+from ParetoLib.Search.ResultSet import ResultSet, COLUMNAR_CLOSURES, read_columnar, array_metadata, \
+    array_to_rect_list, rect_list_to_array
+import ParetoLib.Search as RootSearch
+
+
+class ResultSetReader(object):
+    def __init__(self, f):
+        # type: (ResultSetReader, str) -> None
+        """
+        Args:
+            self (ResultSetReader): The ResultSetReader.
+            f (str): Name of the file (.zip or columnar) that stores the ResultSet.
+
+        Example:
+        >>> reader = ResultSetReader('result.zip')
+        >>> reader.volume('yup')
+        >>> for rect_list in reader.iter_rectangles('border', chunk_size=1024):
+        >>>     print(len(rect_list))
+        """
+        self.filename = f
+        self.columnar = not zipfile.is_zipfile(f)
+        # Only used for reading the names of the entries in the .zip file
+        self._rs = ResultSet()
+        self._metadata = None
+
+    def __repr__(self):
+        # type: (ResultSetReader) -> str
+        return 'ResultSetReader({0})'.format(self.filename)
+
+    def __str__(self):
+        # type: (ResultSetReader) -> str
+        return self.__repr__()
+
+    def _load_entry(self, name):
+        # type: (ResultSetReader, str) -> object
+        with zipfile.ZipFile(self.filename, mode='r') as zf:
+            with zf.open(name) as inputfile:
+                return pickle.load(inputfile)
+
+    def _load_closure(self, closure):
+        # type: (ResultSetReader, str) -> list
+        return self._load_entry(self._rs._closure_filenames()[closure])
+
+    def metadata(self):
+        # type: (ResultSetReader) -> dict
+        """
+        Aggregate information of the ResultSet (see ResultSet.metadata).
+        """
+        if self._metadata is not None:
+            return self._metadata
+
+        if self.columnar:
+            arrays = read_columnar(self.filename)
+            xspace = array_to_rect_list(arrays['xspace'])[0]
+            meta = {'dim': xspace.dim(),
+                    'xspace': (xspace.min_corner, xspace.max_corner)}
+            for closure in COLUMNAR_CLOSURES[1:]:
+                meta[closure] = array_metadata(arrays[closure])
+        else:
+            with zipfile.ZipFile(self.filename, mode='r') as zf:
+                has_metadata = self._rs.filename_metadata in zf.namelist()
+            if has_metadata:
+                meta = self._load_entry(self._rs.filename_metadata)
+            else:
+                RootSearch.logger.debug('No metadata in {0}, loading the closures'.format(self.filename))
+                rs = ResultSet()
+                rs.from_file(self.filename)
+                meta = rs.metadata()
+
+        self._metadata = meta
+        return meta
+
+    def dim(self):
+        # type: (ResultSetReader) -> int
+        return self.metadata()['dim']
+
+    def count(self, closure):
+        # type: (ResultSetReader, str) -> int
+        return self.metadata()[closure]['count']
+
+    def volume(self, closure):
+        # type: (ResultSetReader, str) -> float
+        return self.metadata()[closure]['volume']
+
+    def bounding_box(self, closure):
+        # type: (ResultSetReader, str) -> tuple
+        return self.metadata()[closure]['bounding_box']
+
+    def iter_arrays(self, closure, chunk_size=1024):
+        # type: (ResultSetReader, str, int) -> iter
+        """
+        Generator of arrays of shape (k, 2, d), with k <= chunk_size, storing the rectangles of a closure.
+        Chunks of columnar files are views of the memory-mapped file. Closures of .zip files are
+        loaded entirely before being split into chunks.
+
+        Args:
+            self (ResultSetReader): The ResultSetReader.
+            closure (str): 'yup', 'ylow' or 'border'.
+            chunk_size (int): Maximum number of rectangles per chunk.
+
+        Returns:
+            iter: Chunks of the closure.
+        """
+        assert chunk_size > 0, 'chunk_size must be positive'
+        assert closure in COLUMNAR_CLOSURES[1:], 'Unknown closure {0}'.format(closure)
+        if self.columnar:
+            arr = read_columnar(self.filename)[closure]
+        else:
+            # Pickled closures must be loaded entirely
+            arr = rect_list_to_array(self._load_closure(closure), self.dim())
+        for i in range(0, len(arr), chunk_size):
+            yield arr[i:i + chunk_size]
+
+    def iter_rectangles(self, closure, chunk_size=1024):
+        # type: (ResultSetReader, str, int) -> iter
+        """
+        Generator of lists of at most chunk_size Rectangles belonging to a closure.
+        Only one chunk of a columnar file is materialised at a time (see iter_arrays).
+        """
+        if self.columnar:
+            for arr in self.iter_arrays(closure, chunk_size):
+                yield array_to_rect_list(arr)
+        else:
+            assert chunk_size > 0, 'chunk_size must be positive'
+            rect_list = self._load_closure(closure)
+            for i in range(0, len(rect_list), chunk_size):
+                yield rect_list[i:i + chunk_size]
@@ -40,6 +40,12 @@ multithreading capabilities of the computer.
 debugging options.
 
 
+When the Oracle is an OraclePoint, SearchND and SearchND_2 do not run the
+learning algorithm. The partition is directly computed from the points
+stored in the OraclePoint (see ParetoLib.Search.StaircaseSearch), and only
+epsilon is taken into account (i.e., delta, max_step, blocking, sleep,
+opt_level and parallel are ignored).
+
 As a result, the function returns an object of the class ResultSet with the distribution
 of the space X in three subspaces: a lower closure, an upper closure and a border which
  contains the Pareto front.
@@ -50,11 +56,13 @@ from ParetoLib.Geometry.Rectangle import Rectangle
 
 import ParetoLib.Search.SeqSearch as SeqSearch
 import ParetoLib.Search.ParSearch as ParSearch
+import ParetoLib.Search.StaircaseSearch as StaircaseSearch
 import ParetoLib.Search as RootSearch
 
 from ParetoLib.Search.CommonSearch import EPS, DELTA, STEPS
 from ParetoLib.Search.ResultSet import ResultSet
 from ParetoLib.Oracle.Oracle import Oracle
+from ParetoLib.Oracle.OraclePoint import OraclePoint
 
 
 # Auxiliar functions used in 2D, 3D and ND
@@ -203,7 +211,10 @@ def SearchND(ora,
     maxc = (max_corner,) * d
     xyspace = Rectangle(minc, maxc)
 
-    if parallel:
+    if isinstance(ora, OraclePoint):
+        # The partition is fully determined by the points stored in the OraclePoint
+        rs = StaircaseSearch.multidim_search(xyspace, ora, epsilon, logging)
+    elif parallel:
         rs = ParSearch.multidim_search(xyspace, ora, epsilon, delta, max_step,
                                        blocking, sleep, opt_level, logging)
     else:
@@ -231,7 +242,9 @@ def SearchND_2(ora,
     # list_intervals = [(minx, maxx), (miny, maxy),..., (minz, maxz)]
     xyspace = create_ND_space(list_intervals)
 
-    if parallel:
+    if isinstance(ora, OraclePoint):
+        rs = StaircaseSearch.multidim_search(xyspace, ora, epsilon, logging)
+    elif parallel:
         rs = ParSearch.multidim_search(xyspace, ora, epsilon, delta, max_step,
                                        blocking, sleep, opt_level, logging)
     else:
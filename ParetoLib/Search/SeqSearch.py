@@ -23,7 +23,7 @@ from sortedcontainers import SortedListWithKey, SortedSet
 
 import ParetoLib.Search as RootSearch
 
-from ParetoLib.Search.CommonSearch import EPS, DELTA, STEPS, binary_search
+from ParetoLib.Search.CommonSearch import EPS, DELTA, STEPS, intersection_search
 from ParetoLib.Search.ResultSet import ResultSet
 
 from ParetoLib.Oracle.Oracle import Oracle
@@ -158,7 +158,7 @@ def multidim_search_opt_3(xspace,
 
         # y, segment
         # y = search(xrectangle.diag(), f, epsilon)
-        y, steps_binsearch = binary_search(xrectangle.diag(), f, error)
+        y, steps_binsearch = intersection_search(xrectangle.diag(), oracle, f, error)
         RootSearch.logger.debug('y: {0}'.format(y))
         # discovered_segments.append(y)
 
@@ -376,7 +376,7 @@ def multidim_search_opt_2(xspace,
 
         # y, segment
         # y = search(xrectangle.diag(), f, epsilon)
-        y, steps_binsearch = binary_search(xrectangle.diag(), f, error)
+        y, steps_binsearch = intersection_search(xrectangle.diag(), oracle, f, error)
         RootSearch.logger.debug('y: {0}'.format(y))
         # discovered_segments.append(y)
 
@@ -566,7 +566,7 @@ def multidim_search_opt_1(xspace,
 
         # y, segment
         # y = search(xrectangle.diag(), f, epsilon)
-        y, steps_binsearch = binary_search(xrectangle.diag(), f, error)
+        y, steps_binsearch = intersection_search(xrectangle.diag(), oracle, f, error)
         RootSearch.logger.debug('y: {0}'.format(y))
         # discovered_segments.append(y)
 
@@ -781,7 +781,7 @@ def multidim_search_opt_inf(xspace,
 
         # y, segment
         # y = search(xrectangle.diag(), f, epsilon)
-        y, steps_binsearch = binary_search(xrectangle.diag(), f, error)
+        y, steps_binsearch = intersection_search(xrectangle.diag(), oracle, f, error)
         RootSearch.logger.debug('y: {0}'.format(y))
 
         # b0 = Rectangle(xspace.min_corner, y.low)
@@ -940,7 +940,7 @@ def multidim_search_opt_0(xspace,
 
         # y, segment
         # y = search(xrectangle.diag(), f, epsilon)
-        y, steps_binsearch = binary_search(xrectangle.diag(), f, error)
+        y, steps_binsearch = intersection_search(xrectangle.diag(), oracle, f, error)
         RootSearch.logger.debug('y: {0}'.format(y))
 
         # b0 = Rectangle(xspace.min_corner, y.low)
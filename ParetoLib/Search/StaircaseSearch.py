@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2018 J.I. Requeno et al
+#
+# This file is part of the ParetoLib software tool and governed by the
+# 'GNU License v3'. Please see the LICENSE file that should have been
+# included as part of this software.
+"""StaircaseSearch.
+
+This module builds the partition of the space for an OraclePoint
+without querying the Oracle.
+
+The upper closure of an OraclePoint is the union of the orthants
+[q, +inf) of the points q stored in the archive, so the Pareto front
+is a staircase that is fully determined by the archive. The space is
+swept along the first dimension: between two consecutive points of
+the archive, the set of active points is constant, and the slab is
+partitioned by solving the same problem in the remaining dimensions
+with the projection of the active points.
+
+Slabs narrower than epsilon are merged. In a merged slab, the upper
+closure is computed with the points that are active at the beginning
+of the slab, the lower closure with the points that are active at the
+end of the slab, and the space in between is reported as border.
+For epsilon = 0, the partition is exact and the border is empty.
+
+The points are sorted by the first dimension, so the sets of active
+points of consecutive slabs are updated incrementally: the points that
+enter a slab are inserted in the skyline of the previous slab, which is
+carried forward in lexicographic order.
+
+The partition only depends on epsilon. The parameters delta, max_step,
+blocking, sleep, opt_level and parallel of SearchND and SearchND_2 are
+ignored for OraclePoints, since no Oracle query is made.
+"""
+
+import time
+
+import numpy as np
+
+import ParetoLib.Search as RootSearch
+
+from ParetoLib.Search.CommonSearch import EPS
+from ParetoLib.Search.ResultSet import ResultSet
+
+from ParetoLib.Oracle.OraclePoint import OraclePoint
+from ParetoLib.Geometry.Rectangle import Rectangle
+from ParetoLib.Geometry.Skyline import skyline, dominated_by
+
+
+def _reduce(points):
+    # type: (np.ndarray) -> np.ndarray
+    # Non-dominated points in lexicographic order
+    if len(points) <= 1:
+        return points
+    front = points[skyline(points)]
+    return front[np.lexsort(front.T[::-1])]
+
+
+def _insert(front, points):
+    # type: (np.ndarray, np.ndarray) -> np.ndarray
+    """
+    Skyline of the union of front and points, in lexicographic order.
+    front must be a skyline in lexicographic order. It is not modified.
+    """
+    if len(points) == 0:
+        return front
+    points = _reduce(points)
+    if len(front) == 0:
+        return points
+    # New points that are dominated by (or equal to) the front are discarded
+    points = points[~dominated_by(points, front)]
+    if len(points) == 0:
+        return front
+    front = front[~dominated_by(front, points)]
+    merged = np.concatenate((front, points))
+    return merged[np.lexsort(merged.T[::-1])]
+
+
+def _staircase(up_points, low_points, lo, hi, epsilon):
+    # type: (np.ndarray, np.ndarray, tuple, tuple, float) -> (list, list, list)
+    """
+    Partition of the box [lo, hi] in three lists of (min_corner, max_corner) pairs.
+
+    The upper list covers the union of the orthants of up_points, the lower list covers the complement
+    of the union of the orthants of low_points, and the border list covers the rest of the box.
+    Every point of up_points must also belong to low_points.
+    Both lists of points must be sorted by the first dimension.
+    """
+    if len(low_points) == 0:
+        return [], [(lo, hi)], []
+
+    if len(lo) == 1:
+        t_up = max(lo[0], np.min(up_points[:, 0])) if len(up_points) > 0 else hi[0]
+        t_low = max(lo[0], np.min(low_points[:, 0]))
+        yup = [((t_up,), hi)] if t_up < hi[0] else []
+        ylow = [(lo, (t_low,))] if lo[0] < t_low else []
+        border = [((t_low,), (t_up,))] if t_low < t_up else []
+        return yup, ylow, border
+
+    yup, ylow, border = [], [], []
+    breakpoints = np.unique(low_points[:, 0])
+    breakpoints = breakpoints[(lo[0] < breakpoints) & (breakpoints < hi[0])]
+
+    # Slabs [start, end] of the first dimension, and the active points projected on the remaining dimensions.
+    # The active points only grow along the sweep: the skylines are carried forward from slab to slab.
+    slabs = []
+    start = lo[0]
+    active_up = np.empty((0, len(lo) - 1))
+    active_low = np.empty((0, len(lo) - 1))
+    next_up, next_low = 0, 0
+    while start < hi[0]:
+        i = np.searchsorted(breakpoints, start + epsilon, side='left')
+        j = np.searchsorted(breakpoints, start, side='right')
+        k = max(i, j)
+        end = breakpoints[k] if k < len(breakpoints) else hi[0]
+        # Points with x[0] <= start are active in the upper closure, and points with x[0] < end in the lower one
+        last_up = np.searchsorted(up_points[:, 0], start, side='right')
+        last_low = np.searchsorted(low_points[:, 0], end, side='left')
+        active_up = _insert(active_up, up_points[next_up:last_up, 1:])
+        active_low = _insert(active_low, low_points[next_low:last_low, 1:])
+        next_up, next_low = last_up, last_low
+        if len(slabs) > 0 and np.array_equal(slabs[-1][2], active_up) and np.array_equal(slabs[-1][3], active_low):
+            # Same staircase as the previous slab
+            slabs[-1][1] = end
+        else:
+            slabs.append([start, end, active_up, active_low])
+        start = end
+
+    for start, end, active_up, active_low in slabs:
+        sub_yup, sub_ylow, sub_border = _staircase(active_up, active_low, lo[1:], hi[1:], epsilon)
+        yup += [((start,) + minc, (end,) + maxc) for minc, maxc in sub_yup]
+        ylow += [((start,) + minc, (end,) + maxc) for minc, maxc in sub_ylow]
+        border += [((start,) + minc, (end,) + maxc) for minc, maxc in sub_border]
+    return yup, ylow, border
+
+
+def staircase_partition(xspace, points, epsilon=0.0):
+    # type: (Rectangle, iter, float) -> ResultSet
+    """
+    Partition of xspace induced by a set of points (see module documentation).
+
+    Args:
+        xspace (Rectangle): Space to partition.
+        points (iter): Points of the archive, i.e., the minimal points of the upper closure.
+        epsilon (float): Resolution of the partition. Slabs narrower than epsilon become border.
+
+    Returns:
+        ResultSet: Partition of xspace in upper closure, lower closure and border.
+
+    Example:
+    >>> xspace = Rectangle((0.0, 0.0), (1.0, 1.0))
+    >>> rs = staircase_partition(xspace, [(0.25, 0.75), (0.75, 0.25)])
+    >>> rs.volume_yup()
+    >>> 0.3125
+    """
+    assert epsilon >= 0, 'epsilon must be non-negative'
+    d = xspace.dim()
+    lo = tuple(float(c) for c in xspace.min_corner)
+    hi = tuple(float(c) for c in xspace.max_corner)
+
+    arr = np.array(list(points), dtype=float).reshape((-1, d))
+    # Points that are not strictly below the max_corner of xspace have an empty orthant (up to measure zero)
+    arr = arr[np.all(arr < hi, axis=1)]
+    # Clipping the points to the min_corner of xspace does not modify the orthants inside xspace
+    arr = _reduce(np.maximum(arr, lo))
+
+    yup, ylow, border = _staircase(arr, arr, lo, hi, epsilon)
+
+    def to_rect_list(pairs):
+        return [Rectangle(tuple(float(c) for c in minc), tuple(float(c) for c in maxc)) for minc, maxc in pairs]
+
+    return ResultSet(border=to_rect_list(border),
+                     ylow=to_rect_list(ylow),
+                     yup=to_rect_list(yup),
+                     xspace=xspace)
+
+
+def multidim_search(xspace,
+                    oracle,
+                    epsilon=EPS,
+                    logging=True):
+    # type: (Rectangle, OraclePoint, float, bool) -> ResultSet
+    """
+    Search-free equivalent of SeqSearch.multidim_search for OraclePoints.
+    There is no delta nor max_step: the partition is computed at once with resolution epsilon.
+    """
+    RootSearch.logger.info('Starting staircase partition')
+    start = time.time()
+    points = oracle.get_points()
+    rs = staircase_partition(xspace, points, epsilon=epsilon)
+    end = time.time()
+    time0 = end - start
+    if logging:
+        RootSearch.logger.info('Points: {0}, Yup: {1}, Ylow: {2}, Border: {3}'.format(len(points),
+                                                                                     len(rs.yup),
+                                                                                     len(rs.ylow),
+                                                                                     len(rs.border)))
+    RootSearch.logger.info('Time staircase partition: ' + str(time0))
+
+    return rs
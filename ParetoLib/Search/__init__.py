@@ -13,7 +13,8 @@ Pareto front.
 import logging
 
 __name__ = 'Search'
-__all__ = ['CommonSearch', 'SeqSearch', 'ParSearch', 'Search', 'ResultSet', 'ParResultSet']
+__all__ = ['CommonSearch', 'SeqSearch', 'ParSearch', 'Search', 'ResultSet', 'ParResultSet', 'ResultSetReader',
+           'StaircaseSearch', 'Campaign']
 
 # Logging configuration
 # logging.basicConfig(format='%(message)s', level=logging.INFO)
@@ -238,6 +238,30 @@ class RectangleTestCase(unittest.TestCase):
         self.assertEqual(r1, r_intersect.concatenate(r5).concatenate(r6))
         self.assertEqual(r4, r2.concatenate(r4).intersection(r4))
 
+    def test_fusion(self):
+        # type: (RectangleTestCase) -> None
+        # 3x3 grid of unit boxes, except the central one
+        grid = [Rectangle((float(i), float(j)), (float(i + 1), float(j + 1)))
+                for i in range(3) for j in range(3) if (i, j) != (1, 1)]
+
+        fusion = Rectangle.fusion_rectangles(grid)
+
+        # Concatenation minimizes the number of boxes while keeping the same coverage
+        self.assertLess(len(fusion), len(grid))
+        self.assertEqual(sum(r.volume() for r in fusion), sum(r.volume() for r in grid))
+        for r in grid:
+            self.assertEqual(sum(f.inside(r.center()) for f in fusion), 1)
+        self.assertFalse(any(f.inside((1.5, 1.5)) for f in fusion))
+
+        # Rectangles that only touch along a face with different extension are not concatenated
+        r1 = Rectangle((0.0, 0.0), (1.0, 1.0))
+        r2 = Rectangle((1.0, 0.0), (2.0, 2.0))
+        self.assertSetEqual({r1, r2}, set(Rectangle.fusion_rectangles([r1, r2])))
+
+        # Full grid collapses into a single box
+        grid.append(Rectangle((1.0, 1.0), (2.0, 2.0)))
+        self.assertListEqual([Rectangle((0.0, 0.0), (3.0, 3.0))], Rectangle.fusion_rectangles(grid))
+
     def test_difference(self):
         # type: (RectangleTestCase) -> None
         p1 = (0.0, 0.75)
@@ -0,0 +1,65 @@
+import unittest
+import numpy as np
+
+from ParetoLib.Geometry.Skyline import skyline, skyline_2D, skyline_3D, skyline_dc, pskyline, dominated_by
+
+
+###########
+# Skyline #
+###########
+
+class SkylineTestCase(unittest.TestCase):
+
+    @staticmethod
+    def brute_force(points):
+        # type: (np.ndarray) -> np.ndarray
+        mask = np.zeros(len(points), dtype=bool)
+        seen = set()
+        for i, p in enumerate(points):
+            dominated = any(np.all(q <= p) and np.any(q != p) for q in points)
+            if not dominated and tuple(p) not in seen:
+                mask[i] = True
+                seen.add(tuple(p))
+        return mask
+
+    def test_skyline(self):
+        # type: (SkylineTestCase) -> None
+        rng = np.random.RandomState(0)
+        for d, algorithms in ((2, (skyline_2D, skyline_dc)),
+                              (3, (skyline_3D, skyline_dc)),
+                              (4, (skyline_dc,)),
+                              (5, (skyline_dc,))):
+            # Points with ties and duplicates
+            points = rng.randint(0, 12, size=(300, d)).astype(float)
+            expected = self.brute_force(points)
+            self.assertTrue(np.array_equal(skyline(points), expected))
+            for f in algorithms:
+                self.assertTrue(np.array_equal(f(points), expected), '{0} in {1}D'.format(f.__name__, d))
+
+    def test_pskyline(self):
+        # type: (SkylineTestCase) -> None
+        rng = np.random.RandomState(1)
+        for d in (2, 3, 4):
+            points = rng.randint(0, 20, size=(400, d)).astype(float)
+            self.assertTrue(np.array_equal(pskyline(points, nproc=2, nchunks=4), skyline(points)))
+
+    def test_dominated_by(self):
+        # type: (SkylineTestCase) -> None
+        rng = np.random.RandomState(2)
+        parr = rng.randint(0, 10, size=(500, 3)).astype(float)
+        qarr = rng.randint(0, 10, size=(40, 3)).astype(float)
+        expected = [any(np.all(q <= p) for q in qarr) for p in parr]
+        self.assertEqual(dominated_by(parr, qarr).tolist(), expected)
+        self.assertEqual(dominated_by(parr, qarr[:0]).tolist(), [False] * len(parr))
+
+    def test_skyline_corner_cases(self):
+        # type: (SkylineTestCase) -> None
+        self.assertEqual(len(skyline([])), 0)
+        self.assertTrue(np.array_equal(skyline([(0.0, 1.0)]), [True]))
+        self.assertTrue(np.array_equal(skyline([(0.0, 1.0), (0.0, 1.0)]), [True, False]))
+        self.assertTrue(np.array_equal(skyline_2D([(0, 1), (1, 0), (1, 1)]), [True, True, False]))
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
@@ -1,9 +1,17 @@
 import os
+import sys
+import subprocess
 import tempfile as tf
 import unittest
 import copy
 
+import numpy as np
+
+from ParetoLib.Oracle.Oracle import Oracle
 from ParetoLib.Oracle.OracleFunction import OracleFunction, Condition
+from ParetoLib.Geometry.Segment import Segment
+from ParetoLib.Geometry.Rectangle import Rectangle
+from ParetoLib.Search.CommonSearch import binary_search
 
 
 ##################
@@ -55,6 +63,130 @@ class OracleFunctionTestCase(unittest.TestCase):
         self.assertTrue(p2 in ora)
         self.assertFalse(p3 in ora)
 
+    def test_membership_compiled(self):
+        # type: (OracleFunctionTestCase) -> None
+        # Compiled and symbolic evaluation give the same answers
+        this_dir = 'Oracle/OracleFunction'
+        rng = np.random.RandomState(0)
+        for test_dir in ('2D', '3D', 'ND'):
+            test_dir = os.path.join(this_dir, test_dir)
+            for fname in sorted(x for x in os.listdir(test_dir) if x.endswith('.txt')):
+                ora = OracleFunction()
+                ora.from_file(os.path.join(test_dir, fname), human_readable=True)
+                d = ora.dim()
+                # Points with a coordinate equal to 0 are avoided, as y >= 1/x is not defined in x = 0
+                points = np.vstack((rng.rand(20, d) + 0.01, (1 + np.arange(4 * d).reshape((-1, d))) / 8.0))
+                for p in points.tolist():
+                    self.assertEqual(ora.member(tuple(p)), ora._member_zip_tuple(tuple(p)))
+                self.assertEqual(ora.member_batch(points).tolist(), [ora.member(tuple(p)) for p in points.tolist()])
+
+        # Symbolic evaluation when the compiled function is not defined
+        ora = OracleFunction()
+        ora.add(Condition('y', '>=', '1/x'))
+        self.assertRaises(TypeError, ora.member, (0.0, 1.0))
+        self.assertRaises(TypeError, ora.member_batch, np.array([(0.0, 1.0)]))
+
+        c1 = Condition('x', '>', '2')
+        self.assertTrue((3.0,) in c1)
+        self.assertFalse((1.0,) in c1)
+
+        # Compiled functions are discarded when pickling
+        ora = OracleFunction()
+        ora.add(c1)
+        self.assertTrue(ora.member((3.0,)))
+        ora2 = copy.deepcopy(ora)
+        self.assertEqual(ora, ora2)
+        self.assertTrue(ora2.member((3.0,)))
+        ora2.add(Condition('y', '<', '0.75'))
+        self.assertFalse(ora2.member((3.0, 1.0)))
+
+    def test_intersect_segment(self):
+        # type: (OracleFunctionTestCase) -> None
+        # Analytic intersection and binary search find the same point of the boundary
+        this_dir = 'Oracle/OracleFunction'
+        rng = np.random.RandomState(1)
+        for test_dir in ('2D', '3D', 'ND'):
+            test_dir = os.path.join(this_dir, test_dir)
+            for fname in sorted(x for x in os.listdir(test_dir) if x.endswith('.txt')):
+                ora = OracleFunction()
+                ora.from_file(os.path.join(test_dir, fname), human_readable=True)
+                d = ora.dim()
+                error = (1e-5,) * d
+                if not ora.has_intersect_segment():
+                    # y >= 1/x is not a polynomial
+                    self.assertIsNone(ora.intersect_segment(Segment((0.5,) * d, (1.0,) * d), error))
+                    continue
+                for _ in range(20):
+                    low = rng.rand(d) * 0.6
+                    high = low + rng.rand(d) * 0.8
+                    y1, _ = binary_search(Segment(tuple(low), tuple(high)), ora.membership(), error)
+                    y2 = ora.intersect_segment(Segment(tuple(low), tuple(high)), error)
+                    self.assertLessEqual(y2.norm(), error[0])
+                    if y2.low != y2.high:
+                        self.assertFalse(ora.member(y2.low))
+                        self.assertTrue(ora.member(y2.high))
+                    np.testing.assert_allclose(y1.low, y2.low, atol=2 * error[0])
+
+        self.assertFalse(OracleFunction().has_intersect_segment())
+
+    def test_member_rect(self):
+        # type: (OracleFunctionTestCase) -> None
+        # Certified rectangles agree with the membership of their points
+        this_dir = 'Oracle/OracleFunction'
+        rng = np.random.RandomState(2)
+        for test_dir in ('2D', '3D', 'ND'):
+            test_dir = os.path.join(this_dir, test_dir)
+            for fname in sorted(x for x in os.listdir(test_dir) if x.endswith('.txt')):
+                ora = OracleFunction()
+                ora.from_file(os.path.join(test_dir, fname), human_readable=True)
+                d = ora.dim()
+                for _ in range(20):
+                    low = rng.rand(d) * 0.9 + 0.05
+                    high = low + rng.rand(d) * 0.3
+                    res = ora.member_rect(Rectangle(tuple(low), tuple(high)))
+                    if res is not None:
+                        points = np.vstack((low, high, low + rng.rand(10, d) * (high - low)))
+                        self.assertEqual(ora.member_batch(points).tolist(), [res] * len(points))
+
+        ora = OracleFunction()
+        ora.add(Condition('x', '>', 'y**2'))
+        self.assertTrue(ora.member_rect(Rectangle((2.0, -1.0), (3.0, 1.0))))
+        self.assertFalse(ora.member_rect(Rectangle((-1.0, -1.0), (0.0, 1.0))))
+        self.assertIsNone(ora.member_rect(Rectangle((0.0, 0.0), (1.0, 1.0))))
+        # y >= 1/x is not a polynomial
+        ora.add(Condition('y', '>=', '1/x'))
+        self.assertIsNone(ora.member_rect(Rectangle((2.0, 0.0), (3.0, 1.0))))
+        self.assertFalse(ora.member_rect(Rectangle((-1.0, -1.0), (0.0, 1.0))))
+        self.assertIsNone(Oracle().member_rect(Rectangle((0.0, 0.0), (1.0, 1.0))))
+
+    def test_without_sympy(self):
+        # type: (OracleFunctionTestCase) -> None
+        # Polynomial conditions are loaded and evaluated without importing SymPy
+        script = ('import sys\n'
+                  'from ParetoLib.Oracle.OracleFunction import OracleFunction\n'
+                  'ora = OracleFunction()\n'
+                  'ora.from_file(sys.argv[1], human_readable=True)\n'
+                  'assert ora.member((0.5, 0.5, 0.5, 0.5))\n'
+                  'assert not ora.member((0.1, 0.1, 0.1, 0.1))\n'
+                  'assert \'sympy\' not in sys.modules\n')
+        fname = os.path.join('Oracle/OracleFunction/ND', 'sphere-4d.txt')
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        subprocess.check_call([sys.executable, '-c', script, fname], env=env)
+
+        # Conditions that are not polynomials are evaluated with SymPy
+        c1 = Condition('x**2/x', '>', '0.5')
+        c2 = Condition('x', '>', '0.5')
+        c3 = Condition('y', '>=', '1/x')
+        self.assertTrue(c1.is_polynomial())
+        self.assertFalse(c3.is_polynomial())
+        self.assertEqual(c1, c2)
+        self.assertEqual(hash(c1), hash(c2))
+        self.assertEqual(c2.get_var_names(), ['x'])
+        self.assertEqual(c3.get_var_names(), ['x', 'y'])
+        self.assertEqual([str(var) for var in c3.get_variables()], ['x', 'y'])
+        self.assertTrue(c3.member((1.0, 2.0)))
+        self.assertFalse(c3.member((1.0, 0.5)))
+
     def test_hash(self):
         # type: (OracleFunctionTestCase) -> None
         c1 = Condition('x', '>', '2')
@@ -1,4 +1,7 @@
+import io
 import os
+import sys
+import pickle
 import tempfile as tf
 import copy
 import unittest
@@ -6,6 +9,7 @@ import numpy as np
 
 from ParetoLib.Oracle.OraclePoint import OraclePoint
 from ParetoLib.Oracle.NDTree import NDTree
+from ParetoLib.Oracle.NDTreeArray import NDTreeArray
 
 
 ###############
@@ -94,6 +98,164 @@ class OraclePointTestCase(unittest.TestCase):
         self.assertEqual(ND1, oldND1)
         self.assertNotEqual(ND1, ND2)
 
+    def test_NDTreeArray(self):
+        # type: (OraclePointTestCase) -> None
+        rng = np.random.RandomState(0)
+        for d in (2, 3, 4):
+            points = [tuple(p) for p in rng.rand(500, d).tolist()]
+            # Pareto front computed by brute force
+            front = set(p for p in points if not any(q != p and all(qi <= pi for qi, pi in zip(q, p))
+                                                     for q in points))
+
+            ND1 = NDTreeArray(max_points=8)
+            for p in points:
+                ND1.update_point(p)
+
+            self.assertEqual(ND1.get_points(), front)
+            self.assertEqual(ND1.dim(), d)
+
+            queries = [tuple(p) for p in rng.rand(200, d).tolist()] + points
+            for x in queries:
+                self.assertEqual(ND1.dominates(x), any(all(pi <= xi for pi, xi in zip(p, x)) for p in front))
+
+            # Read/Write NDTreeArray from file
+            tmpfile = tf.NamedTemporaryFile(delete=False)
+            nfile = tmpfile.name
+            self.add_file_to_clean(nfile)
+
+            ND1.to_file(nfile, human_readable=False)
+            ND2 = NDTreeArray(max_points=8)
+            ND2.from_file(nfile, human_readable=False)
+            self.assertEqual(ND1, ND2)
+
+    def test_bulk_load_NDTree(self):
+        # type: (OraclePointTestCase) -> None
+        rng = np.random.RandomState(1)
+        for d in (2, 3, 4):
+            points = [tuple(p) for p in rng.rand(400, d).tolist()]
+            # Duplicated points are ignored
+            points += points[:10]
+            front = set(p for p in points if not any(q != p and all(qi <= pi for qi, pi in zip(q, p))
+                                                     for q in points))
+
+            for ND1 in (NDTree(), NDTreeArray(max_points=8)):
+                ND1.bulk_load(points)
+                self.assertEqual(ND1.get_points(), front)
+                for x in [tuple(p) for p in rng.rand(200, d).tolist()]:
+                    self.assertEqual(ND1.dominates(x), any(all(pi <= xi for pi, xi in zip(p, x)) for p in front))
+
+                # The NDTree can be updated after the bulk load
+                x = (0.0,) * d
+                ND1.update_point(x)
+                self.assertEqual(ND1.get_points(), {x})
+
+        ND1 = NDTree()
+        ND1.bulk_load([])
+        self.assertTrue(ND1.is_empty())
+
+    def test_files_flat_NDTree(self):
+        # type: (OraclePointTestCase) -> None
+        rng = np.random.RandomState(2)
+        points = [tuple(p) for p in rng.rand(300, 3).tolist()]
+
+        for ND1 in (NDTree(), NDTreeArray(max_points=4)):
+            for p in points:
+                ND1.update_point(p)
+
+            # Memory-mapped file
+            tmpfile = tf.NamedTemporaryFile(delete=False)
+            nfile = tmpfile.name
+            self.add_file_to_clean(nfile)
+            ND1.to_file(nfile, human_readable=False)
+            ND2 = type(ND1)()
+            ND2.from_file(nfile, human_readable=False)
+
+            # In-memory file
+            buf = io.BytesIO()
+            ND1.to_file_binary(buf)
+            ND1_bytes = buf.getvalue()
+            buf.seek(0)
+            ND3 = type(ND1)()
+            ND3.from_file_binary(buf)
+
+            for ND in (ND2, ND3):
+                # Queries are answered from the arrays of the file, without creating the Nodes
+                for x in [tuple(p) for p in rng.rand(50, 3).tolist()] + points[:20]:
+                    self.assertEqual(ND1.dominates(x), ND.dominates(x))
+                    self.assertEqual(x in ND1, x in ND)
+                self.assertEqual(ND1.get_rectangle(), ND.get_rectangle())
+                self.assertNotIn('root', ND.__dict__)
+                buf = io.BytesIO()
+                ND.to_file_binary(buf)
+                self.assertEqual(buf.getvalue(), ND1_bytes)
+                self.assertNotIn('root', ND.__dict__)
+
+                self.assertEqual(ND1, ND)
+                self.assertEqual(str(ND1), str(ND))
+                self.assertEqual(ND1.get_points(), ND.get_points())
+                self.assertEqual(ND1.max_points, ND.max_points)
+                for x in [tuple(p) for p in rng.rand(50, 3).tolist()]:
+                    self.assertEqual(ND1.dominates(x), ND.dominates(x))
+                # The loaded NDTree can be updated
+                ND.update_point((0.0, 0.0, 0.0))
+                self.assertEqual(ND.get_points(), {(0.0, 0.0, 0.0)})
+
+        # Empty NDTree
+        buf = io.BytesIO()
+        NDTree().to_file_binary(buf)
+        buf.seek(0)
+        ND1 = NDTree()
+        ND1.from_file_binary(buf)
+        self.assertTrue(ND1.is_empty())
+
+        # The limits of the process are not changed by the NDTree, except for reading pickled files
+        limit = sys.getrecursionlimit()
+        NDTree()
+        self.assertEqual(sys.getrecursionlimit(), limit)
+
+        # Files written by older versions (i.e., pickle)
+        ND1 = NDTree()
+        ND1.bulk_load(points)
+        buf = io.BytesIO()
+        for obj in (ND1.root, ND1.max_points, ND1.min_children):
+            pickle.dump(obj, buf, pickle.HIGHEST_PROTOCOL)
+        buf.seek(0)
+        ND2 = NDTree()
+        ND2.from_file_binary(buf)
+        self.assertEqual(ND1.get_points(), ND2.get_points())
+
+    def test_index_NDTree(self):
+        # type: (OraclePointTestCase) -> None
+        rng = np.random.RandomState(3)
+        for ND1 in (NDTree(), NDTreeArray(max_points=4)):
+            snapshot = ND1.get_points()
+            for d in (2, 3):
+                ND1.__init__(max_points=ND1.max_points)
+                for p in [tuple(p) for p in rng.randint(0, 30, size=(500, d)).tolist()]:
+                    ND1.update_point(p)
+                    if rng.rand() < 0.1:
+                        # The index of points is consistent with the content of the tree
+                        self.assertEqual(ND1.get_points(), ND1.root.s())
+                        self.assertTrue(all(q in ND1 for q in ND1.root.s()))
+                self.assertEqual(ND1.get_points(), ND1.root.s())
+                self.assertFalse(tuple([-1] * d) in ND1)
+
+            # get_points returns a snapshot
+            self.assertEqual(snapshot, set())
+            snapshot = ND1.get_points()
+            ND1.update_point((-1, -1, -1))
+            self.assertNotEqual(snapshot, ND1.get_points())
+            self.assertEqual(ND1.get_points(), {(-1, -1, -1)})
+
+            # Deep copies and NDTrees pickled without the index
+            ND2 = copy.deepcopy(ND1)
+            self.assertEqual(ND2.get_points(), ND1.get_points())
+            state = dict(ND1.__dict__)
+            del state['_index']
+            ND2 = NDTree.__new__(type(ND1))
+            ND2.__setstate__(state)
+            self.assertTrue((-1, -1, -1) in ND2)
+
     def test_files_NDTree(self):
         # type: (OraclePointTestCase) -> None
         self.read_write_ndtree_files(human_readable=False)
@@ -147,6 +309,91 @@ class OraclePointTestCase(unittest.TestCase):
         self.read_write_oracle_files(human_readable=False)
         self.read_write_oracle_files(human_readable=True)
 
+    def test_load_points_OraclePoint(self):
+        # type: (OraclePointTestCase) -> None
+        rng = np.random.RandomState(3)
+        arr = rng.rand(2000, 4)
+        expected = NDTree()
+        expected.bulk_load(tuple(p) for p in arr.tolist())
+
+        # Text files in format '(x, y, z)' and 'x, y, z', and NumPy arrays
+        tuple_file = tf.NamedTemporaryFile(mode='w', suffix='.txt', delete=False)
+        csv_file = tf.NamedTemporaryFile(mode='w', suffix='.csv', delete=False)
+        npy_file = tf.NamedTemporaryFile(suffix='.npy', delete=False)
+        for tmpfile in (tuple_file, csv_file, npy_file):
+            self.add_file_to_clean(tmpfile.name)
+        for p in arr.tolist():
+            tuple_file.write(str(tuple(p)) + '\n')
+            csv_file.write(','.join(repr(pi) for pi in p) + '\n')
+        np.save(npy_file, arr)
+        for tmpfile in (tuple_file, csv_file, npy_file):
+            tmpfile.close()
+
+        for fname in (tuple_file.name, csv_file.name, npy_file.name):
+            for chunk_size in (1, 300, 5000):
+                ora = OraclePoint()
+                stats = ora.load_points(fname, chunk_size=chunk_size)
+                self.assertEqual(ora.get_points(), expected.get_points())
+                self.assertEqual(stats['points'], 2000)
+                self.assertEqual(stats['front'], len(expected.get_points()))
+                self.assertGreater(stats['throughput'], 0)
+
+        ora = OraclePoint()
+        ora.from_file(tuple_file.name, human_readable=True)
+        self.assertEqual(ora.get_points(), expected.get_points())
+
+        ora.from_array(arr[:0])
+        self.assertEqual(ora.get_points(), frozenset())
+
+        # Blank lines are skipped, and points with different dimensions are rejected
+        with open(csv_file.name, 'w') as f:
+            f.write('\n  \n' + ''.join('{0}, {1}, {2}, {3}\n\n'.format(*p) for p in arr.tolist()))
+        for chunk_size in (1, 300, 5000):
+            ora = OraclePoint()
+            ora.load_points(csv_file.name, chunk_size=chunk_size)
+            self.assertEqual(ora.get_points(), expected.get_points())
+        with open(csv_file.name, 'a') as f:
+            f.write('0.5, 0.5\n')
+        self.assertRaises(ValueError, OraclePoint().load_points, csv_file.name)
+
+    def test_NDTreeArray_OraclePoint(self):
+        # type: (OraclePointTestCase) -> None
+        rng = np.random.RandomState(5)
+        arr = rng.rand(3000, 3)
+        expected = OraclePoint()
+        expected.from_array(arr)
+
+        ora = OraclePoint(tree_class=NDTreeArray)
+        ora.from_array(arr, chunk_size=700)
+        self.assertIsInstance(ora.oracle, NDTreeArray)
+        self.assertEqual(ora.oracle.max_points, NDTreeArray().max_points)
+        self.assertEqual(ora.get_points(), expected.get_points())
+
+        fora, fexpected = ora.membership(), expected.membership()
+        queries = [tuple(p) for p in rng.rand(300, 3).tolist()] + sorted(expected.get_points())[:50]
+        for x in queries:
+            self.assertEqual(ora.member(x), expected.member(x))
+            self.assertEqual(fora(x), fexpected(x))
+
+        # The list of points of a leaf is only rebuilt when its array changes
+        leaf = ora.oracle.root
+        while not leaf.is_leaf():
+            leaf = leaf.nodes[0]
+        self.assertIs(leaf.L, leaf.L)
+        self.assertEqual(leaf.L, [tuple(p) for p in leaf.A.tolist()])
+
+        # The class of the tree is kept when the OraclePoint is loaded again
+        tmpfile = tf.NamedTemporaryFile(delete=False)
+        nfile = tmpfile.name
+        self.add_file_to_clean(nfile)
+        ora.to_file(nfile, human_readable=False)
+        ora2 = OraclePoint(tree_class=NDTreeArray)
+        ora2.from_file(nfile, human_readable=False)
+        self.assertIsInstance(ora2.oracle, NDTreeArray)
+        self.assertEqual(ora2.get_points(), expected.get_points())
+        ora2.from_array(arr[:100])
+        self.assertIsInstance(ora2.oracle, NDTreeArray)
+
     def read_write_oracle_files(self,
                          min_corner=0.0,
                          max_corner=1.0,
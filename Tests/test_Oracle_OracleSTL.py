@@ -1,9 +1,41 @@
 import os
+import sys
 import tempfile as tf
 import unittest
 import copy
 
-from ParetoLib.Oracle.OracleSTL import OracleSTL
+from ParetoLib.Oracle.OracleSTL import OracleSTL, JAMTServer
+
+# Stand-in of JAMTServer.java for 2D/sincos_prop_1.txt, i.e., 'always ((d0 <= p1) and (d0 >= -mp2))'
+# over d0 = sin(t). It follows the protocol of the JAMT server, and writes results like JAMT.
+# The verdict is 'unknown' for p1 = 1.0.
+JAMT_SERVER_STANDIN = r'''
+import re
+import sys
+
+sys.stdout.write('ok\n')
+sys.stdout.flush()
+for line in iter(sys.stdin.readline, ''):
+    stl_prop_file, result_file = line.rstrip('\n').split('\t')
+    with open(stl_prop_file) as f:
+        assertions = re.findall(r'assertion (\w+):\s*always \(\(d0 <= ([^)]+)\) and \(d0 >= ([^)]+)\)\)', f.read())
+    with open(result_file, 'w') as f:
+        f.write('Assertion, Verdict\n')
+        for name, high, low in assertions:
+            satisfied = float(high) >= 1.0 and float(low) <= -1.0
+            verdict = 'unknown' if float(high) == 1.0 else 'satisfied' if satisfied else 'violated'
+            f.write('{0}, {1}\n'.format(name, verdict))
+    sys.stdout.write('ok\n')
+    sys.stdout.flush()
+'''
+
+
+class OracleSTLStandIn(OracleSTL):
+    standin_file = ''
+
+    def _jamt_server_command(self):
+        # type: (OracleSTLStandIn) -> list
+        return [sys.executable, self.standin_file]
 
 
 #############
@@ -53,6 +85,118 @@ class OracleSTLTestCase(unittest.TestCase):
         self.read_write_files(human_readable=False)
         self.read_write_files(human_readable=True)
 
+    def test_server(self):
+        # type: (OracleSTLTestCase) -> None
+        standin = tf.NamedTemporaryFile(mode='w', suffix='.py', delete=False)
+        standin.write(JAMT_SERVER_STANDIN)
+        standin.close()
+        self.add_file_to_clean(standin.name)
+        OracleSTLStandIn.standin_file = standin.name
+
+        infile = os.path.join(self.this_dir, '2D', 'sincos_prop_1.txt')
+        points = [(1.5, 1.5), (0.5, 1.5), (1.5, 0.5), (0.5, 0.5), (2.0, 1.2)]
+        expected = [True, False, False, False, True]
+
+        # The same server answers every query
+        ora1 = OracleSTLStandIn()
+        ora1.from_file(infile, human_readable=True)
+        self.assertEqual([ora1.member(p) for p in points], expected)
+        proc = ora1.jamt_server.proc
+        self.assertEqual([ora1.member(p) for p in points], expected)
+        self.assertIs(ora1.jamt_server.proc, proc)
+        self.assertTrue(ora1.jamt_server.is_alive())
+
+        # One JAMT process per query gives the same results
+        ora2 = OracleSTL(use_server=False)
+        ora2.from_file(infile, human_readable=True)
+        self.assertFalse(copy.deepcopy(ora2).use_server)
+        self.assertEqual([ora2.member(p) for p in points], expected)
+        self.assertFalse(ora2.jamt_server)
+
+        # Fall back to one JAMT process per query if the server dies...
+        proc.kill()
+        proc.wait()
+        self.assertEqual([ora1.member(p) for p in points], expected)
+        self.assertFalse(ora1.jamt_server)
+
+        # ... or if it cannot be started
+        OracleSTLStandIn.standin_file = os.path.devnull
+        ora3 = OracleSTLStandIn()
+        ora3.from_file(infile, human_readable=True)
+        self.assertEqual([ora3.member(p) for p in points], expected)
+        self.assertFalse(ora3.jamt_server)
+
+    def test_server_terminate(self):
+        # type: (OracleSTLTestCase) -> None
+        # A driver that does not exit when stdin is closed is killed
+        script = 'import sys, time\nsys.stdout.write("ok\\n")\nsys.stdout.flush()\ntime.sleep(60)\n'
+        server = JAMTServer([sys.executable, '-c', script])
+        proc = server.proc
+        self.assertTrue(server.is_alive())
+        server.terminate()
+        self.assertIsNone(server.proc)
+        self.assertIsNotNone(proc.poll())
+
+        # A driver that fails the handshake is terminated, and raises RuntimeError
+        self.assertRaises(RuntimeError, JAMTServer, [sys.executable, '-c', 'print("error")'])
+
+    def test_scratch(self):
+        # type: (OracleSTLTestCase) -> None
+        standin = tf.NamedTemporaryFile(mode='w', suffix='.py', delete=False)
+        standin.write(JAMT_SERVER_STANDIN)
+        standin.close()
+        self.add_file_to_clean(standin.name)
+        OracleSTLStandIn.standin_file = standin.name
+
+        infile = os.path.join(self.this_dir, '2D', 'sincos_prop_1.txt')
+        ora = OracleSTLStandIn()
+        ora.from_file(infile, human_readable=True)
+        scratch = ora.scratch
+        if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK):
+            self.assertEqual(os.path.dirname(scratch.path), '/dev/shm')
+
+        # Every query reuses the same files
+        self.assertEqual([ora.member(p) for p in [(1.5, 1.5), (0.5, 0.5)] * 10], [True, False] * 10)
+        self.assertEqual(ora.member_batch([(1.5, 1.5), (0.5, 0.5)]), [True, False])
+        self.assertEqual(sorted(os.listdir(scratch.path)), ['prop.stl', 'result.csv'])
+
+        # Files of 'unknown' verdicts are retained up to a bound
+        scratch.max_retained = 2
+        self.assertEqual([ora.member((1.0, 1.5)) for _ in range(4)], [False] * 4)
+        self.assertEqual(ora.member_batch([(1.5, 1.5), (1.0, 1.5)]), [True, False])
+        self.assertEqual(sorted(os.listdir(scratch.path)),
+                         ['unknown_3.csv', 'unknown_3.stl', 'unknown_4.csv', 'unknown_4.stl'])
+
+        # The scratch directory is removed with the oracle
+        del ora
+        self.assertFalse(os.path.exists(scratch.path))
+
+    def test_member_batch(self):
+        # type: (OracleSTLTestCase) -> None
+        infile = os.path.join(self.this_dir, '2D', 'sincos_prop_1.txt')
+        ora = OracleSTL()
+        ora.from_file(infile, human_readable=True)
+        # Batches are evaluated by a single JAMT process, so they are only preferred on demand
+        self.assertFalse(ora.has_member_batch())
+        ora2 = OracleSTL(use_batch=True)
+        ora2.from_file(infile, human_readable=True)
+        self.assertTrue(ora2.has_member_batch())
+        self.assertTrue(copy.deepcopy(ora2).has_member_batch())
+
+        # More points than JAMT_MAX_ASSERTIONS
+        points = [(0.5 + 0.01 * i, 1.5 - 0.005 * i) for i in range(200)]
+        self.assertEqual(ora.member_batch(points), [ora.member(p) for p in points])
+        self.assertEqual(ora.member_batch([]), [])
+
+        # One assertion per point in a single STL file
+        stl_prop_file = ora._replace_par_val_stl_formula_batch([(1.5, 1.5), (0.5, 0.5)])
+        self.add_file_to_clean(stl_prop_file)
+        with open(stl_prop_file) as f:
+            stl_formula = f.read()
+        self.assertEqual(stl_formula.count('real d0;'), 1)
+        self.assertIn('assertion pt0_prop:', stl_formula)
+        self.assertIn('assertion pt1_prop:', stl_formula)
+
     def read_write_files(self,
                          human_readable=False):
         # type: (OracleSTLTestCase, bool) -> None
@@ -1,9 +1,97 @@
 import os
+import sys
 import tempfile as tf
 import unittest
 import copy
+import shutil
 
-from ParetoLib.Oracle.OracleSTLe import OracleSTLe, OracleSTLeLib
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
+
+import numpy as np
+
+from ParetoLib.Geometry.Segment import Segment
+from ParetoLib.Oracle.OracleSTLe import OracleSTLe, OracleSTLeLib, signal_cache
+from ParetoLib.Search.CommonSearch import binary_search, binary_search_batch
+
+
+# async/await is a syntax error before Python 3.5, so the coroutine is compiled at run time
+_MEMBER_ALL = '''
+async def member_all(ora, points):
+    return await asyncio.gather(*(asyncio.wrap_future(ora.member_async(p)) for p in points))
+'''
+
+
+def run_member_all(ora, points):
+    # type: (OracleSTLe, list) -> list
+    namespace = {'asyncio': asyncio}
+    exec(_MEMBER_ALL, namespace)
+    return asyncio.run(namespace['member_all'](ora, points))
+
+
+def assert_set_signal(self, oracle_class):
+    # type: (unittest.TestCase, type) -> None
+    # Shared by OracleSTLeTestCase and OracleSTLeLibTestCase
+    for infile in self.files_to_load:
+        for num_proc in (1, 2):
+            ora1 = oracle_class(num_proc=num_proc)
+            ora1.from_file(infile, human_readable=True)
+            points = [tuple(p) for p in 2.0 * np.random.random_sample((100, ora1.dim()))]
+            expected1 = ora1.member_batch(points)
+
+            # Signal scaled by 0.5
+            tmpfile = tf.NamedTemporaryFile(mode='w', suffix='.csv', delete=False)
+            self.add_file_to_clean(tmpfile.name)
+            with open(ora1.csv_signal_file) as f, tmpfile:
+                for line in f:
+                    values = line.strip(' \n\t').split(',')
+                    tmpfile.write(','.join([values[0]] + [str(0.5 * float(x)) for x in values[1:]]) + '\n')
+            ora2 = oracle_class(stl_prop_file=ora1.stl_prop_file, csv_signal_file=tmpfile.name,
+                                stl_param_file=ora1.stl_param_file)
+            expected2 = ora2.member_batch(points)
+
+            csv_signal_file = ora1.csv_signal_file
+            ora1.set_signal(tmpfile.name)
+            self.assertEqual(ora1.member_batch(points), expected2)
+            self.assertEqual([ora1.member(p) for p in points], expected2)
+
+            # A signal that cannot be loaded raises RuntimeError
+            self.assertRaises(RuntimeError, ora1.set_signal, 'missing.csv')
+            ora1.set_signal(csv_signal_file)
+            self.assertEqual(ora1.member_batch(points), expected1)
+            del ora1, ora2
+
+
+def assert_cache_stats(self, oracle_class):
+    # type: (unittest.TestCase, type) -> None
+    # Shared by OracleSTLeTestCase and OracleSTLeLibTestCase
+    for infile in self.files_to_load:
+        ora1 = oracle_class(max_memory=2 ** 40)
+        ora1.from_file(infile, human_readable=True)
+        ora2 = oracle_class(max_memory=1)
+        ora2.from_file(infile, human_readable=True)
+        self.assertEqual(copy.deepcopy(ora2).max_memory, 1)
+
+        # Repeated points hit the cache
+        points = [tuple(p) for p in 2.0 * np.random.random_sample((300, ora1.dim()))]
+        expected = ora1.member_batch(points)
+        self.assertEqual(ora1.member_batch(points), expected)
+        stats = ora1.cache_stats()
+        self.assertEqual(stats['calls'], 600)
+        self.assertEqual(stats['hits'], 300)
+        self.assertEqual(stats['hit_rate'], 0.5)
+        self.assertEqual(stats['cleanings'], 0)
+        self.assertEqual(stats['max_memory'], 2 ** 40)
+
+        # The cache is cleaned when STLe exceeds the memory ceiling
+        self.assertEqual(ora2.member_batch(points), expected)
+        stats = ora2.cache_stats()
+        self.assertEqual(stats['calls'], 300)
+        if stats['memory'] is not None:
+            self.assertGreater(stats['memory'], 0)
+            self.assertGreater(stats['cleanings'], 0)
 
 
 ##############
@@ -61,6 +149,95 @@ class OracleSTLeTestCase(unittest.TestCase):
         self.read_write_files(human_readable=False)
         self.read_write_files(human_readable=True)
 
+    def test_member_batch(self):
+        # type: (OracleSTLeTestCase) -> None
+        for infile in self.files_to_load:
+            ora = OracleSTLe()
+            ora.from_file(infile, human_readable=True)
+            self.assertFalse(ora.has_member_batch())
+            self.assertTrue(OracleSTLe(num_proc=2).has_member_batch())
+
+            # More points than MAX_STLE_PIPELINE and MAX_STLE_CALLS
+            d = ora.dim()
+            points = [tuple(p) for p in 2.0 * np.random.random_sample((600, d))]
+            self.assertEqual(ora.member_batch(points), [ora.member(p) for p in points])
+            self.assertEqual(ora.member_batch([]), [])
+
+            # Lockstep bisection gives the same segments than binary_search
+            error = (1e-3,) * d
+            segments = [Segment(p, tuple(1.0 + xi for xi in p)) for p in points[:20]]
+            expected = [binary_search(Segment(x.low, x.high), ora.membership(), error) for x in segments]
+            self.assertEqual(binary_search_batch(segments, ora.member_batch, error), expected)
+
+        # Formulas that STLe fails to evaluate do not interrupt the batch
+        stl_formulas = ['(< (On (0 inf) (- (Max x0) (Min x0))) 5)', '(< x9 1)', '(< (On (0 inf) (- (Max x0) (Min x0))) 5)']
+        self.assertEqual(ora.eval_stl_formula_batch(stl_formulas), [True, False, True])
+
+    def test_pool(self):
+        # type: (OracleSTLeTestCase) -> None
+        for infile in self.files_to_load:
+            ora1 = OracleSTLe()
+            ora1.from_file(infile, human_readable=True)
+            ora2 = OracleSTLe(num_proc=3)
+            ora2.from_file(infile, human_readable=True)
+            self.assertEqual(ora2.num_proc, 3)
+            self.assertEqual(copy.deepcopy(ora2).num_proc, 3)
+
+            points = [tuple(p) for p in 2.0 * np.random.random_sample((300, ora1.dim()))]
+            expected = [ora1.member(p) for p in points]
+            self.assertEqual(ora2.member_batch(points), expected)
+
+            # Concurrent queries from threads
+            futures = [ora2.member_async(p) for p in points]
+            self.assertEqual([f.result() for f in futures], expected)
+
+            # Dead processes are restarted
+            for proc in ora2.stle_pool.workers:
+                proc.proc.kill()
+                proc.proc.wait()
+            self.assertEqual(ora2.member_batch(points), expected)
+
+        # A formula that makes STLe exit does not interrupt the batch
+        stl_formulas = ['(< (On (0 inf) (- (Max x0) (Min x0))) 5)', '(Foo x0)', '(< (On (0 inf) (- (Max x0) (Min x0))) 5)']
+        self.assertEqual(ora2.eval_stl_formula_batch(stl_formulas * 2), [True, False, True] * 2)
+        self.assertEqual(ora2.member_batch(points), expected)
+
+    @unittest.skipIf(sys.version_info < (3, 7), 'requires asyncio.run')
+    def test_member_async_asyncio(self):
+        # type: (OracleSTLeTestCase) -> None
+        # Concurrent queries from coroutines
+        for infile in self.files_to_load:
+            ora = OracleSTLe(num_proc=3)
+            ora.from_file(infile, human_readable=True)
+            points = [tuple(p) for p in 2.0 * np.random.random_sample((300, ora.dim()))]
+            expected = ora.member_batch(points)
+            self.assertEqual(run_member_all(ora, points), expected)
+
+    def test_cache_stats(self):
+        # type: (OracleSTLeTestCase) -> None
+        assert_cache_stats(self, OracleSTLe)
+
+    def test_set_signal(self):
+        # type: (OracleSTLeTestCase) -> None
+        assert_set_signal(self, OracleSTLe)
+
+    def test_own_pool(self):
+        # type: (OracleSTLeTestCase) -> None
+        # Every oracle has its own STLe processes, even when they read the same signal
+        for infile in self.files_to_load:
+            ora1 = OracleSTLe()
+            ora1.from_file(infile, human_readable=True)
+            ora2 = copy.deepcopy(ora1)
+            points = [tuple(p) for p in 2.0 * np.random.random_sample((50, ora1.dim()))]
+            expected = ora1.member_batch(points)
+            self.assertEqual(ora2.member_batch(points), expected)
+            self.assertIsNot(ora1.stle_pool, ora2.stle_pool)
+            self.assertEqual(signal_cache.entries, {})
+
+            # Deleting one oracle does not stop the STLe processes of the other
+            del ora1
+            self.assertEqual(ora2.member_batch(points), expected)
+
     def read_write_files(self,
                          human_readable=False):
         # type: (OracleSTLeTestCase, bool) -> None
@@ -174,6 +351,102 @@ class OracleSTLeLibTestCase(unittest.TestCase):
         self.read_write_files(human_readable=False)
         self.read_write_files(human_readable=True)
 
+    def test_pool(self):
+        # type: (OracleSTLeLibTestCase) -> None
+        for infile in self.files_to_load:
+            ora1 = OracleSTLe()
+            ora1.from_file(infile, human_readable=True)
+            ora2 = OracleSTLeLib(num_proc=4)
+            ora2.from_file(infile, human_readable=True)
+            self.assertTrue(ora2.has_member_batch())
+            self.assertFalse(OracleSTLeLib().has_member_batch())
+
+            # Monitors share the same signal
+            points = [tuple(p) for p in 2.0 * np.random.random_sample((300, ora1.dim()))]
+            expected = ora1.member_batch(points)
+            self.assertEqual(len(set(monitor.signal for monitor in ora2.stle_pool.workers)), 1)
+            self.assertEqual(len(set(monitor.monitor for monitor in ora2.stle_pool.workers)), 4)
+            self.assertEqual(ora2.member_batch(points), expected)
+            self.assertEqual([ora2.member(p) for p in points], expected)
+
+            futures = [ora2.member_async(p) for p in points]
+            self.assertEqual([f.result() for f in futures], expected)
+
+    def test_cache_stats(self):
+        # type: (OracleSTLeLibTestCase) -> None
+        assert_cache_stats(self, OracleSTLeLib)
+
+    def test_signal_cache(self):
+        # type: (OracleSTLeLibTestCase) -> None
+        for infile in self.files_to_load:
+            ora1 = OracleSTLeLib()
+            ora1.from_file(infile, human_readable=True)
+            ora2 = copy.deepcopy(ora1)
+            points = [tuple(p) for p in 2.0 * np.random.random_sample((50, ora1.dim()))]
+            expected = ora1.member_batch(points)
+            self.assertEqual(ora2.member_batch(points), expected)
+
+            # Both oracles share the signal loaded in memory, but not the monitors
+            key = ora1.signal_key
+            self.assertEqual(ora2.signal_key, key)
+            self.assertEqual(ora1.signal, ora2.signal)
+            self.assertIsNot(ora1.stle_pool, ora2.stle_pool)
+            self.assertEqual(signal_cache.entries[key][1], 2)
+            del ora1
+            self.assertEqual(signal_cache.entries[key][1], 1)
+            self.assertEqual(ora2.member_batch(points), expected)
+
+            # A signal file that changes is loaded again
+            tmpfile = tf.NamedTemporaryFile(suffix='.csv', delete=False)
+            tmpfile.close()
+            self.add_file_to_clean(tmpfile.name)
+            shutil.copyfile(ora2.csv_signal_file, tmpfile.name)
+            ora3 = OracleSTLeLib(stl_prop_file=ora2.stl_prop_file, csv_signal_file=tmpfile.name,
+                                 stl_param_file=ora2.stl_param_file)
+            self.assertEqual(ora3.member_batch(points), expected)
+            with open(tmpfile.name, 'a') as f:
+                f.write('\n')
+            ora4 = copy.copy(ora3)
+            self.assertEqual(ora4.member_batch(points), expected)
+            self.assertNotEqual(ora3.signal_key, ora4.signal_key)
+            self.assertEqual(signal_cache.entries[ora3.signal_key][1], 1)
+            self.assertEqual(signal_cache.entries[ora4.signal_key][1], 1)
+
+            # Signals are unloaded with the last oracle
+            keys = [ora2.signal_key, ora3.signal_key, ora4.signal_key]
+            del ora2, ora3, ora4
+            self.assertFalse(any(key in signal_cache.entries for key in keys))
+
+    def test_set_signal(self):
+        # type: (OracleSTLeLibTestCase) -> None
+        assert_set_signal(self, OracleSTLeLib)
+        self.assertEqual(signal_cache.entries, {})
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'requires os.fork')
+    def test_signal_cache_fork(self):
+        # type: (OracleSTLeLibTestCase) -> None
+        # Forked processes load their own signals
+        ora1 = OracleSTLeLib()
+        ora1.from_file(self.files_to_load[0], human_readable=True)
+        points = [tuple(p) for p in 2.0 * np.random.random_sample((50, ora1.dim()))]
+        expected = ora1.member_batch(points)
+        self.assertIn(ora1.signal_key, signal_cache.entries)
+
+        pid = os.fork()
+        if pid == 0:
+            ok = False
+            try:
+                ok = signal_cache.entries == {}
+                ora2 = copy.deepcopy(ora1)
+                ok = ok and ora2.member_batch(points) == expected and signal_cache.entries[ora2.signal_key][1] == 1
+                del ora1, ora2
+                ok = ok and signal_cache.entries == {}
+            finally:
+                os._exit(0 if ok else 1)
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(status, 0)
+        self.assertEqual(signal_cache.entries[ora1.signal_key][1], 1)
+
     def read_write_files(self,
                          human_readable=False):
         # type: (OracleSTLeLibTestCase, bool) -> None
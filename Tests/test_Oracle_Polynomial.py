@@ -0,0 +1,60 @@
+import unittest
+
+import numpy as np
+
+from ParetoLib.Oracle.Polynomial import Polynomial, parse_polynomial
+
+
+##############
+# Polynomial #
+##############
+
+
+class PolynomialTestCase(unittest.TestCase):
+
+    def test_parse_polynomial(self):
+        # type: (PolynomialTestCase) -> None
+        poly = parse_polynomial('x**2 + y**2 - 0.5**2')
+        self.assertEqual(poly.get_var_names(), ['x', 'y'])
+        self.assertEqual(poly.degree(), 2)
+        self.assertEqual(str(poly), 'x**2 + y**2 - 0.25')
+
+        # '^' is a synonym of '**', with the same precedence
+        self.assertEqual(parse_polynomial('x^2 - 3'), parse_polynomial('x**2 - 3'))
+        self.assertEqual(parse_polynomial('(x + y)**2'), parse_polynomial('x**2 + 2*x*y + y**2'))
+        self.assertEqual(parse_polynomial('-x/4 + 1'), parse_polynomial('1 - 0.25*x'))
+        self.assertEqual(str(parse_polynomial('x - x')), '0')
+        self.assertEqual(parse_polynomial('x - x').get_var_names(), [])
+
+        # Printed polynomials are parsed back
+        for expression in ('x1 + x2 + x3 + x4 > 1', '-x**3 + 2*x*y/3 - 1e-5', '1/3 - x**2*y'):
+            poly = parse_polynomial(expression.split('>')[0])
+            self.assertEqual(parse_polynomial(str(poly)), poly)
+            self.assertEqual(hash(parse_polynomial(str(poly))), hash(poly))
+
+        # Expressions that are not polynomials, or that require SymPy
+        for expression in ('1/x', 'x**y', 'x**0.5', 'x**-1', 'sin(x)', 'E*x', '2x', '1/0', 'x >'):
+            self.assertRaises(ValueError, parse_polynomial, expression)
+
+    def test_compile(self):
+        # type: (PolynomialTestCase) -> None
+        poly = Polynomial(('x', 'y'), np.array([[2, 0], [0, 1], [0, 0]]), np.array([1.0, -4.0, 0.5]))
+        self.assertEqual(str(poly), 'x**2 - 4*y + 0.5')
+
+        f = poly.compile()
+        self.assertEqual(f(2.0, 1.0), 0.5)
+        np.testing.assert_allclose(f(np.array([0.0, 1.0]), np.array([0.0, 1.0])), [0.5, -2.5])
+
+        # Arguments in a different order, and extra arguments
+        f = poly.compile(['z', 'y', 'x'])
+        self.assertEqual(f(7.0, 1.0, 2.0), 0.5)
+        exps, coeffs = poly.get_polynomial(['z', 'y', 'x'])
+        self.assertEqual(exps.tolist(), [[0, 0, 2], [0, 1, 0], [0, 0, 0]])
+        self.assertEqual(coeffs.tolist(), [1.0, -4.0, 0.5])
+
+        self.assertEqual((poly - poly).compile()(), 0.0)
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
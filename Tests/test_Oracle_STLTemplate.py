@@ -0,0 +1,73 @@
+import os
+import re
+import unittest
+
+import numpy as np
+
+from ParetoLib.Oracle.STLTemplate import STLTemplate, ARITHM_EXPR
+
+
+###############
+# STLTemplate #
+###############
+
+def replace_val_stl_formula(stl_formula, stl_parameters, xpoint):
+    # type: (str, list, tuple) -> str
+    # Former implementation of OracleSTLe._replace_val_stl_formula
+    def eval_expr(match):
+        result = '0'
+        try:
+            result = str(eval(match.group(0)))
+        except SyntaxError:
+            pass
+        finally:
+            return result
+
+    val_formula = stl_formula
+    for i, par in enumerate(stl_parameters):
+        val_formula = re.sub(r'\b{0}\b'.format(par), str(xpoint[i]), val_formula)
+    return ARITHM_EXPR.sub(eval_expr, val_formula)
+
+
+class STLTemplateTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # type: (STLTemplateTestCase) -> None
+        self.this_dir = 'Oracle'
+        self.values = [0.5, -0.5, 1e-05, 1e16, -0.0, 3, -7, float('inf'), np.float64(0.1), np.int64(4), 2.0]
+
+    def assert_instances(self, stl_formula, stl_parameters):
+        # type: (STLTemplateTestCase, str, list) -> None
+        template = STLTemplate(stl_formula, stl_parameters)
+        points = [tuple(np.random.choice(self.values, len(stl_parameters)).tolist()),
+                  tuple(self.values[:len(stl_parameters)])]
+        points += [tuple(p) for p in 2000.0 * np.random.random_sample((20, len(stl_parameters))) - 1000.0]
+        for xpoint in points:
+            self.assertEqual(template.instantiate(xpoint),
+                             replace_val_stl_formula(stl_formula, stl_parameters, xpoint), stl_formula)
+
+    def test_instantiate(self):
+        # type: (STLTemplateTestCase) -> None
+        template = STLTemplate('(F (0 p1) (< (On (0 300-p2) x0) 2*3))', ['p1', 'p2'])
+        self.assertEqual(template.instantiate((10.0, 0.5)), '(F (0 10.0) (< (On (0 299.5) x0) 6))')
+
+        # Constant arithmetic expressions, braces, names containing parameters, invalid expressions
+        for stl_formula in ('(< x0 1/4)', 'p1 p2 p3', 'p1p2 p1_p2 p1.5 5p1 {p1} p1-p2*p3', '300--p1', '1e3+p1e3',
+                            '05+p1 1/0 p2/0', '.5*p1/2 +p1 -p2 p3-', 'always[150:300-p2] varx <= 0.2'):
+            self.assert_instances(stl_formula, ['p1', 'p2', 'p3'])
+
+        # Parametrized STL formulas of the tests of OracleSTL and OracleSTLe
+        for root, dirs, files in os.walk(self.this_dir):
+            for stl_file in (f for f in files if f.endswith('.stl')):
+                param_file = os.path.join(root, stl_file[:-len('.stl')] + '.param')
+                if os.path.isfile(param_file):
+                    with open(os.path.join(root, stl_file)) as f:
+                        stl_formula = f.read()
+                    with open(param_file) as f:
+                        stl_parameters = [line.strip(' \n\t') for line in f]
+                    self.assert_instances(stl_formula, stl_parameters)
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
@@ -0,0 +1,103 @@
+import os
+import shutil
+import tempfile as tf
+import unittest
+
+from ParetoLib.Oracle.OracleSTLe import OracleSTLe, OracleSTLeLib
+from ParetoLib.Search.Search import SearchND_2
+from ParetoLib.Search.ResultSet import ResultSet
+from ParetoLib.Search.Campaign import campaign, run_campaign, main, INTERSECTION_FILE
+
+
+class CampaignTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # type: (CampaignTestCase) -> None
+        self.this_dir = 'Oracle/OracleSTLe/2D'
+        self.stl_prop_file = os.path.join(self.this_dir, 'stabilization.stl')
+        self.stl_param_file = os.path.join(self.this_dir, 'stabilization.param')
+        self.list_intervals = [(0.0, 1000.0), (0.0, 1.0)]
+        self.max_step = 20
+        self.output_dir = tf.mkdtemp()
+
+        # Signals: the original one and a scaled copy
+        csv_signal_file = os.path.join(self.this_dir, 'stabilization.csv')
+        scaled_signal_file = os.path.join(self.output_dir, 'scaled.csv')
+        with open(csv_signal_file) as fin, open(scaled_signal_file, 'w') as fout:
+            for line in fin:
+                t, x = line.strip(' \n\t').split(',')
+                fout.write('{0},{1}\n'.format(t, 0.5 * float(x)))
+        self.csv_signal_files = [csv_signal_file, scaled_signal_file]
+
+    def tearDown(self):
+        # type: (CampaignTestCase) -> None
+        shutil.rmtree(self.output_dir, ignore_errors=True)
+
+    def sequential_search(self, csv_signal_file):
+        # type: (CampaignTestCase, str) -> ResultSet
+        ora = OracleSTLeLib(stl_prop_file=self.stl_prop_file, csv_signal_file=csv_signal_file,
+                            stl_param_file=self.stl_param_file)
+        return SearchND_2(ora, self.list_intervals, max_step=self.max_step, logging=False)
+
+    def assert_campaign(self, oracle_class, num_proc):
+        # type: (CampaignTestCase, type, int) -> None
+        results = list(campaign(self.stl_prop_file, self.stl_param_file, self.csv_signal_files, self.output_dir,
+                                list_intervals=self.list_intervals, oracle_class=oracle_class,
+                                num_proc=num_proc, max_step=self.max_step))
+        self.assertEqual(sorted(csv for csv, _, _ in results), sorted(self.csv_signal_files))
+        for csv_signal_file, rs_file, rs in results:
+            self.assertTrue(os.path.isfile(rs_file))
+            expected = self.sequential_search(csv_signal_file)
+            self.assertAlmostEqual(rs.volume_yup(), expected.volume_yup())
+            self.assertAlmostEqual(rs.volume_ylow(), expected.volume_ylow())
+
+            # The ResultSet saved in disk is the ResultSet of the search
+            saved = ResultSet()
+            saved.from_file(rs_file)
+            self.assertAlmostEqual(saved.volume_yup(), rs.volume_yup())
+
+    def test_campaign(self):
+        # type: (CampaignTestCase) -> None
+        self.assert_campaign(OracleSTLeLib, 2)
+        self.assert_campaign(OracleSTLe, 1)
+
+    def test_run_campaign(self):
+        # type: (CampaignTestCase) -> None
+        rs = run_campaign(self.stl_prop_file, self.stl_param_file, self.csv_signal_files, self.output_dir,
+                          list_intervals=self.list_intervals, num_proc=2, max_step=self.max_step)
+        rs1, rs2 = (self.sequential_search(csv) for csv in self.csv_signal_files)
+        expected = rs1.intersection(rs2)
+        self.assertAlmostEqual(rs.volume_yup(), expected.volume_yup())
+        self.assertAlmostEqual(rs.volume_ylow(), expected.volume_ylow())
+
+        saved = ResultSet()
+        saved.from_file(os.path.join(self.output_dir, INTERSECTION_FILE))
+        self.assertAlmostEqual(saved.volume_yup(), expected.volume_yup())
+
+        # Command line interface, with the list of signals in a file
+        signals_file = os.path.join(self.output_dir, 'signals.txt')
+        with open(signals_file, 'w') as f:
+            f.write('\n'.join(self.csv_signal_files) + '\n')
+        output_dir = os.path.join(self.output_dir, 'cli')
+        argv = [self.stl_prop_file, self.stl_param_file, '@' + signals_file, '-o', output_dir,
+                '--interval', '0', '1000', '--interval', '0', '1', '--max-step', str(self.max_step), '-j', '2']
+        self.assertEqual(main(argv), 0)
+        saved = ResultSet()
+        saved.from_file(os.path.join(output_dir, INTERSECTION_FILE))
+        self.assertAlmostEqual(saved.volume_yup(), expected.volume_yup())
+        self.assertEqual(len([f for f in os.listdir(output_dir) if f != INTERSECTION_FILE]),
+                         len(self.csv_signal_files))
+
+        # Missing signals are skipped, and the oracle of the worker is reused for the next signals
+        for oracle_class in (OracleSTLeLib, OracleSTLe):
+            rs = run_campaign(self.stl_prop_file, self.stl_param_file,
+                              ['missing.csv', self.csv_signal_files[0], 'missing.csv', self.csv_signal_files[1]],
+                              os.path.join(self.output_dir, 'missing'), list_intervals=self.list_intervals,
+                              oracle_class=oracle_class, num_proc=1, max_step=self.max_step)
+            self.assertAlmostEqual(rs.volume_yup(), expected.volume_yup())
+            self.assertAlmostEqual(rs.volume_ylow(), expected.volume_ylow())
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
@@ -162,6 +162,47 @@ class ResultSetTestCase(unittest.TestCase):
         # os.unlink(nfile)
         self.add_file_to_clean(nfile)
 
+    def test_files_selective(self):
+        # type: (ResultSetTestCase) -> None
+        tmpfile = tf.NamedTemporaryFile(delete=False)
+        nfile = tmpfile.name
+        self.add_file_to_clean(nfile)
+
+        for columnar in (False, True):
+            self.rs_2D.to_file(nfile, columnar=columnar, compresslevel=9)
+
+            rs = ResultSet()
+            rs.from_file(nfile, closures=('yup',))
+            self.assertEqual(rs.yup, self.rs_2D.yup)
+            self.assertEqual(rs.ylow, [])
+            self.assertEqual(rs.border, [])
+            self.assertEqual(rs.xspace, Rectangle())
+
+    def test_files_columnar(self):
+        # type: (ResultSetTestCase) -> None
+        for rs in (self.rs_2D, self.rs_3D):
+            tmpfile = tf.NamedTemporaryFile(delete=False)
+            nfile = tmpfile.name
+            self.add_file_to_clean(nfile)
+
+            rs.to_file(nfile, columnar=True)
+            self.rs2.from_file(nfile)
+
+            # Closures are exposed as arrays before being materialised as lists of Rectangles
+            self.assertEqual(self.rs2.get_array_yup().shape, (len(rs.yup), 2, rs.xspace.dim()))
+            self.assertAlmostEqual(self.rs2.volume_yup(), rs.volume_yup())
+            self.assertAlmostEqual(self.rs2.volume_ylow(), rs.volume_ylow())
+
+            self.assertEqual(rs, self.rs2)
+            self.assertEqual(hash(rs), hash(self.rs2))
+
+            # Empty closures
+            self.rs2.border = []
+            self.rs2.to_file(nfile, columnar=True)
+            self.rs2.from_file_columnar(nfile, lazy=False)
+            self.assertEqual(self.rs2.border, [])
+            self.assertEqual(self.rs2.yup, rs.yup)
+
     def test_vertices_2D(self):
         # type: (ResultSetTestCase) -> None
 
@@ -0,0 +1,88 @@
+import os
+import tempfile as tf
+import unittest
+import zipfile
+
+import numpy as np
+
+from ParetoLib.Geometry.Rectangle import Rectangle
+from ParetoLib.Search.ResultSet import ResultSet
+from ParetoLib.Search.ResultSetReader import ResultSetReader
+from ParetoLib.Search.Search import create_2D_space
+
+
+class ResultSetReaderTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # type: (ResultSetReaderTestCase) -> None
+        self.files_to_clean = set()
+
+        border = [Rectangle((0.5, 0.0), (1.0, 0.5)), Rectangle((0.0, 0.5), (0.5, 1.0))]
+        ylow = [Rectangle((0.0, 0.0), (0.5, 0.5))]
+        yup = [Rectangle((0.5, 0.5), (0.75, 0.75)), Rectangle((0.75, 0.5), (1.0, 1.0)),
+               Rectangle((0.5, 0.75), (0.75, 1.0))]
+        self.rs = ResultSet(border, ylow, yup, create_2D_space(0.0, 0.0, 1.0, 1.0))
+
+    def tearDown(self):
+        # type: (ResultSetReaderTestCase) -> None
+        for filename in self.files_to_clean:
+            if os.path.isfile(filename):
+                os.remove(filename)
+
+    def _tmpfile(self):
+        # type: (ResultSetReaderTestCase) -> str
+        tmpfile = tf.NamedTemporaryFile(delete=False)
+        self.files_to_clean.add(tmpfile.name)
+        return tmpfile.name
+
+    def test_metadata(self):
+        # type: (ResultSetReaderTestCase) -> None
+        for columnar in (False, True):
+            nfile = self._tmpfile()
+            self.rs.to_file(nfile, columnar=columnar)
+            reader = ResultSetReader(nfile)
+
+            self.assertEqual(reader.dim(), 2)
+            self.assertEqual(reader.count('yup'), 3)
+            self.assertEqual(reader.count('ylow'), 1)
+            self.assertAlmostEqual(reader.volume('yup'), self.rs.volume_yup())
+            self.assertAlmostEqual(reader.volume('ylow'), self.rs.volume_ylow())
+            self.assertEqual(reader.bounding_box('yup'), ((0.5, 0.5), (1.0, 1.0)))
+            self.assertEqual(reader.metadata(), self.rs.metadata())
+
+    def test_metadata_old_files(self):
+        # type: (ResultSetReaderTestCase) -> None
+        # Files without the metadata entry
+        nfile = self._tmpfile()
+        self.rs.to_file(nfile)
+        old_file = self._tmpfile()
+        with zipfile.ZipFile(nfile, mode='r') as zin, zipfile.ZipFile(old_file, mode='w') as zout:
+            for name in zin.namelist():
+                if name != self.rs.filename_metadata:
+                    zout.writestr(name, zin.read(name))
+
+        self.assertEqual(ResultSetReader(old_file).metadata(), self.rs.metadata())
+
+    def test_iter_rectangles(self):
+        # type: (ResultSetReaderTestCase) -> None
+        for columnar in (False, True):
+            nfile = self._tmpfile()
+            self.rs.to_file(nfile, columnar=columnar)
+            reader = ResultSetReader(nfile)
+
+            chunks = list(reader.iter_rectangles('yup', chunk_size=2))
+            self.assertEqual([len(chunk) for chunk in chunks], [2, 1])
+            self.assertEqual([r for chunk in chunks for r in chunk], self.rs.yup)
+
+            arrays = list(reader.iter_arrays('border', chunk_size=2))
+            self.assertEqual([arr.shape for arr in arrays], [(2, 2, 2)])
+            self.assertEqual(list(reader.iter_rectangles('ylow', chunk_size=5)), [self.rs.ylow])
+
+            # Only columnar files are streamed: their chunks are views of the memory-mapped file
+            self.assertEqual(reader.columnar, columnar)
+            self.assertTrue(all(isinstance(arr, np.memmap) == columnar for arr in arrays))
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
@@ -0,0 +1,90 @@
+import os
+import unittest
+
+import numpy as np
+
+from ParetoLib.Geometry.Rectangle import Rectangle
+from ParetoLib.Oracle.OraclePoint import OraclePoint
+from ParetoLib.Search.Search import SearchND
+from ParetoLib.Search.StaircaseSearch import staircase_partition
+
+
+class StaircaseSearchTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # type: (StaircaseSearchTestCase) -> None
+        self.this_dir = 'Oracle/OraclePoint'
+        self.numpoints_verify = 30
+        self.rng = np.random.RandomState(0)
+
+    def verify(self, fora, rs, d, min_c, max_c, overlapping=True):
+        # type: (StaircaseSearchTestCase, callable, ResultSet, int, float, float, bool) -> None
+        list_test_points = (max_c - min_c) * self.rng.random_sample((self.numpoints_verify, d)) + min_c
+        for p in list_test_points:
+            p = tuple(p)
+            if fora(p):
+                self.assertTrue(rs.member_yup(p) or rs.member_border(p), p)
+            else:
+                self.assertTrue(rs.member_ylow(p) or rs.member_border(p), p)
+
+        if overlapping:
+            # Quadratic in the number of rectangles
+            self.assertAlmostEqual(rs.overlapping_volume_yup(), 0)
+            self.assertAlmostEqual(rs.overlapping_volume_ylow(), 0)
+        self.assertAlmostEqual(rs.volume_yup() + rs.volume_ylow() + rs.volume_border(), rs.volume_total(),
+                               delta=1e-9 * rs.volume_total())
+
+    def test_exact_partition(self):
+        # type: (StaircaseSearchTestCase) -> None
+        xspace = Rectangle((0.0, 0.0), (1.0, 1.0))
+        rs = staircase_partition(xspace, [(0.25, 0.75), (0.75, 0.25), (0.8, 0.8), (2.0, 0.0)])
+        self.assertEqual(rs.border, [])
+        self.assertAlmostEqual(rs.volume_yup(), 0.3125)
+        self.assertAlmostEqual(rs.volume_ylow(), 0.6875)
+
+        rs = staircase_partition(xspace, [])
+        self.assertEqual(rs.ylow, [xspace])
+        self.assertEqual(rs.yup, [])
+
+    def test_epsilon(self):
+        # type: (StaircaseSearchTestCase) -> None
+        for d in (2, 3, 4):
+            points = self.rng.random_sample((20, d))
+            points = 0.9 * points / np.sum(points, axis=1, keepdims=True)
+            fora = lambda p: bool(np.any(np.all(points <= p, axis=1)))
+            xspace = Rectangle((0.0,) * d, (1.0,) * d)
+            exact = staircase_partition(xspace, points)
+            coarse = staircase_partition(xspace, points, epsilon=0.1)
+            self.verify(fora, exact, d, 0.0, 1.0)
+            self.verify(fora, coarse, d, 0.0, 1.0)
+            self.assertAlmostEqual(exact.volume_border(), 0)
+            self.assertLess(len(coarse.yup), len(exact.yup))
+            self.assertLessEqual(coarse.volume_yup(), exact.volume_yup() + 1e-9)
+            self.assertLessEqual(exact.volume_yup(), coarse.volume_yup() + coarse.volume_border() + 1e-9)
+
+    def test_ties(self):
+        # type: (StaircaseSearchTestCase) -> None
+        # Points sharing coordinates enter the sweep at the same slab
+        for d in (2, 3, 4):
+            points = self.rng.randint(0, 8, size=(300, d)) / 8.0
+            fora = lambda p: bool(np.any(np.all(points <= p, axis=1)))
+            rs = staircase_partition(Rectangle((0.0,) * d, (1.0,) * d), points)
+            self.verify(fora, rs, d, 0.0, 1.0, overlapping=False)
+            self.assertEqual(rs.border, [])
+            self.assertAlmostEqual(rs.volume_yup() + rs.volume_ylow(), 1.0)
+
+    def test_SearchND(self):
+        # type: (StaircaseSearchTestCase) -> None
+        for test, min_c, max_c in ((os.path.join(self.this_dir, '2D', 'test-2d-1000points.txt'), -1024.0, 1024.0),
+                                   (os.path.join(self.this_dir, '3D', 'test-3d-1000points.txt'), 0.0, 600.0)):
+            self.assertTrue(os.path.isfile(test), test)
+            oracle = OraclePoint()
+            oracle.from_file(test, human_readable=True)
+            rs = SearchND(ora=oracle, min_corner=min_c, max_corner=max_c, epsilon=0.0, logging=False,
+                          simplify=False)
+            self.verify(oracle.membership(), rs, oracle.dim(), min_c, max_c, overlapping=False)
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
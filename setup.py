@@ -68,6 +68,10 @@ def check_dependencies():
     """
     # Check if matplotlib, NumPy, SortedContainers or Sympy are missing, as they are required for
     # ParetoLib to work properly
+    if (not can_import('concurrent.futures')):
+        print('The backport of concurrent.futures is not installed.\nThis package is required for ' \
+              'ParetoLib on Python 2.\n\nYou can find it at https://pypi.org/project/futures/')
+        return (False)
     if (not can_import('matplotlib')):
         print('Matplotlib is not installed.\nThis package is required for ' \
               'ParetoLib.\n\nYou can find Matplotlib at https://matplotlib.org/')
@@ -201,7 +205,7 @@ setup_args = {'name': 'ParetoLib',
                            'ParetoLib.Search',
                            'ParetoLib.STLe',
                            'ParetoLib._py3k'],
-              'package_data': {'ParetoLib.JAMT': ['*.jar'],
+              'package_data': {'ParetoLib.JAMT': ['*.jar', '*.java'],
                                'ParetoLib.STLe': ['*.bin', '*.exe', '*.so.1', '*.dll']},
               'platforms': 'OS Independent',
               }
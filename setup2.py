@@ -22,6 +22,7 @@ if __name__ == '__main__':
         long_description_content_type="text/markdown",
         url='https://gricad-gitlab.univ-grenoble-alpes.fr/verimag/tempo/multidimensional_search',
         install_requires=[
+            'futures; python_version < "3"',
             'matplotlib>=2.0.2,<=3.0.3',
             'numpy>=1.15',
             'pytest>=2.0',
@@ -32,7 +33,7 @@ if __name__ == '__main__':
         #packages=setuptools.find_packages(exclude=['ParetoLib._py3k', 'Tests']),
         packages=setuptools.find_packages(),
         package_data={
-            'ParetoLib.JAMT': ['*.jar'],
+            'ParetoLib.JAMT': ['*.jar', '*.java'],
             'ParetoLib.STLe': ['*.bin', '*.exe', '*.so.1', '*.dll']
         },
         classifiers=(